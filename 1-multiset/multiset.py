@@ -1,4 +1,6 @@
 from skiplist import *
+import skiplist_io
+from typed_skiplist import TypedSkipList
 
 
 class MultiSet:
@@ -12,18 +14,118 @@ class MultiSet:
 
     # Error customizations.
     INSERT_ERROR = "The element insertion was incomparable with set items."
+    # Typed skip lists order their values by themselves.
+    KEY_TYPECODE_ERROR = "A typed multiset cannot be ordered by a key."
     # A failed count shouold returen 0, i.e. not in there.
     COUNT_ERROR_SIZE = 0
     # An element with an incomparable type cannot be in the multiset.
     CONTAINS_ERROR = False
 
-    def __init__(self, skip_list=None):
-        '''(MultiSet [, SkipList]) -> NoneType
-        Initializes this multiset, with a specific skip list if given.
+    def __init__(self, skip_list=None, key=None, typecode=None):
+        '''(MultiSet [, SkipList, function, str]) -> NoneType
+        Initializes this multiset, with a specific skip list if given. If not,
+        a new skip list is made, ordered by the given key function (if any);
+        or, if a typecode is given ('q' for ints, 'd' for floats), a
+        TypedSkipList packing the values into arrays.
+
+        RAISES: ValueError if both a key function and a typecode are given: a
+        TypedSkipList orders its values by themselves.
         '''
+        if key is not None and typecode is not None:
+            raise ValueError(MultiSet.KEY_TYPECODE_ERROR)
         # This multiset is implemented with a skip list; it has a skip list.
         if skip_list is None:
-            skip_list = SkipList()
+            if typecode is not None:
+                skip_list = TypedSkipList(typecode)
+            else:
+                skip_list = SkipList(key=key)
+        self._skip_list = skip_list
+
+    @classmethod
+    def from_iterable(cls, iterable, key=None, typecode=None):
+        '''(type, iterable [, function, str]) -> MultiSet
+        Returns a new multiset holding every element of the given iterable,
+        bulk-loaded into its skip list, which is ordered by the given key
+        function (if any), or is a TypedSkipList if a typecode is given.
+
+        RAISES: TypeError iff the elements are not comparable with each other.
+        RAISES: ValueError if both a key function and a typecode are given.
+        '''
+        if key is not None and typecode is not None:
+            raise ValueError(MultiSet.KEY_TYPECODE_ERROR)
+        try:
+            if typecode is not None:
+                return cls(skip_list=TypedSkipList.from_iterable(iterable,
+                                                                 typecode))
+            return cls(skip_list=SkipList.from_iterable(iterable, key=key))
+        except TypeError:
+            # Incomparable type, the user must be notified.
+            raise TypeError(MultiSet.INSERT_ERROR)
+
+    def _new_from_sorted(self, elems):
+        '''(MultiSet, list) -> MultiSet
+        Returns a new multiset holding the given sorted elements, whose skip
+        list is configured like this one's.
+        '''
+        skip_list = self._skip_list.new_empty_skip_list()
+        skip_list.insert_all(elems)
+        return MultiSet(skip_list=skip_list)
+
+    @classmethod
+    def load(cls, file, key=None):
+        '''(type, str or file [, function]) -> MultiSet
+        Returns a new multiset read back from the given path or binary file,
+        written by dump, ordered by the given key function if it was written
+        with one.
+
+        RAISES: ValueError if the file is not a skip list file.
+        '''
+        return cls(skip_list=skiplist_io.load(file, key))
+
+    @classmethod
+    def open_mapped(cls, file, key=None):
+        '''(type, str or file [, function]) -> MultiSet
+        Returns a read-only multiset answering straight from the memory-mapped
+        path or binary file, written by dump, without reading it all in.
+
+        RAISES: ValueError if the file is not a skip list file.
+        '''
+        return cls(skip_list=skiplist_io.MappedSkipList(file, key))
+
+    def dump(self, file):
+        '''(MultiSet, str or file) -> NoneType
+        Writes this multiset to the given path or binary file, in the compact
+        format of skiplist_io.
+        '''
+        skiplist_io.dump(self._skip_list, file)
+
+    def snapshot(self):
+        '''(MultiSet) -> MultiSet
+        Returns a read-only multiset viewing this one as it is now, taken in
+        O(1); later changes to this multiset do not show through it. It
+        suits long scans (e.g. subset checks) while this one keeps changing.
+
+        REQ: this multiset's skip list supports snapshots.
+        '''
+        return MultiSet(skip_list=self._skip_list.snapshot())
+
+    def __reduce__(self):
+        '''(MultiSet) -> tuple
+        Pickles this multiset as its skip list, which pickles only its
+        sorted values and their counts.
+        '''
+        return (self.__class__, (), self.__getstate__())
+
+    def __getstate__(self):
+        '''(MultiSet) -> SkipList
+        Returns the state of this multiset, which is its skip list.
+        '''
+        return self._skip_list
+
+    def __setstate__(self, skip_list):
+        '''(MultiSet, SkipList) -> NoneType
+        Restores this multiset's skip list from its pickled state.
+        '''
         self._skip_list = skip_list
 
     def __contains__(self, elem):
@@ -76,8 +178,10 @@ class MultiSet:
         '''(MultiSet) -> NoneType
         Clears this skip list from all elements.
         '''
-        # Make a brand new Skiplist.
-        self._skip_list = SkipList()
+        # Start over on a new, empty skip list configured like the old one,
+        # leaving the old one to whatever else shares it (a caller's list, or
+        # a snapshot or mapped file that cannot be cleared).
+        self._skip_list = self._skip_list.new_empty_skip_list()
 
     def __len__(self):
         '''(MultiSet) -> int
@@ -136,18 +240,19 @@ class MultiSet:
         Returns a multiset that contains every element found in this multiset
         less any element(s) that could be found in the given multiset.
         '''
-        # Create a new multiset to place the subtracted information into.
-        to_sub = MultiSet()
+        # Collect the subtracted information, in order, into a list.
+        to_sub = []
 
         # Grab an iterator in unique mode.
         for elem in self._skip_list.unique_iter():
             # Take the different in count between this and the operand, and
             # add that to the new list.
             diff = self.count(elem) - mset2.count(elem)
-            for count in range(diff):
-                to_sub.insert(elem)
+            to_sub.extend([elem] * diff)
 
-        return to_sub
+        # The elements were collected in order, so bulk-load them into a list
+        # configured like this one's.
+        return self._new_from_sorted(to_sub)
 
     def __isub__(self, mset2):
         '''(MultiSet, MultiSet) -> MultiSet
@@ -198,36 +303,29 @@ class MultiSet:
             itered = mset2
             other = self
 
-        # Create the intersection multiset which will be returned.
-        intersection = MultiSet()
+        # Collect the intersection, in order, into a list.
+        intersection = []
 
         # Now iterate on the smaller one, checking for occurences...
         for elem in itered._skip_list.unique_iter():
             # The minimum of the counts is what the intersection will yield.
             final_count = min(itered.count(elem), other.count(elem))
 
-            # Now insert the min
-            for i in range(final_count):
-                intersection.insert(elem)
+            # Now add the min
+            intersection.extend([elem] * final_count)
 
-        return intersection
+        # The elements were collected in order, so bulk-load them into a list
+        # configured like this one's.
+        return self._new_from_sorted(intersection)
 
     def __iand__(self, mset2):
         '''(MultiSet, MultiSet) -> MultiSet
         Mutates this set to contain only those elements (and their occurences)
         that are common to both multisets.
         '''
-        # Get all unique values of both this and the other set, conslidated
-        # into one list, making sure that the second list does not add extras.
-        both_unique = SkipList()
-        for elem in self._skip_list.unique_iter():
-            both_unique.insert(elem)
-        for elem in mset2._skip_list.unique_iter():
-            if elem not in both_unique:
-                both_unique.insert(elem)
-
-        # Iterate once on this new combined unique list.
-        for elem in both_unique:
+        # Only this set's own elements can be kept, so iterate once on its
+        # unique values, taken first as removing them changes the skip list.
+        for elem in list(self._skip_list.unique_iter()):
             # We want the intersection, thus the minimum count between the two.
             cur_count = self.count(elem)
             final_count = min(cur_count, mset2.count(elem))
@@ -239,7 +337,6 @@ class MultiSet:
             # Remove the difference
             for count in range(remove_count):
                 self.remove(elem)
-        # Now operate the other way around.
         return self
 
     def isdisjoint(self, mset2):
@@ -0,0 +1,131 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_HERE, os.pardir))
+sys.path.insert(0, os.path.join(_HERE, os.pardir, os.pardir, '2-skiplist'))
+from concurrent_skiplist import ConcurrentSkipList
+from multiset import MultiSet
+from skiplist import SkipList
+
+
+class TestMultiSet(unittest.TestCase):
+
+    def test_operators(self):
+        multiset = MultiSet.from_iterable([1, 2, 2, 3])
+        other = MultiSet.from_iterable([2, 3, 3])
+        self.assertEqual(multiset.count(2), 2)
+        self.assertEqual(multiset + other,
+                         MultiSet.from_iterable([1, 2, 2, 2, 3, 3, 3]))
+        self.assertEqual(multiset - other, MultiSet.from_iterable([1, 2]))
+        self.assertEqual(multiset & other, MultiSet.from_iterable([2, 3]))
+        self.assertTrue(MultiSet.from_iterable([2, 3]) <= multiset)
+        self.assertFalse(multiset.isdisjoint(other))
+        multiset -= other
+        self.assertEqual(multiset, MultiSet.from_iterable([1, 2]))
+        multiset &= other
+        self.assertEqual(multiset, MultiSet.from_iterable([2]))
+
+    def test_counted_list(self):
+        multiset = MultiSet(SkipList(counted=True))
+        for elem in [3, 1, 3, 3]:
+            multiset.insert(elem)
+        other = MultiSet.from_iterable([3, 1, 1])
+        self.assertEqual(multiset.count(3), 3)
+        self.assertEqual(multiset & other, MultiSet.from_iterable([1, 3]))
+        self.assertEqual(multiset - other, MultiSet.from_iterable([3, 3]))
+        multiset.remove(3)
+        self.assertEqual(multiset, MultiSet.from_iterable([1, 3, 3]))
+        multiset.clear()
+        self.assertEqual(len(multiset), 0)
+
+    def test_key(self):
+        multiset = MultiSet.from_iterable(['bb', 'a', 'cc', 'bb'], key=len)
+        self.assertEqual(multiset.count('bb'), 2)
+        self.assertFalse('dd' in multiset)
+        other = MultiSet.from_iterable(['cc', 'e'], key=len)
+        self.assertEqual(multiset - other,
+                         MultiSet.from_iterable(['a', 'bb', 'bb'], key=len))
+        self.assertEqual(multiset & other,
+                         MultiSet.from_iterable(['cc'], key=len))
+
+    def test_concurrent_list(self):
+        multiset = MultiSet(ConcurrentSkipList())
+        for elem in [2, 1, 2]:
+            multiset.insert(elem)
+        self.assertEqual(multiset.count(2), 2)
+        self.assertEqual(multiset, MultiSet.from_iterable([1, 2, 2]))
+        self.assertEqual(multiset - MultiSet.from_iterable([2]),
+                         MultiSet.from_iterable([1, 2]))
+
+    def test_snapshot(self):
+        multiset = MultiSet.from_iterable([1, 2, 2])
+        snapshot = multiset.snapshot()
+        multiset.insert(3)
+        multiset.remove(1)
+        self.assertEqual(snapshot, MultiSet.from_iterable([1, 2, 2]))
+        self.assertFalse(snapshot <= multiset)
+        self.assertTrue(MultiSet.from_iterable([2]) <= snapshot)
+
+    def test_clear_shared_list(self):
+        skip_list = SkipList()
+        skip_list.insert_all([1, 2])
+        multiset = MultiSet(skip_list)
+        multiset.clear()
+        self.assertEqual(len(multiset), 0)
+        self.assertEqual(list(skip_list), [1, 2])
+        multiset.insert(3)
+        self.assertEqual(list(skip_list), [1, 2])
+
+    def test_clear_snapshot(self):
+        multiset = MultiSet.from_iterable([1, 2])
+        snapshot = multiset.snapshot()
+        snapshot.clear()
+        snapshot.insert(5)
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(multiset, MultiSet.from_iterable([1, 2]))
+
+    def test_dump_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'multiset.skpl')
+            for multiset in (MultiSet.from_iterable([1, 2, 2, 3]),
+                             MultiSet.from_iterable([1, 2, 2, 3],
+                                                    typecode='q'),
+                             MultiSet.from_iterable(['b', 'a', 'b'])):
+                multiset.dump(path)
+                self.assertEqual(MultiSet.load(path), multiset)
+                mapped = MultiSet.open_mapped(path)
+                self.assertEqual(mapped, multiset)
+                self.assertTrue(multiset.count('b') == mapped.count('b'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_pickle(self):
+        multiset = MultiSet.from_iterable([3, 1, 3])
+        self.assertEqual(pickle.loads(pickle.dumps(multiset)), multiset)
+
+    def test_typecode(self):
+        multiset = MultiSet.from_iterable([3, 1, 3], typecode='q')
+        other = MultiSet.from_iterable([3, 2], typecode='q')
+        self.assertEqual(multiset.count(3), 2)
+        self.assertEqual(multiset + other,
+                         MultiSet.from_iterable([1, 2, 3, 3, 3]))
+        self.assertEqual(multiset - other, MultiSet.from_iterable([1, 3]))
+        self.assertEqual(multiset & other, MultiSet.from_iterable([3]))
+        self.assertRaises(TypeError, multiset.insert, 'a')
+        # Only this multiset's own values are kept, so floats equal to them
+        # never have to fit its typecode.
+        multiset &= MultiSet.from_iterable([3.0, 1.5])
+        self.assertEqual(multiset, MultiSet.from_iterable([3]))
+        self.assertRaises(ValueError, MultiSet, key=abs, typecode='q')
+        self.assertRaises(ValueError, MultiSet.from_iterable, [1], key=abs,
+                          typecode='q')
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,476 @@
+import threading
+
+from skiplist import HeadNode, LevelGenerator, SkipList, TowerNode
+
+
+class LockedTowerNode(TowerNode):
+
+    '''A tower of a concurrent skip list. Besides a tower's fields, it has its
+    own lock, taken by writers only, and two flags: marked, set once the
+    tower is logically removed (before it is unlinked), and linked, set once
+    the tower is linked on every one of its levels. Duplicates are counted
+    on the tower, so a tower stands for every occurence of its value.'''
+
+    __slots__ = ('_lock', '_marked', '_linked')
+
+    def __init__(self, value, height=1, count=1):
+        '''(LockedTowerNode, obj [, int, int]) -> NoneType
+        Constructs an unlinked, unmarked tower holding the given value.
+        '''
+        super().__init__(value, height, count)
+        self._lock = threading.Lock()
+        self._marked = False
+        self._linked = False
+
+    def is_live(self):
+        '''(LockedTowerNode) -> bool
+        Returns whether this tower is fully linked and not removed: the only
+        towers readers consider part of the list.
+        '''
+        return self._linked and not self._marked
+
+
+class ConcurrentSkipList:
+
+    '''A skip list that many threads can share without a global lock, as a
+    lazy skip list. Searches, counts and iteration take no locks at all:
+    they read forward pointers as they find them, and only trust towers that
+    are live. Inserts and removes lock just the towers whose forward
+    pointers they change (one per level at most), validate that nothing
+    changed under them, and retry if something did; so writers in different
+    parts of the list do not wait for one another, which lets them scale on
+    free-threaded builds of Python. Removed towers keep their forward
+    pointers, so an iterator standing on one carries on safely; iterators
+    are weakly consistent, seeing some of the writes made while they run.
+
+    Duplicates are stored as counts on a single tower. There are no span
+    widths, so positional access is left to SkipList.'''
+
+    # Level indices: the bottom level holds every element.
+    BOTTOM_LEVEL = 0
+
+    # The level returned by a search that did not find the key.
+    NOT_FOUND = -1
+
+    # Towers are never raised once linked, so nothing can rebalance them.
+    ERROR_BALANCING = ("A concurrent skip list cannot keep its towers "
+                       + "balanced; give it a random level generator.")
+
+    def __init__(self, fixed_p=SkipList.DEFAULT_PROBABILITY, levels=None):
+        '''(ConcurrentSkipList [, float, LevelGenerator]) -> NoneType
+        Initializes an empty list, the heights of its towers coming from the
+        given level generator (by default, an unseeded one with fixed_p).
+        The head is as tall as the generator's maximum level from the start,
+        so it never has to change.
+
+        RAISES RandProbException if fixed_p is not in 0 < fixed_p < 1.
+        RAISES ValueError if the level generator rebalances the list (such as
+        DeterministicLevels).
+        '''
+        if levels is None:
+            levels = LevelGenerator(fixed_p)
+        if levels.is_balancing():
+            raise ValueError(ConcurrentSkipList.ERROR_BALANCING)
+        self._levels = levels
+        self._head = LockedTowerNode(None, levels.get_max_level())
+        self._head._linked = True
+        # The number of levels in use; it only ever grows, so a reader that
+        # sees a stale one just starts lower.
+        self._top = 1
+        self._length = 0
+        # Guards the length and the number of levels only.
+        self._meta_lock = threading.Lock()
+
+    def new_empty_skip_list(self):
+        '''(ConcurrentSkipList) -> ConcurrentSkipList
+        Creates an empty concurrent list configured like this one.
+        '''
+        return ConcurrentSkipList(levels=self._levels.spawn())
+
+    def is_counted(self):
+        '''(ConcurrentSkipList) -> bool
+        Returns True: duplicates are always counted on a single tower.
+        '''
+        return True
+
+    def get_key_function(self):
+        '''(ConcurrentSkipList) -> NoneType
+        Returns None: elements are always ordered by themselves.
+        '''
+        return None
+
+    def _find(self, key, head=None):
+        '''(ConcurrentSkipList, obj [, LockedTowerNode]) ->
+                (list of LockedTowerNode, list of LockedTowerNode, int)
+        Walks the list from the given head (by default, the current one)
+        without locking anything. Returns, for every level, the last tower
+        before the key and the one after it (None at the end of a level),
+        along with the highest level a tower with the key was found on
+        (NOT_FOUND if none).
+
+        RAISES TypeError if there was an issue comparing elements.
+        '''
+        if head is None:
+            head = self._head
+        height = len(head._next_nodes)
+        preds = [head] * height
+        succs = [None] * height
+        found_level = ConcurrentSkipList.NOT_FOUND
+        pred = head
+        for level in range(self._top - 1, ConcurrentSkipList.BOTTOM_LEVEL - 1,
+                           -1):
+            cur_node = pred._next_nodes[level]
+            while cur_node is not None and cur_node._key < key:
+                pred = cur_node
+                cur_node = pred._next_nodes[level]
+            if (found_level == ConcurrentSkipList.NOT_FOUND and
+                    cur_node is not None and cur_node._key == key):
+                found_level = level
+            preds[level] = pred
+            succs[level] = cur_node
+        return preds, succs, found_level
+
+    def _find_live(self, elem):
+        '''(ConcurrentSkipList, obj) -> LockedTowerNode or NoneType
+        Returns the live tower holding elem, or None if there is none.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            preds, succs, found_level = self._find(elem)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        if found_level == ConcurrentSkipList.NOT_FOUND:
+            return None
+        node = succs[found_level]
+        if node.is_live():
+            return node
+        return None
+
+    def search(self, elem):
+        '''(ConcurrentSkipList, obj) -> obj
+        Returns the element if it is found, otherwise returns None. Takes no
+        locks.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        node = self._find_live(elem)
+        if node is not None:
+            return node._value
+        return None
+
+    def __contains__(self, elem):
+        '''(ConcurrentSkipList, obj) -> bool
+        Returns whether the element is in this list. Takes no locks.
+        '''
+        try:
+            return self._find_live(elem) is not None
+        except TypeError:
+            return False
+
+    def count(self, elem):
+        '''(ConcurrentSkipList, obj) -> int
+        Returns the number of occurences of the given element. Takes no
+        locks.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        node = self._find_live(elem)
+        if node is not None:
+            return node._count
+        return SkipList.EMPTY_LIST_COUNT
+
+    def _add_length(self, delta, head):
+        '''(ConcurrentSkipList, int, LockedTowerNode) -> bool
+        Adds delta to the length of this list, for a write made from the
+        given head, and returns True. If the list was cleared since, the
+        write went to the discarded towers: nothing is added, and False is
+        returned.
+        '''
+        with self._meta_lock:
+            if self._head is not head:
+                return False
+            self._length += delta
+            return True
+
+    def _raise_top(self, height):
+        '''(ConcurrentSkipList, int) -> NoneType
+        Makes sure searches start at least as high as the given height.
+        '''
+        if height > self._top:
+            with self._meta_lock:
+                self._top = max(self._top, height)
+
+    def insert(self, elem):
+        '''(ConcurrentSkipList, obj) -> NoneType
+        Inserts an object into the list. If it is already there, its tower
+        just gains an occurence under its own lock; otherwise a new tower is
+        linked under the locks of its predecessors. If the list is cleared
+        meanwhile, the insert is made again in the new one.
+
+        RAISES: TypeError if trying to add a non-comparable type (w/ those in
+        the list).
+        '''
+        height = self._levels.height()
+        self._raise_top(height)
+        while True:
+            # Every attempt works from a single head; it is tried again if
+            # that head was cleared away before the insert was counted.
+            head = self._head
+            try:
+                preds, succs, found_level = self._find(elem, head)
+            except TypeError:
+                raise TypeError(SkipList.ERROR_TYPE_INSERT)
+
+            if found_level != ConcurrentSkipList.NOT_FOUND:
+                node = succs[found_level]
+                # Waits for the tower to be linked, if it is being so.
+                with node._lock:
+                    if not node._marked:
+                        node._count += 1
+                        if self._add_length(1, head):
+                            return
+                        continue
+                # It is being removed; try again once it is gone.
+                continue
+
+            if (self._link(elem, height, preds, succs) and
+                    self._add_length(1, head)):
+                return
+
+    def _link(self, elem, height, preds, succs):
+        '''(ConcurrentSkipList, obj, int, list of LockedTowerNode,
+                list of LockedTowerNode) -> bool
+        Links a new tower for elem between the given predecessors and
+        successors, bottom-up, while holding the predecessors' locks. Returns
+        False, changing nothing, if some predecessor was removed or no longer
+        points at its successor.
+        '''
+        locked = []
+        try:
+            for level in range(height):
+                pred = preds[level]
+                succ = succs[level]
+                if not locked or locked[-1] is not pred:
+                    pred._lock.acquire()
+                    locked.append(pred)
+                if (pred._marked or pred._next_nodes[level] is not succ or
+                        (succ is not None and succ._marked)):
+                    return False
+
+            # The new tower stays locked until it is linked on every level,
+            # so a writer that finds it early waits.
+            to_add = LockedTowerNode(elem, height)
+            with to_add._lock:
+                for level in range(height):
+                    to_add._next_nodes[level] = succs[level]
+                for level in range(height):
+                    preds[level]._next_nodes[level] = to_add
+                to_add._linked = True
+            return True
+        finally:
+            for pred in locked:
+                pred._lock.release()
+
+    def remove(self, elem):
+        '''(ConcurrentSkipList, obj) -> bool
+        Returns True iff the remove operation sucessfully found the element
+        and removed it. The last occurence of an element marks its tower as
+        removed under its lock, then unlinks it, top-down, under the locks of
+        its predecessors. A remove racing with a clear takes effect just
+        before it.
+        '''
+        head = self._head
+        try:
+            preds, succs, found_level = self._find(elem, head)
+        except TypeError:
+            # Trying to remove an element whose type is impossible to have.
+            return False
+        if found_level == ConcurrentSkipList.NOT_FOUND:
+            return False
+
+        victim = succs[found_level]
+        with victim._lock:
+            if victim._marked:
+                # Another writer removed its last occurence first.
+                return False
+            self._add_length(-1, head)
+            if victim._count > 1:
+                victim._count -= 1
+                return True
+            # Readers stop seeing it from here on.
+            victim._marked = True
+
+            # Unlink it, retrying until its predecessors are stable.
+            while not self._unlink(victim, preds):
+                preds = self._find(elem, head)[0]
+        return True
+
+    def _unlink(self, victim, preds):
+        '''(ConcurrentSkipList, LockedTowerNode, list of LockedTowerNode) ->
+                bool
+        Unlinks the given marked tower, top-down, while holding its
+        predecessors' locks. Returns False, changing nothing, if some
+        predecessor was removed or no longer points at the tower.
+        '''
+        height = len(victim._next_nodes)
+        locked = []
+        try:
+            for level in range(height):
+                pred = preds[level]
+                if not locked or locked[-1] is not pred:
+                    pred._lock.acquire()
+                    locked.append(pred)
+                if pred._marked or pred._next_nodes[level] is not victim:
+                    return False
+
+            # The tower keeps its own forward pointers, so iterators standing
+            # on it go on to the rest of the list.
+            for level in range(height - 1, ConcurrentSkipList.BOTTOM_LEVEL - 1,
+                               -1):
+                preds[level]._next_nodes[level] = victim._next_nodes[level]
+            return True
+        finally:
+            for pred in locked:
+                pred._lock.release()
+
+    def insert_all(self, iterable):
+        '''(ConcurrentSkipList, iterable) -> NoneType
+        Inserts all of a given iterable structure to this list, one element
+        at a time.
+
+        RAISES: TypeError if trying to add a non-comparable type.
+        '''
+        for elem in iterable:
+            self.insert(elem)
+
+    def clear(self):
+        '''(ConcurrentSkipList) -> NoneType
+        Removes every element from this list, by swapping in a new head. A
+        racing insert is made again in the new list, and a racing remove
+        takes effect just before the clear. The number of levels in use is
+        kept: it only ever grows.
+        '''
+        head = LockedTowerNode(None, self._levels.get_max_level())
+        head._linked = True
+        with self._meta_lock:
+            self._head = head
+            self._length = 0
+
+    def __len__(self):
+        '''(ConcurrentSkipList) -> int
+        Returns the number of occurences in this list.
+        '''
+        return self._length
+
+    def _live_nodes(self):
+        '''(ConcurrentSkipList) -> generator of LockedTowerNode
+        Yields the live towers on the bottom level, in order, without locking
+        anything.
+        '''
+        node = self._head._next_nodes[ConcurrentSkipList.BOTTOM_LEVEL]
+        while node is not None:
+            if node.is_live():
+                yield node
+            node = node._next_nodes[ConcurrentSkipList.BOTTOM_LEVEL]
+
+    def __iter__(self):
+        '''(ConcurrentSkipList) -> generator
+        Yields every occurence in this list, in order. It is safe to use
+        while other threads write to the list.
+        '''
+        for node in self._live_nodes():
+            value = node._value
+            for occurence in range(node._count):
+                yield value
+
+    def unique_iter(self):
+        '''(ConcurrentSkipList) -> generator
+        Yields every distinct element in this list, in order. It is safe to
+        use while other threads write to the list.
+        '''
+        for node in self._live_nodes():
+            yield node._value
+
+    def __eq__(self, skiplist2):
+        '''(ConcurrentSkipList, iterable) -> bool
+        Returns whether both lists hold the same occurences, as seen by one
+        pass over each.
+        '''
+        return list(self) == list(skiplist2)
+
+    def __add__(self, skiplist2):
+        '''(ConcurrentSkipList, iterable) -> ConcurrentSkipList
+        Returns a new concurrent list holding the occurences of both.
+
+        RAISES: TypeError if the two lists hold incomparable types.
+        '''
+        sum_list = self.new_empty_skip_list()
+        sum_list.insert_all(self)
+        sum_list.insert_all(skiplist2)
+        return sum_list
+
+    def __iadd__(self, skiplist2):
+        '''(ConcurrentSkipList, iterable) -> ConcurrentSkipList
+        Inserts every occurence of the given list into this one.
+
+        RAISES: TypeError if the two lists hold incomparable types.
+        '''
+        # Take the occurences first, in case the operand is this list.
+        self.insert_all(list(skiplist2))
+        return self
+
+    def __reduce__(self):
+        '''(ConcurrentSkipList) -> tuple
+        Pickles this list as its level generator and its distinct elements
+        with their counts (locks are not picklable), as seen by one pass.
+        '''
+        values = []
+        counts = []
+        for node in self._live_nodes():
+            values.append(node._value)
+            counts.append(node._count)
+        return (self.__class__, (self._levels.get_probability(),
+                                 self._levels), (values, counts))
+
+    def __setstate__(self, state):
+        '''(ConcurrentSkipList, (list, list of int)) -> NoneType
+        Bulk-loads the pickled elements into this (new, empty) list in a
+        single pass, appending each tower at the end of every level it
+        reaches. No locks are taken: no other thread can see the list yet.
+
+        REQ: the pickled elements are distinct and in ascending order.
+        '''
+        values, counts = state
+        # The last tower on every level so far (the head while it is empty).
+        last_nodes = [self._head] * len(self._head._next_nodes)
+        length = 0
+        for position, (value, count) in enumerate(zip(values, counts), 1):
+            # The head never grows, so no tower may be taller than it.
+            height = min(self._levels.height_at(position),
+                         len(self._head._next_nodes))
+            to_add = LockedTowerNode(value, height, count)
+            for level in range(height):
+                last_nodes[level]._next_nodes[level] = to_add
+                last_nodes[level] = to_add
+            to_add._linked = True
+            self._top = max(self._top, height)
+            length += count
+        self._length = length
+
+    def __str__(self):
+        '''(ConcurrentSkipList) -> str
+        Returns a string representation of the live towers on every level in
+        use, top level first, in the format 'head -> 1 -> 2'.
+        '''
+        lines = []
+        for level in range(self._top - 1, ConcurrentSkipList.BOTTOM_LEVEL - 1,
+                           -1):
+            to_str = [HeadNode.HEAD_NODE_STR]
+            node = self._head._next_nodes[level]
+            while node is not None:
+                if node.is_live():
+                    to_str.append(str(node))
+                node = node._next_nodes[level]
+            lines.append(' -> '.join(to_str))
+        return '\n'.join(lines)
@@ -0,0 +1,190 @@
+'''Stress benchmark for ConcurrentSkipList, to be run locally:
+
+    python concurrent_stress.py [--readers N] [--writers N] [--seconds S]
+                                [--keys K] [--seed SEED]
+
+Reader threads search, count and iterate while writer threads insert and
+remove random keys, first on a ConcurrentSkipList, then on a SkipList behind
+one global lock, for comparison. Afterwards the concurrent list is checked
+against the net inserts every writer recorded, and its levels for order.
+Run it on a free-threaded build of Python to see writers scale.'''
+
+import argparse
+import collections
+import random
+import sys
+import threading
+import time
+
+from concurrent_skiplist import ConcurrentSkipList
+from skiplist import SkipList
+
+
+class LockedSkipList:
+
+    '''A SkipList behind a single lock: the baseline being replaced.'''
+
+    def __init__(self):
+        '''(LockedSkipList) -> NoneType
+        Initializes an empty, counted skip list and its lock.
+        '''
+        self._skip_list = SkipList(counted=True)
+        self._lock = threading.Lock()
+
+    def search(self, elem):
+        '''(LockedSkipList, obj) -> obj
+        Searches under the lock.
+        '''
+        with self._lock:
+            return self._skip_list.search(elem)
+
+    def count(self, elem):
+        '''(LockedSkipList, obj) -> int
+        Counts under the lock.
+        '''
+        with self._lock:
+            return self._skip_list.count(elem)
+
+    def insert(self, elem):
+        '''(LockedSkipList, obj) -> NoneType
+        Inserts under the lock.
+        '''
+        with self._lock:
+            self._skip_list.insert(elem)
+
+    def remove(self, elem):
+        '''(LockedSkipList, obj) -> bool
+        Removes under the lock.
+        '''
+        with self._lock:
+            return self._skip_list.remove(elem)
+
+    def __iter__(self):
+        '''(LockedSkipList) -> iterator
+        Iterates over a copy taken under the lock.
+        '''
+        with self._lock:
+            return iter(list(self._skip_list))
+
+
+def reader(skip_list, keys, seed, stop, results):
+    '''(obj, int, int, threading.Event, list) -> NoneType
+    Searches and counts random keys, iterating over the whole list every so
+    often, until told to stop; then records its number of operations.
+    '''
+    rand = random.Random(seed)
+    ops = 0
+    while not stop.is_set():
+        key = rand.randrange(keys)
+        skip_list.search(key)
+        skip_list.count(key)
+        ops += 2
+        if ops % 1000 == 0:
+            previous = None
+            for elem in skip_list:
+                # Iteration must stay in order under concurrent writes.
+                assert previous is None or previous <= elem
+                previous = elem
+            ops += 1
+    results.append(ops)
+
+
+def writer(skip_list, keys, seed, stop, results, net):
+    '''(obj, int, int, threading.Event, list, Counter) -> NoneType
+    Inserts and removes random keys until told to stop, recording the net
+    number of occurences it added of each; then records its number of
+    operations.
+    '''
+    rand = random.Random(seed)
+    ops = 0
+    while not stop.is_set():
+        key = rand.randrange(keys)
+        if rand.random() < 0.5:
+            skip_list.insert(key)
+            net[key] += 1
+        elif skip_list.remove(key):
+            net[key] -= 1
+        ops += 1
+    results.append(ops)
+
+
+def run(skip_list, readers, writers, seconds, keys, seed):
+    '''(obj, int, int, float, int, int) -> (int, int, Counter)
+    Runs the reader and writer threads on the given list for a number of
+    seconds. Returns the readers' and the writers' total operations, and the
+    net occurences added of every key.
+    '''
+    stop = threading.Event()
+    read_ops = []
+    write_ops = []
+    nets = []
+    threads = []
+    for index in range(readers):
+        threads.append(threading.Thread(
+            target=reader, args=(skip_list, keys, seed + index, stop,
+                                 read_ops)))
+    for index in range(writers):
+        nets.append(collections.Counter())
+        threads.append(threading.Thread(
+            target=writer, args=(skip_list, keys, seed + readers + index,
+                                 stop, write_ops, nets[-1])))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    net = collections.Counter()
+    for writer_net in nets:
+        net.update(writer_net)
+    return sum(read_ops), sum(write_ops), net
+
+
+def check(skip_list, net):
+    '''(ConcurrentSkipList, Counter) -> NoneType
+    Checks that the list holds exactly the net occurences the writers added,
+    and that every level is in order with no removed tower left on it.
+    '''
+    expected = sorted(collections.Counter(
+        {key: count for key, count in net.items() if count > 0}).elements())
+    assert list(skip_list) == expected, "contents differ from the writers'"
+    assert len(skip_list) == len(expected), "length differs from contents"
+    for level in range(len(skip_list._head._next_nodes)):
+        node = skip_list._head._next_nodes[level]
+        while node is not None:
+            assert not node._marked, "removed tower left on a level"
+            following = node._next_nodes[level]
+            assert following is None or node._key < following._key, (
+                "level out of order")
+            node = following
+
+
+def main(argv=None):
+    '''([list of str]) -> NoneType
+    Parses the command line, runs both lists and prints their throughput.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--keys', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print("GIL enabled:", is_gil_enabled)
+    for name, skip_list in (('ConcurrentSkipList', ConcurrentSkipList()),
+                            ('SkipList + global lock', LockedSkipList())):
+        read_ops, write_ops, net = run(skip_list, args.readers, args.writers,
+                                       args.seconds, args.keys, args.seed)
+        print("{}: {:.0f} reads/s, {:.0f} writes/s".format(
+            name, read_ops / args.seconds, write_ops / args.seconds))
+        if isinstance(skip_list, ConcurrentSkipList):
+            check(skip_list, net)
+            print("{}: consistent, {} occurences".format(name,
+                                                         len(skip_list)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,687 @@
+import bisect
+import heapq
+import itertools
+import multiprocessing
+import operator
+import os
+import random
+
+from skiplist import SkipList
+
+
+def _serve(conn, skip_list):
+    '''(Connection, SkipList) -> NoneType
+    Runs in a shard's worker process: calls every (function, args) request
+    received on the connection with the shard's skip list first, and sends
+    back (True, result), or (False, exception) if it raised; until None is
+    received.
+    '''
+    request = conn.recv()
+    while request is not None:
+        function, args = request
+        try:
+            reply = (True, function(skip_list, *args))
+        except Exception as error:
+            reply = (False, error)
+        conn.send(reply)
+        request = conn.recv()
+    conn.close()
+
+
+def _values(skip_list):
+    '''(SkipList) -> list
+    Returns every occurence in the skip list, in order.
+    '''
+    return list(skip_list)
+
+
+def _unique_values(skip_list):
+    '''(SkipList) -> list
+    Returns every distinct element in the skip list, in order.
+    '''
+    return list(skip_list.unique_iter())
+
+
+def _range_values(skip_list, lo, hi, inclusive):
+    '''(SkipList, obj, obj, (bool, bool)) -> list
+    Returns the elements of the skip list in the given range, in order.
+    '''
+    return list(skip_list.irange(lo, hi, inclusive))
+
+
+def _runs(skip_list):
+    '''(SkipList) -> list of (obj, obj, int)
+    Returns the skip list's (key, element, occurences) runs, in order.
+    '''
+    return list(skip_list._runs())
+
+
+def _merged_runs(skip_list, runs):
+    '''(SkipList, list of (obj, obj, int)) -> list of (obj, obj, int)
+    Returns the skip list's runs merged with the given sorted runs, in order.
+    '''
+    return list(heapq.merge(skip_list._runs(), runs,
+                            key=operator.itemgetter(0)))
+
+
+def _load_runs(skip_list, runs):
+    '''(SkipList, list of (obj, obj, int)) -> NoneType
+    Replaces the contents of the skip list with the given sorted runs.
+    '''
+    skip_list.clear()
+    skip_list._build_runs(runs)
+
+
+class _LocalShard:
+
+    '''A shard whose skip list lives in this process: requests run as soon
+    as they are sent.'''
+
+    def __init__(self, skip_list):
+        '''(_LocalShard, SkipList) -> NoneType
+        Initializes a shard holding the given skip list.
+        '''
+        self._skip_list = skip_list
+        self._reply = None
+
+    def send(self, function, *args):
+        '''(_LocalShard, function, ...) -> NoneType
+        Calls the function with the shard's skip list and the given args,
+        keeping its result (or exception) for receive.
+        '''
+        try:
+            self._reply = (True, function(self._skip_list, *args))
+        except Exception as error:
+            self._reply = (False, error)
+
+    def receive(self):
+        '''(_LocalShard) -> obj
+        Returns the result of the last request sent.
+
+        RAISES: whatever the request raised.
+        '''
+        succeeded, result = self._reply
+        self._reply = None
+        if not succeeded:
+            raise result
+        return result
+
+    def close(self):
+        '''(_LocalShard) -> NoneType
+        Does nothing; there is no process to stop.
+        '''
+
+
+class _ProcessShard(_LocalShard):
+
+    '''A shard whose skip list lives in a worker process of its own:
+    requests are sent down a pipe, so every shard works on its request at
+    the same time, and replies are read back in turn. The skip list, and
+    every argument and result, must be picklable.'''
+
+    def __init__(self, skip_list):
+        '''(_ProcessShard, SkipList) -> NoneType
+        Starts a worker process holding the given skip list.
+        '''
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child_conn, skip_list), daemon=True)
+        self._process.start()
+        child_conn.close()
+
+    def send(self, function, *args):
+        '''(_ProcessShard, function, ...) -> NoneType
+        Sends the request to the worker, without waiting for it.
+        '''
+        self._conn.send((function, args))
+
+    def receive(self):
+        '''(_ProcessShard) -> obj
+        Waits for and returns the result of the last request sent.
+
+        RAISES: whatever the request raised.
+        '''
+        succeeded, result = self._conn.recv()
+        if not succeeded:
+            raise result
+        return result
+
+    def close(self):
+        '''(_ProcessShard) -> NoneType
+        Stops the worker process.
+        '''
+        if self._process.is_alive():
+            self._conn.send(None)
+            self._process.join()
+        self._conn.close()
+
+
+class ShardedSkipList:
+
+    '''A skip list split by key range into shards, each its own SkipList:
+    the shard boundaries are sorted keys, and an element goes to the shard
+    after the last boundary not greater than its key, so equal elements
+    always share a shard and the shards, one after the other, hold the
+    elements in order. Shards can be kept in worker processes, one each:
+    bulk operations (insert_all, search_many, count_many, iteration and
+    range scans) then send every shard its part at once and collect the
+    results, using as many cores as there are shards.
+
+    Boundaries are chosen from a sample of the first elements loaded, and
+    chosen again (moving the elements between shards) whenever a shard
+    holds more than skew times its fair share of the elements.'''
+
+    # Default number of shards: one per core.
+    DEFAULT_SHARDS = os.cpu_count() or 1
+
+    # Default number of keys sampled to choose the boundaries.
+    DEFAULT_SAMPLE_SIZE = 1000
+
+    # A shard more than this many times bigger than the average one gets
+    # the boundaries chosen again.
+    DEFAULT_SKEW = 2.0
+
+    # Lists shorter than this are never rebalanced.
+    MIN_REBALANCE_LENGTH = 1000
+
+    # After a rebalance that left the list skewed (e.g. one key outweighing
+    # a shard's share), no other is tried until the length grows this much.
+    REBALANCE_GROWTH = 2
+
+    def __init__(self, shards=DEFAULT_SHARDS, boundaries=(),
+                 processes=False, skew=DEFAULT_SKEW, **options):
+        '''(ShardedSkipList [, int, list, bool, float, ...]) -> NoneType
+        Initializes an empty list of the given number of shards, split at the
+        given sorted boundary keys (at most one less than the shards; with
+        none, every element goes to the first shard until the list is
+        rebalanced). If processes is True, every shard lives in a worker
+        process. Any other options (fixed_p, counted, key, ...) configure the
+        shards' skip lists.
+
+        REQ: shards >= 1; with processes, the options are picklable.
+        '''
+        self._boundaries = list(boundaries)
+        self._skew = skew
+        self._processes = processes
+        self._options = options
+        self._key_func = options.get('key')
+        shard_class = _ProcessShard if processes else _LocalShard
+        self._shards = [shard_class(SkipList(**options))
+                        for shard in range(shards)]
+        self._lengths = [0] * shards
+        # The length the list must reach before it is rebalanced again.
+        self._rebalance_length = ShardedSkipList.MIN_REBALANCE_LENGTH
+
+    @classmethod
+    def from_iterable(cls, iterable, shards=DEFAULT_SHARDS,
+                      sample_size=DEFAULT_SAMPLE_SIZE, seed=None, **options):
+        '''(type, iterable [, int, int, obj, ...]) -> ShardedSkipList
+        Returns a new sharded list holding every element of the iterable, its
+        boundaries chosen from a random sample of their keys (reproducible
+        with a seed). The other options are as for the constructor.
+
+        RAISES: TypeError if the elements are not comparable with each other.
+        '''
+        elems = list(iterable)
+        sample = elems
+        if len(elems) > sample_size:
+            sample = random.Random(seed).sample(elems, sample_size)
+        key_func = options.get('key')
+        if key_func is not None:
+            sample = [key_func(elem) for elem in sample]
+        try:
+            sample.sort()
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+        boundaries = ShardedSkipList._split_keys(
+            ((key, 1) for key in sample), len(sample), shards)
+        sharded = cls(shards, boundaries, **options)
+        sharded.insert_all(elems)
+        return sharded
+
+    @staticmethod
+    def _split_keys(weighted_keys, total, shards):
+        '''(iterable of (obj, int), int, int) -> list
+        Returns the boundaries splitting the given sorted keys, weighted by
+        their occurences (total in all), into the given number of ranges of
+        about equal weight. Equal keys are never split, so there may be fewer
+        boundaries than shards less one.
+        '''
+        boundaries = []
+        shard = 1
+        weight_before = 0
+        for key, weight in weighted_keys:
+            if shard >= shards:
+                break
+            if (weight_before >= shard * total / shards and
+                    (not boundaries or boundaries[-1] < key)):
+                boundaries.append(key)
+                # Skip the shares of any shards a heavy key already spans.
+                while (shard < shards and
+                       weight_before >= shard * total / shards):
+                    shard += 1
+            weight_before += weight
+        return boundaries
+
+    def close(self):
+        '''(ShardedSkipList) -> NoneType
+        Stops the shards' worker processes, if any. The list cannot be used
+        afterwards.
+        '''
+        for shard in self._shards:
+            shard.close()
+
+    def __enter__(self):
+        '''(ShardedSkipList) -> ShardedSkipList
+        Returns this list, to be closed on leaving the with block.
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''(ShardedSkipList, type, Exception, traceback) -> NoneType
+        Closes this list.
+        '''
+        self.close()
+
+    def get_boundaries(self):
+        '''(ShardedSkipList) -> list
+        Returns the keys this list is split at.
+        '''
+        return list(self._boundaries)
+
+    def get_shard_lengths(self):
+        '''(ShardedSkipList) -> list of int
+        Returns the number of elements in each shard.
+        '''
+        return list(self._lengths)
+
+    def new_empty_skip_list(self):
+        '''(ShardedSkipList) -> ShardedSkipList
+        Creates an empty sharded list configured and split like this one.
+        '''
+        return ShardedSkipList(len(self._shards), self._boundaries,
+                               self._processes, self._skew, **self._options)
+
+    def _key_of(self, elem):
+        '''(ShardedSkipList, obj) -> obj
+        Returns the key the given element is ordered by.
+        '''
+        if self._key_func is None:
+            return elem
+        return self._key_func(elem)
+
+    def _shard_of(self, elem):
+        '''(ShardedSkipList, obj) -> int
+        Returns the index of the shard the given element belongs to.
+
+        RAISES TypeError if the element's key is incomparable with the
+        boundaries.
+        '''
+        return bisect.bisect_right(self._boundaries, self._key_of(elem))
+
+    def _partition(self, elems):
+        '''(ShardedSkipList, list) -> list of list of int
+        Returns, for each shard, the indices of the given elements that
+        belong to it.
+
+        RAISES TypeError if some element's key is incomparable with the
+        boundaries.
+        '''
+        parts = [[] for shard in self._shards]
+        for index, elem in enumerate(elems):
+            parts[self._shard_of(elem)].append(index)
+        return parts
+
+    def _call(self, requests):
+        '''(ShardedSkipList, list of (int, function, tuple)) -> list
+        Sends every (shard index, function, args) request before waiting for
+        any, so that shards in worker processes run them at the same time,
+        then returns their results in order.
+
+        RAISES: whatever the first failed request raised.
+        '''
+        for shard, function, args in requests:
+            self._shards[shard].send(function, *args)
+        results = []
+        error = None
+        for shard, function, args in requests:
+            # Every reply must be read, even past a failed one.
+            try:
+                results.append(self._shards[shard].receive())
+            except Exception as request_error:
+                if error is None:
+                    error = request_error
+        if error is not None:
+            raise error
+        return results
+
+    def _call_all(self, function, *args):
+        '''(ShardedSkipList, function, ...) -> list
+        Calls the function on every shard at once (see _call), returning the
+        results in shard order.
+        '''
+        return self._call([(shard, function, args)
+                           for shard in range(len(self._shards))])
+
+    def search(self, elem):
+        '''(ShardedSkipList, obj) -> obj
+        Returns the element if it is found, otherwise returns None.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            shard = self._shard_of(elem)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return self._call([(shard, SkipList.search, (elem,))])[0]
+
+    def __contains__(self, elem):
+        '''(ShardedSkipList, obj) -> bool
+        Returns whether the element is in this list.
+        '''
+        try:
+            return self.search(elem) is not None
+        except TypeError:
+            # Trying to find an element whose type is impossible to have.
+            return False
+
+    def count(self, elem):
+        '''(ShardedSkipList, obj) -> int
+        Returns the number of occurences of a given object in this list.
+
+        RAISES TypeError if trying to count with incompatible types.
+        '''
+        try:
+            shard = self._shard_of(elem)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return self._call([(shard, SkipList.count, (elem,))])[0]
+
+    def insert(self, elem):
+        '''(ShardedSkipList, obj) -> NoneType
+        Inserts an object into this list.
+
+        RAISES: TypeError if trying to add a non-comparable type.
+        '''
+        try:
+            shard = self._shard_of(elem)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+        self._call([(shard, SkipList.insert, (elem,))])
+        self._lengths[shard] += 1
+        self._rebalance_if_skewed()
+
+    def remove(self, elem):
+        '''(ShardedSkipList, obj) -> bool
+        Returns True iff the remove operation sucessfully found the element
+        and removed it.
+        '''
+        try:
+            shard = self._shard_of(elem)
+        except TypeError:
+            return False
+        removed = self._call([(shard, SkipList.remove, (elem,))])[0]
+        if removed:
+            self._lengths[shard] -= 1
+        return removed
+
+    def insert_all(self, iterable):
+        '''(ShardedSkipList, iterable) -> NoneType
+        Inserts every element of the iterable, each shard inserting its own
+        part (in parallel, with worker processes).
+
+        RAISES: TypeError if trying to add a non-comparable type.
+        '''
+        elems = list(iterable)
+        try:
+            parts = self._partition(elems)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+        requests = [(shard, SkipList.insert_all,
+                     ([elems[index] for index in part],))
+                    for shard, part in enumerate(parts) if part]
+        self._call(requests)
+        for shard, part in enumerate(parts):
+            self._lengths[shard] += len(part)
+        self._rebalance_if_skewed()
+
+    def _call_many(self, function, elems):
+        '''(ShardedSkipList, function, list) -> list
+        Calls a batch function (e.g. SkipList.search_many) on every shard with
+        its part of the given elements, and returns the results in the order
+        of the elements.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            parts = self._partition(elems)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        parts = [(shard, part) for shard, part in enumerate(parts) if part]
+        replies = self._call([(shard, function,
+                               ([elems[index] for index in part],))
+                              for shard, part in parts])
+        results = [None] * len(elems)
+        for (shard, part), reply in zip(parts, replies):
+            for index, result in zip(part, reply):
+                results[index] = result
+        return results
+
+    def search_many(self, iterable):
+        '''(ShardedSkipList, iterable) -> list
+        Returns, for each element of the given iterable in its order, the
+        element if it is found, otherwise None; every shard searching for its
+        own part (in parallel, with worker processes).
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self._call_many(SkipList.search_many, list(iterable))
+
+    def count_many(self, iterable):
+        '''(ShardedSkipList, iterable) -> list of int
+        Returns the number of occurences of each element of the given
+        iterable, in its order; every shard counting its own part (in
+        parallel, with worker processes).
+
+        RAISES TypeError if trying to count with incompatible types.
+        '''
+        return self._call_many(SkipList.count_many, list(iterable))
+
+    def _shards_in_range(self, lo, hi):
+        '''(ShardedSkipList, obj, obj) -> range
+        Returns the indices of the shards that may hold elements between the
+        bounds lo and hi (None meaning unbounded).
+        '''
+        first = 0
+        if lo is not None:
+            first = self._shard_of(lo)
+        stop = len(self._shards)
+        if hi is not None:
+            stop = self._shard_of(hi) + 1
+        return range(first, stop)
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(ShardedSkipList [, obj, obj, (bool, bool)]) -> int
+        Returns the number of elements between lo and hi (see
+        SkipList.count_range), counted by the shards the range overlaps.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            shards = self._shards_in_range(lo, hi)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return sum(self._call([(shard, SkipList.count_range,
+                                (lo, hi, inclusive)) for shard in shards]))
+
+    def irange(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(ShardedSkipList [, obj, obj, (bool, bool)]) -> iterator
+        Returns an iterator over the elements between lo and hi (see
+        SkipList.irange), in order: the shards the range overlaps scan their
+        parts of it at once, one after the other holding the next elements.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            shards = self._shards_in_range(lo, hi)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return itertools.chain.from_iterable(
+            self._call([(shard, _range_values, (lo, hi, inclusive))
+                        for shard in shards]))
+
+    def __iter__(self):
+        '''(ShardedSkipList) -> iterator
+        Returns an iterator over every occurence in this list, in order.
+        '''
+        return itertools.chain.from_iterable(self._call_all(_values))
+
+    def unique_iter(self):
+        '''(ShardedSkipList) -> iterator
+        Returns an iterator over every distinct element in this list, in
+        order; equal elements are always in the same shard.
+        '''
+        return itertools.chain.from_iterable(self._call_all(_unique_values))
+
+    def __len__(self):
+        '''(ShardedSkipList) -> int
+        Returns the number of elements in this list.
+        '''
+        return sum(self._lengths)
+
+    def get_fingerprint(self):
+        '''(ShardedSkipList) -> int or NoneType
+        Returns the fingerprint of this list's contents (see
+        SkipList.get_fingerprint), combined from its shards'. Worker
+        processes may each hash strings with a seed of their own, so with
+        them every run is hashed here instead, in O(n).
+        '''
+        if self._processes:
+            fingerprint = 0
+            try:
+                for key, elem, count in itertools.chain.from_iterable(
+                        self._call_all(_runs)):
+                    fingerprint += hash(elem) * count
+            except TypeError:
+                # Unhashable, as a skip list's own fingerprint would be.
+                return None
+            return fingerprint & SkipList.FINGERPRINT_MASK
+        fingerprints = self._call_all(SkipList.get_fingerprint)
+        if None in fingerprints:
+            return None
+        return sum(fingerprints) & SkipList.FINGERPRINT_MASK
+
+    def __eq__(self, skiplist2):
+        '''(ShardedSkipList, SkipList) -> bool
+        Returns whether both hold the same elements, as many times each.
+        '''
+        if len(self) != len(skiplist2):
+            return False
+        # Lists without fingerprints (e.g. snapshots) are just compared
+        # element by element; so are lists in worker processes, whose
+        # fingerprints cost as much as the comparison.
+        get_fingerprint2 = getattr(skiplist2, 'get_fingerprint', None)
+        if get_fingerprint2 is not None and not self._processes:
+            fingerprint = self.get_fingerprint()
+            fingerprint2 = get_fingerprint2()
+            if (fingerprint is not None and fingerprint2 is not None and
+                    fingerprint != fingerprint2):
+                return False
+        return all(elem == elem2 for elem, elem2 in zip(self, skiplist2))
+
+    def __add__(self, skiplist2):
+        '''(ShardedSkipList, SkipList) -> ShardedSkipList
+        Returns a new sharded list, split like this one, holding the elements
+        of both. Every shard merges its runs with its part of the given list
+        (in parallel, with worker processes), and the merged runs are
+        bulk-loaded into the new list's shards.
+
+        RAISES: TypeError if the two hold incomparable types.
+        '''
+        try:
+            parts = self._runs_by_shard(skiplist2)
+            merged = self._call([(shard, _merged_runs, (part,))
+                                 for shard, part in enumerate(parts)])
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+        sum_list = self.new_empty_skip_list()
+        sum_list._call([(shard, _load_runs, (runs,))
+                        for shard, runs in enumerate(merged)])
+        sum_list._lengths = [sum(count for key, elem, count in runs)
+                             for runs in merged]
+        sum_list._rebalance_if_skewed()
+        return sum_list
+
+    def _runs_by_shard(self, skiplist2):
+        '''(ShardedSkipList, SkipList) -> list of list of (obj, obj, int)
+        Returns, for each shard of this list, the sorted (key, element,
+        occurences) runs of the given list that belong to it.
+
+        RAISES TypeError if some element's key is incomparable with the
+        boundaries.
+        '''
+        if (isinstance(skiplist2, ShardedSkipList) and
+                skiplist2._boundaries == self._boundaries and
+                len(skiplist2._shards) == len(self._shards) and
+                skiplist2._key_func is self._key_func):
+            # Split alike: every shard's part is its counterpart's runs.
+            return skiplist2._call_all(_runs)
+        parts = [[] for shard in self._shards]
+        for elem in skiplist2:
+            key = self._key_of(elem)
+            parts[bisect.bisect_right(self._boundaries, key)].append(
+                (key, elem, 1))
+        # Already in order, unless the given list orders by another key.
+        for part in parts:
+            part.sort(key=operator.itemgetter(0))
+        return parts
+
+    def __iadd__(self, skiplist2):
+        '''(ShardedSkipList, SkipList) -> ShardedSkipList
+        Adds every element of the given list to this one.
+
+        RAISES: TypeError if the two hold incomparable types.
+        '''
+        self.insert_all(skiplist2)
+        return self
+
+    def _is_skewed(self):
+        '''(ShardedSkipList) -> bool
+        Returns whether some shard holds more than skew times the average
+        number of elements.
+        '''
+        return (len(self._shards) > 1 and max(self._lengths) >
+                self._skew * len(self) / len(self._shards))
+
+    def _rebalance_if_skewed(self):
+        '''(ShardedSkipList) -> NoneType
+        Rebalances this list if it is skewed and long enough. If it is still
+        skewed afterwards, no split can fix it yet, so the next try waits
+        until the list has grown REBALANCE_GROWTH times longer.
+        '''
+        length = len(self)
+        if length >= self._rebalance_length and self._is_skewed():
+            self.rebalance()
+            if self._is_skewed():
+                self._rebalance_length = (ShardedSkipList.REBALANCE_GROWTH *
+                                          length)
+            else:
+                self._rebalance_length = ShardedSkipList.MIN_REBALANCE_LENGTH
+
+    def rebalance(self):
+        '''(ShardedSkipList) -> NoneType
+        Chooses the boundaries again, from every element rather than a sample,
+        so the shards hold about as many elements each (equal elements still
+        sharing one), and moves the elements to their new shards.
+        '''
+        runs = list(itertools.chain.from_iterable(self._call_all(_runs)))
+        self._boundaries = ShardedSkipList._split_keys(
+            ((key, count) for key, elem, count in runs), len(self),
+            len(self._shards))
+        parts = [[] for shard in self._shards]
+        for run in runs:
+            parts[bisect.bisect_right(self._boundaries, run[0])].append(run)
+        self._call([(shard, _load_runs, (part,))
+                    for shard, part in enumerate(parts)])
+        self._lengths = [sum(count for key, elem, count in part)
+                         for part in parts]
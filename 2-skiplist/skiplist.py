@@ -1,4 +1,9 @@
+import heapq
+import io
+import math
+import operator
 import random
+import weakref
 
 
 class BaseNode:
@@ -38,11 +43,11 @@ class BaseNode:
         '''(BaseNode) -> BaseNode
         Returns the last level of nodes.
         '''
-        # Recursively; if there is a below node, request a below node
-        if self._below_node is not None:
-            return self._below_node.get_last_below_node()
-        # Base case; no more below nodes, so return itself.
-        return self
+        # Must be iterative, tall lists may cause an issue o/w.
+        node = self
+        while node._below_node is not None:
+            node = node._below_node
+        return node
 
     def __eq__(self, elem):
         '''(BaseNode, obj) -> bool
@@ -110,6 +115,8 @@ class HeadNode(TailNode):
     HEAD_NODE_STR = 'head'
     # String formatting constant
     NEW_LINE = '\n'
+    # Written in place of the nodes or levels left out of a capped dump.
+    TRUNCATED_STR = '...'
 
     def __init__(self, below_node=None, next_node=None):
         '''(HeadNode [, BaseNode, BaseNode]) -> NoneType
@@ -148,49 +155,91 @@ class HeadNode(TailNode):
         # Just return saying Head.
         return HeadNode.HEAD_NODE_STR
 
-    def level_to_str(self, node_sep=' -> '):
-        '''(HeadNode) -> str
-        Returns a string representation of this level starting at this node.
+    def _level_nodes(self):
+        '''(HeadNode) -> generator of HeadNode
+        Yields the nodes to the right of this one on its level, up to (not
+        including) the tail.
         '''
         # Cannot be done recursively o/wise recursion depth error
-        # Thus loop through all nodes on the right and add.
-        ret = str(self)
+        # Thus loop through all nodes on the right.
         h = self._next_node
 
         # Stop loop if h None or h is a TalNode
         while (h is not None) and (type(h) is not TailNode):
-            # Append to ret the str() of this node and set to next.
-            ret += node_sep + str(h)
+            yield h
             h = h._next_node
 
-        return ret
+    def level_to_str(self, node_sep=' -> '):
+        '''(HeadNode) -> str
+        Returns a string representation of this level starting at this node.
+        '''
+        # Joined once, rather than grown one node at a time.
+        return node_sep.join([str(self)] +
+                             [str(node) for node in self._level_nodes()])
 
     def levels_to_str(self, node_sep=' -> '):
         '''(HeadNode) -> str
         Returns a string representation of all levels starting at this level.
         '''
-        # Get the entire level as a string
-        ret = self.level_to_str()
-
-        # Recursively request the next level.
-        below = self.get_below_node()
-        if below is not None:
-            ret += HeadNode.NEW_LINE + below.levels_to_str(node_sep)
-
-        return ret
+        ret = io.StringIO()
+        self.write_levels(ret, node_sep)
+        return ret.getvalue()
+
+    def write_levels(self, file, node_sep=' -> ', max_width=None,
+                     max_depth=None):
+        '''(HeadNode, file [, str, int, int]) -> NoneType
+        Writes all levels starting at this level to the given text file, one
+        line per level, a node at a time so that no string of a whole level
+        is ever built. At most max_width nodes after the first are written per
+        level, and at most max_depth levels, if given; what is left out is
+        marked by '...'.
+        '''
+        # Loop down the levels, since recursion could go too deep.
+        head = self
+        depth = 0
+        while head is not None:
+            if depth:
+                file.write(HeadNode.NEW_LINE)
+            if max_depth is not None and depth == max_depth:
+                file.write(HeadNode.TRUNCATED_STR)
+                return
+            HeadNode._write_level(file, head, head._level_nodes(), node_sep,
+                                  max_width)
+            head = head.get_below_node()
+            depth += 1
+
+    @staticmethod
+    def _write_level(file, first, nodes, node_sep, max_width):
+        '''(file, obj, iterable, str, int or NoneType) -> NoneType
+        Writes a level to the given text file: the first node, then the rest
+        of the given nodes, at most max_width of them if given, followed by
+        '...' if any were left out.
+        '''
+        file.write(str(first))
+        written = 0
+        for node in nodes:
+            if written == max_width:
+                file.write(node_sep + HeadNode.TRUNCATED_STR)
+                return
+            file.write(node_sep + str(node))
+            written += 1
 
     def __len__(self):
         '''(SkipList) -> int
         Returns an integer representing the length of this list.
         '''
-        # Starting at one (which is this node)...
+        # Starting at one (which is this node), count every other node up to
+        # and including the tail; iteratively, as long levels may cause an
+        # issue o/w.
         length = 1
-
-        # Add the length of all other nodes.
-        if self._next_node:
-            length += len(self._next_node)
-
-        # Return the final accumulated length.
+        node = self._next_node
+        while isinstance(node, HeadNode):
+            length += 1
+            node = node._next_node
+
+        # The tail (or any other base node) ends the level.
+        if node is not None:
+            length += 1
         return length
 
 
@@ -272,16 +321,369 @@ class ElementNode(HeadNode):
 
         REQ: The list must be ordered in a non-descending fashion
         '''
-        # Base case; If we've reached a node greater than element, return 0
-        if self.get_value() > elem:
-            return 0
-        else:
+        # Must be iterative, long levels may cause an issue o/w. Stop at the
+        # first node greater than the element, or past the element nodes.
+        ret = 0
+        node = self
+        while isinstance(node, ElementNode) and not node.get_value() > elem:
             # Check if the node has a value equal to this element.
-            ret = 0
-            if self.get_value() == elem:
+            if node.get_value() == elem:
                 ret += 1
-            # Add the count of the next node as well (recursive step).
-            return ret + self.get_next_node().count(elem)
+            node = node.get_next_node()
+        return ret
+
+
+class TowerNode:
+
+    '''A single skip list element, stored once as a tower. It holds the value
+    and one forward pointer per level it is linked on, index 0 being the
+    bottom level. A forward pointer of None marks the end of that level.
+    The multiplicity is the number of occurences the tower stands for, which
+    is always one unless the list stores duplicates as counts. Every forward
+    pointer also has a span width: the number of occurences it passes over,
+    up to and including those of the node it points to (or to the end of the
+    list, for a pointer of None). The key is what the list orders by; it is
+    the value itself unless the list has a key function, in which case it
+    is computed once, when the tower is made. While snapshots of the list
+    are open, the history keeps images of the tower from before it changed,
+    as (epoch, forward pointers, widths, multiplicity) tuples.'''
+
+    # Fixed attribute layout; no per-node __dict__ is allocated.
+    __slots__ = ('_value', '_key', '_next_nodes', '_widths', '_count',
+                 '_history')
+
+    def __init__(self, value, height=1, count=1):
+        '''(TowerNode, obj [, int, int]) -> NoneType
+        Constructs a tower holding the given value, linked on height levels
+        (one by default) with every forward pointer set to None, and standing
+        for count occurences of the value (one by default). Its key is the
+        value itself until set otherwise.
+        '''
+        self._value = value
+        self._key = value
+        self._next_nodes = [None] * height
+        self._widths = [0] * height
+        self._count = count
+        self._history = None
+
+    def get_value(self):
+        '''(TowerNode) -> obj
+        Accessor for the value of this node.
+        '''
+        return self._value
+
+    def get_key(self):
+        '''(TowerNode) -> obj
+        Accessor for the key this node is ordered by.
+        '''
+        return self._key
+
+    def get_count(self):
+        '''(TowerNode) -> int
+        Returns the number of occurences of the value this tower stands for.
+        '''
+        return self._count
+
+    def get_height(self):
+        '''(TowerNode) -> int
+        Returns the number of levels this tower is linked on.
+        '''
+        return len(self._next_nodes)
+
+    def get_next_node(self, level=0):
+        '''(TowerNode [, int]) -> TowerNode or NoneType
+        Returns the next node on the given level (bottom level by default),
+        or None if this is the last node on that level.
+        '''
+        return self._next_nodes[level]
+
+    def set_next_node(self, node_to_set, level=0):
+        '''(TowerNode, TowerNode or NoneType [, int]) -> NoneType
+        Sets the next node on the given level (bottom level by default).
+        '''
+        self._next_nodes[level] = node_to_set
+
+    def get_width(self, level=0):
+        '''(TowerNode [, int]) -> int
+        Returns the span width of the forward pointer on the given level
+        (bottom level by default).
+        '''
+        return self._widths[level]
+
+    def add_level(self, next_node=None, width=0):
+        '''(TowerNode [, TowerNode, int]) -> NoneType
+        Raises this tower by one level, pointing the new level at next_node
+        with the given span width.
+        '''
+        self._next_nodes.append(next_node)
+        self._widths.append(width)
+
+    def __str__(self):
+        '''(TowerNode) -> str
+        Returns the string representation of this node's value.
+        '''
+        return str(self._value)
+
+
+class BackLinkedTowerNode(TowerNode):
+
+    '''A tower that also links back to the tower before it on the bottom
+    level, for skip lists kept with backward links.'''
+
+    __slots__ = ('_prev',)
+
+    def __init__(self, value, height=1, count=1):
+        '''(BackLinkedTowerNode, obj [, int, int]) -> NoneType
+        Constructs an unlinked tower, with nothing before it yet.
+        '''
+        super().__init__(value, height, count)
+        self._prev = None
+
+    def get_prev_node(self):
+        '''(BackLinkedTowerNode) -> TowerNode or NoneType
+        Returns the tower before this one on the bottom level, or None if
+        this is the first one.
+        '''
+        return self._prev
+
+
+class HeadTower(TowerNode):
+
+    '''The head of a tower-based skip list: a valueless tower that is always
+    as tall as the tallest element tower.'''
+
+    __slots__ = ()
+
+    def __init__(self, height=1):
+        '''(HeadTower [, int]) -> NoneType
+        Constructs an empty head tower with the given number of levels.
+        '''
+        super().__init__(None, height)
+
+    def remove_level(self):
+        '''(HeadTower) -> NoneType
+        Discards the top level of this head tower.
+        '''
+        self._next_nodes.pop()
+        self._widths.pop()
+
+    def __str__(self):
+        '''(HeadTower) -> str
+        Returns the string representation of a head, which is 'head'.
+        '''
+        return HeadNode.HEAD_NODE_STR
+
+
+class LevelGenerator:
+
+    '''Draws the heights of new skip list towers. A height is drawn at once
+    from a geometric distribution (each extra level with the probability
+    fixed_p), rather than by tossing a coin per level, and never exceeds the
+    maximum level. Unless given, the maximum level is derived from the
+    expected number of elements, as log base 1/fixed_p of it. Every
+    generator has its own random number generator, so a seeded one always
+    draws the same heights.'''
+
+    # Default expected size, used to cap heights when none is given.
+    DEFAULT_EXPECTED_SIZE = 2 ** 32
+
+    # The probability at which a height is the number of trailing zero bits
+    # in a random integer.
+    BIT_PROBABILITY = 0.5
+
+    def __init__(self, fixed_p=0.5, expected_size=None, max_level=None,
+                 seed=None):
+        '''(LevelGenerator [, float, int, int, obj]) -> NoneType
+        Initializes a generator of heights, each extra level having the
+        probability fixed_p, capped at max_level (or at the level derived from
+        expected_size). If a seed is given, the heights drawn are
+        reproducible.
+
+        REQ: fixed_p range is 0 < fixed_p < 1, max_level >= 1.
+        RAISES RandProbException if fixed_P is not in said range.
+        '''
+        if (fixed_p <= SkipList.PROB_LOWER_BOUND or
+                fixed_p >= SkipList.PROB_UPPER_BOUND):
+            raise SkipList.RandProbException(fixed_p)
+        self._probability = fixed_p
+        self._expected_size = expected_size
+        if max_level is None:
+            if expected_size is None:
+                expected_size = LevelGenerator.DEFAULT_EXPECTED_SIZE
+            max_level = LevelGenerator.level_for_size(expected_size, fixed_p)
+        self._max_level = max_level
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._log_p = math.log(fixed_p)
+
+    @staticmethod
+    def level_for_size(expected_size, fixed_p=0.5):
+        '''(int [, float]) -> int
+        Returns the number of levels worth having in a list of the expected
+        size, with the given probability: log base 1/fixed_p of the size,
+        rounded up (and at least one).
+        '''
+        if expected_size <= 1:
+            return 1
+        return max(1, math.ceil(math.log(expected_size) / -math.log(fixed_p)))
+
+    def get_probability(self):
+        '''(LevelGenerator) -> float
+        Returns the probability of a tower reaching each extra level.
+        '''
+        return self._probability
+
+    def get_max_level(self):
+        '''(LevelGenerator) -> int
+        Returns the greatest height this generator draws.
+        '''
+        return self._max_level
+
+    def is_balancing(self):
+        '''(LevelGenerator) -> bool
+        Returns whether the list must rebalance its towers itself after each
+        change, rather than rely on the heights drawn.
+        '''
+        return False
+
+    def height(self):
+        '''(LevelGenerator) -> int
+        Returns the height of a new tower, from a single random draw.
+        '''
+        if self._max_level == 1:
+            return 1
+        if self._probability == LevelGenerator.BIT_PROBABILITY:
+            # Each trailing zero bit is one more level; the bit set above the
+            # random ones caps the height.
+            bits = (self._random.getrandbits(self._max_level - 1) |
+                    1 << (self._max_level - 1))
+            return (bits & -bits).bit_length()
+        # Invert the geometric distribution: P(height > h) = fixed_p ** h.
+        draw = 1.0 - self._random.random()
+        return min(1 + int(math.log(draw) / self._log_p), self._max_level)
+
+    def height_at(self, position):
+        '''(LevelGenerator, int) -> int
+        Returns the height of the tower at the given (one-based) position
+        when bulk-loading a list in order.
+        '''
+        return self.height()
+
+    def spawn(self, fixed_p=None):
+        '''(LevelGenerator [, float]) -> LevelGenerator
+        Returns a new generator configured like this one (with the given
+        probability instead, if any). The seed of a seeded generator's spawn
+        is drawn from this one, so it is reproducible as well.
+        '''
+        if fixed_p is None:
+            fixed_p = self._probability
+        seed = None
+        if self._seed is not None:
+            seed = self._random.getrandbits(64)
+        if self._expected_size is None and fixed_p != self._probability:
+            # The derived cap depends on the probability; derive it again.
+            max_level = None
+        else:
+            max_level = self._max_level
+        return LevelGenerator(fixed_p, self._expected_size, max_level, seed)
+
+
+class DeterministicLevels(LevelGenerator):
+
+    '''Keeps a skip list balanced deterministically, as a 1-2-3 skip list:
+    between any two consecutive towers reaching a level (or the head and
+    the end of the list) there are at most three towers reaching exactly the
+    level below. New towers get a single level; whenever a gap grows past
+    three towers, some of them are raised one level. So a search never takes
+    more than four steps on any level, in the worst case, whatever the order
+    of insertions. Removals never lower a tower, so after many of them the
+    height is bounded by that of the largest size the list has had.'''
+
+    def __init__(self):
+        '''(DeterministicLevels) -> NoneType
+        Initializes a deterministic generator: there is nothing to draw.
+        '''
+        super().__init__(LevelGenerator.BIT_PROBABILITY, max_level=1)
+
+    def is_balancing(self):
+        '''(DeterministicLevels) -> bool
+        Returns True: the list rebalances after each change.
+        '''
+        return True
+
+    def height(self):
+        '''(DeterministicLevels) -> int
+        Returns the height of a new tower, which is always one.
+        '''
+        return 1
+
+    def height_at(self, position):
+        '''(DeterministicLevels, int) -> int
+        Returns the height of the tower at the given (one-based) position
+        when bulk-loading a list in order: one, plus the number of times two
+        divides the position. This builds a perfectly balanced list.
+        '''
+        return (position & -position).bit_length()
+
+    def spawn(self, fixed_p=None):
+        '''(DeterministicLevels [, float]) -> DeterministicLevels
+        Returns a new deterministic generator; there is no probability.
+        '''
+        return DeterministicLevels()
+
+
+class SkipListStats:
+
+    '''Counters of the work done by an instrumented skip list (see
+    SkipList.instrument): descents from the top level, key comparisons made
+    on the way, horizontal steps (moves forward along a level), vertical
+    steps (levels passed through) and towers allocated. Descending is most
+    of the work of every operation, so the counters made on the way are also
+    reported per descent.'''
+
+    # Names of the counters, in the order they are reported.
+    COUNTERS = ('descents', 'comparisons', 'horizontal_steps',
+                'vertical_steps', 'allocations')
+    # Names of the counters also reported per descent.
+    PER_DESCENT = ('comparisons', 'horizontal_steps', 'vertical_steps')
+
+    def __init__(self):
+        '''(SkipListStats) -> NoneType
+        Initializes every counter to zero.
+        '''
+        self.reset()
+
+    def reset(self):
+        '''(SkipListStats) -> NoneType
+        Sets every counter back to zero.
+        '''
+        self.descents = 0
+        self.comparisons = 0
+        self.horizontal_steps = 0
+        self.vertical_steps = 0
+        self.allocations = 0
+
+    def as_dict(self):
+        '''(SkipListStats) -> dict of str: int
+        Returns the counters by name.
+        '''
+        return {name: getattr(self, name) for name in SkipListStats.COUNTERS}
+
+    def per_descent(self):
+        '''(SkipListStats) -> dict of str: float
+        Returns the comparisons, horizontal steps and vertical steps made per
+        descent, on average, by name (all zero if there were no descents).
+        '''
+        descents = self.descents or 1
+        return {name: getattr(self, name) / descents
+                for name in SkipListStats.PER_DESCENT}
+
+    def __str__(self):
+        '''(SkipListStats) -> str
+        Returns the counters as name=value pairs.
+        '''
+        return ' '.join('{}={}'.format(name, getattr(self, name))
+                        for name in SkipListStats.COUNTERS)
 
 
 class SkipList:
@@ -297,10 +699,22 @@ class SkipList:
     EMPTY_LIST_LEN = 0
     EMPTY_LIST_COUNT = 0
 
+    # Level indices: the bottom level holds every element.
+    BOTTOM_LEVEL = 0
+
+    # Fingerprints are sums of element hashes, modulo 2 ** 64.
+    FINGERPRINT_MASK = 2 ** 64 - 1
+
+    # The most towers reaching exactly one level below, between two towers
+    # reaching a level, in a deterministic (1-2-3) list.
+    BALANCED_GAP_MAX = 3
+
     # Skip list errors
     ERROR_TYPE_SEARCH = ("Cannot search with incomparable types.")
     ERROR_TYPE_INSERT = ("When inserting, the type must be comparable with "
                          + " whatever is already in the list.")
+    ERROR_INDEX = "SkipList index out of range."
+    ERROR_EMPTY = "The SkipList is empty."
 
     # Nested exception class for appropriately making a SkipList module.
     class RandProbException(Exception):
@@ -317,23 +731,28 @@ class SkipList:
 
         def __str__(self):
             if self._fixed_p <= SkipList.PROB_LOWER_BOUND:
-                return RandProbException.FIXED_P_MINIMUM
+                return SkipList.RandProbException.FIXED_P_MINIMUM
             else:
-                return RandProbException.FIXED_P_MAXIMUM
+                return SkipList.RandProbException.FIXED_P_MAXIMUM
 
     # Nested, private iterator helper class for encapsulation and modular code.
     class _SkipIterator:
 
-        '''The iterator used for looping through all or unique elements in a
-        singly-linked list, and it actively excludes the tail/sentinel.
+        '''The iterator used for looping through all or unique elements on the
+        bottom level of a skip list, stopping at the end of the level.
         '''
 
-        def __init__(self, cur_node, unique_mode=False):
-            '''(_SkipIterator, HeadNode) -> NoneType
-            Creates an iterator given the HeadNode to start iterating upon.
-            (Note that since ElementNode extends HeadNode, it too is an
-            acceptable init cur_node value.) It also takes a unique_mode
-            parameter, where it passes over duplicates.
+        # Marker for "no element seen yet" in unique mode, since None may be
+        # a legitimate element.
+        _NO_ELEM = object()
+
+        def __init__(self, cur_node, unique_mode=False, express=False):
+            '''(_SkipIterator, TowerNode [, bool, bool]) -> NoneType
+            Creates an iterator given the node to start iterating after (most
+            often the HeadTower). It also takes a unique_mode parameter, where
+            it passes over duplicates; and if express is True, it passes over
+            each run of them along the express lanes, which requires nodes
+            with equal keys to hold equal elements (i.e. no key function).
             '''
             # Save the current node as the loop node.
             self._loop_node = cur_node
@@ -341,7 +760,11 @@ class SkipList:
             # Unique mode: only iterating through one occurence of each elem.
             self._unique_mode = unique_mode
             if self._unique_mode:
-                self._last_elem = None
+                self._last_elem = SkipList._SkipIterator._NO_ELEM
+                self._express = express
+
+            # Occurences of the current node's value still to be returned.
+            self._repeat = 0
 
         def __iter__(self):
             '''(_SkipIterator) -> _SkipIterator
@@ -353,42 +776,553 @@ class SkipList:
             '''(_SkipIterator) -> obj
             Returns the next object in this list.
             '''
-            # If the current loop node is a sentinel, stop as we've finished.
-            if type(self._loop_node) is TailNode:
+            # If the list has been exhausted, stop.
+            if self._loop_node is None:
                 raise StopIteration()
-            else:
-                # If the next node is not a sentinel then continue; else stop.
-                next_node = self._loop_node.get_next_node()
 
-                # If in unique mode, continue until unique element.
-                if self._unique_mode:
-                    while next_node == self._last_elem:
-                        next_node = next_node.get_next_node()
+            # A counted tower returns its value once per occurence.
+            if self._repeat:
+                self._repeat -= 1
+                return self._loop_node._value
+
+            next_node = self._loop_node._next_nodes[SkipList.BOTTOM_LEVEL]
+
+            # Pass over tombstones (towers with no occurences left); if in
+            # unique mode, continue until unique element.
+            if self._unique_mode:
+                if (self._express and
+                        self._last_elem is not SkipList._SkipIterator._NO_ELEM):
+                    # Jump straight past the run of the last element.
+                    next_node = self._run_end()._next_nodes[
+                        SkipList.BOTTOM_LEVEL]
+                while (next_node is not None and
+                       (not next_node._count or
+                        next_node._value == self._last_elem)):
+                    next_node = next_node._next_nodes[SkipList.BOTTOM_LEVEL]
+                if next_node is not None:
                     # Update the last element.
-                    self._last_elem = next_node
+                    self._last_elem = next_node._value
+            else:
+                while next_node is not None and not next_node._count:
+                    next_node = next_node._next_nodes[SkipList.BOTTOM_LEVEL]
 
-                # WE stop iff next node is a sentinel
-                if type(next_node) is TailNode:
-                    raise StopIteration()
+            # We stop iff there is no next node.
+            self._loop_node = next_node
+            if next_node is None:
+                raise StopIteration()
+            if not self._unique_mode:
+                self._repeat = next_node._count - 1
+            return next_node._value
+
+        def _run_end(self):
+            '''(_SkipIterator) -> TowerNode
+            Returns the last node with the same key as the loop node. It
+            rides the tallest level of every node reached while the next node
+            there is still in the run, then comes down the levels; so a run of
+            k nodes takes O(log k) expected steps, rather than k.
+            '''
+            node = self._loop_node
+            key = node._key
+            level = SkipList.BOTTOM_LEVEL
+            while True:
+                next_node = node._next_nodes[level]
+                if next_node is None or not next_node._key == key:
+                    break
+                node = next_node
+                level = len(node._next_nodes) - 1
+
+            # Nothing further on this level is in the run; look below.
+            while level > SkipList.BOTTOM_LEVEL:
+                level -= 1
+                next_node = node._next_nodes[level]
+                while next_node is not None and next_node._key == key:
+                    node = next_node
+                    next_node = node._next_nodes[level]
+            return node
+
+    # Nested, private finger class; fingers are handed out by finger().
+    class _Finger:
+
+        '''A finger (cursor) into a skip list that remembers the search path
+        of its last operation. Searches, inserts and removes near that point
+        climb only as high as the distance to it requires, then descend; so
+        they take O(log d) expected time, d being that distance, instead of
+        always starting over from the top of the head.
+        '''
+
+        def __init__(self, skip_list):
+            '''(_Finger, SkipList) -> NoneType
+            Creates a finger on the given skip list, with no path yet.
+            '''
+            self._skip_list = skip_list
+            self._update = None
+            self._ranks = None
+            # The list's version the path was recorded at.
+            self._version = None
+
+        def _locate(self, key):
+            '''(_Finger, obj) -> (list of TowerNode, list of int)
+            Moves this finger to the given key, returning the update vector
+            and ranks of the first node with it (as SkipList._find_update
+            does).
+
+            RAISES TypeError if there was an issue comparing elements.
+            '''
+            skip_list = self._skip_list
+            head = skip_list._head
+            update = self._update
+            if (self._version != skip_list._version or
+                    len(update) != len(head._next_nodes)):
+                # The list changed under this finger; start over from the top.
+                self._update, self._ranks = skip_list._find_update(key)
+                self._version = skip_list._version
+                return self._update, self._ranks
+
+            # Climb while this level's predecessor is not before the key, or
+            # its successor is; the lowest level with neither is where the old
+            # path can be picked up again.
+            ranks = self._ranks
+            top = len(update) - 1
+            level = SkipList.BOTTOM_LEVEL
+            while level < top:
+                before_node = update[level]
+                next_node = before_node._next_nodes[level]
+                if ((before_node is not head and
+                        not before_node._key < key) or
+                        (next_node is not None and next_node._key < key)):
+                    level += 1
                 else:
-                    # If it's not a sentinel, valid element node; return it.
-                    self._loop_node = next_node
-                    return next_node.get_value()
+                    break
 
-    def __init__(self, fixed_p=DEFAULT_PROBABILITY):
-        '''(SkipList[, int]) -> NoneType
-        Initializes the SkipList the coin-toss probability number given or
-        default at 0.5.
+            if update[level] is not head and not update[level]._key < key:
+                # Even the top level is past the key; come back from the head.
+                update[level] = head
+                ranks[level] = 0
+
+            # Descend from there, exactly as a search from the head would.
+            skip_list._find_before(key, update=update, ranks=ranks,
+                                   top=level)
+            return update, ranks
+
+        def search(self, elem):
+            '''(_Finger, obj) -> obj
+            Returns the element if it is found, otherwise returns None, moving
+            this finger to it.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            skip_list = self._skip_list
+            try:
+                key = skip_list._key_of(elem)
+                update, ranks = self._locate(key)
+                found = skip_list._find_in_run(
+                    update[SkipList.BOTTOM_LEVEL], key, elem)[0]
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+            if found is not None:
+                return found._value
+            return None
+
+        def insert(self, elem):
+            '''(_Finger, obj) -> NoneType
+            Inserts an object into the skip list, moving this finger to it.
+
+            RAISES: TypeError if trying to add a non-comparable type (w/ those
+            in the list).
+            '''
+            try:
+                key = self._skip_list._key_of(elem)
+                update, ranks = self._locate(key)
+            except TypeError:
+                # Raise a customized message
+                raise TypeError(SkipList.ERROR_TYPE_INSERT)
+
+            # The path stays valid across this finger's own change.
+            self._skip_list._insert_at(elem, key, update, ranks)
+            self._version = self._skip_list._version
+
+        def count(self, elem):
+            '''(_Finger, obj) -> int
+            Returns the number of occurences of a given object in the skip
+            list, moving this finger to it.
+
+            RAISES TypeError if trying to count with incompatible types.
+            '''
+            skip_list = self._skip_list
+            key = skip_list._key_of(elem)
+            update = self._locate(key)[0]
+
+            # Count the nodes with the key, skipping other elements that
+            # share it.
+            count = 0
+            node = update[SkipList.BOTTOM_LEVEL]._next_nodes[
+                SkipList.BOTTOM_LEVEL]
+            while node is not None and node._key == key:
+                if skip_list._key_func is None or node._value == elem:
+                    count += node._count
+                node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+            return count
+
+        def remove(self, elem):
+            '''(_Finger, obj) -> bool
+            Returns True iff the remove operation sucessfully found the
+            element and removed it, moving this finger to it.
+            '''
+            try:
+                key = self._skip_list._key_of(elem)
+                update, ranks = self._locate(key)
+                removed = self._skip_list._remove_at(elem, key, update, ranks)
+            except TypeError:
+                # Trying to remove an element whose type is impossible to have.
+                return False
+
+            # The path stays valid across this finger's own change, less any
+            # levels the head lost.
+            del update[len(self._skip_list._head._next_nodes):]
+            del self._ranks[len(update):]
+            self._version = self._skip_list._version
+            self._skip_list._compact_if_due()
+            return removed
+
+    # Nested, read-only view of a skip list at a point in time.
+    class _Snapshot:
+
+        '''A consistent, read-only view of a skip list as it was when the
+        snapshot was taken. It reads the list's own towers, through the
+        images they saved of themselves before changing (the first one from
+        after the snapshot's epoch), so taking it copies nothing. Closing it
+        (or letting it be garbage collected) lets the list drop those images;
+        it can be used as a context manager to do so.
+        '''
+
+        def __init__(self, skip_list, epoch):
+            '''(_Snapshot, SkipList, int) -> NoneType
+            Creates a view of the given list as of the given epoch.
+            '''
+            self._head = skip_list._head
+            self._length = skip_list._length
+            self._fingerprint = skip_list._fingerprint
+            self._counted = skip_list._counted
+            self._key_func = skip_list._key_func
+            self._probability = skip_list._probability
+            self._epoch = epoch
+            self._skip_list = skip_list
+            self._closer = weakref.finalize(self, skip_list._close_snapshot)
+
+        def close(self):
+            '''(_Snapshot) -> NoneType
+            Closes this snapshot; the list no longer keeps images for it.
+            Closing it again does nothing.
+            '''
+            self._closer()
+
+        def __enter__(self):
+            '''(_Snapshot) -> _Snapshot
+            Returns this snapshot, for use in a with statement.
+            '''
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            '''(_Snapshot, type, Exception, traceback) -> NoneType
+            Closes this snapshot at the end of a with statement.
+            '''
+            self.close()
+
+        def _state(self, node):
+            '''(_Snapshot, TowerNode) -> (list of TowerNode, list of int, int)
+            Returns the forward pointers, widths and multiplicity the given
+            tower had when this snapshot was taken.
+            '''
+            history = node._history
+            if history is not None:
+                for epoch, next_nodes, widths, count in history:
+                    if epoch > self._epoch:
+                        return next_nodes, widths, count
+            return node._next_nodes, node._widths, node._count
+
+        def is_counted(self):
+            '''(_Snapshot) -> bool
+            Returns whether the list stores duplicates as counted towers.
+            '''
+            return self._counted
+
+        def get_key_function(self):
+            '''(_Snapshot) -> function or NoneType
+            Returns the key function elements are ordered by, if any.
+            '''
+            return self._key_func
+
+        def new_empty_skip_list(self):
+            '''(_Snapshot) -> SkipList
+            Creates an empty SkipList configured like the snapshot's list.
+            '''
+            return self._skip_list.new_empty_skip_list()
+
+        def _key_of(self, elem):
+            '''(_Snapshot, obj) -> obj
+            Returns the key the given element is ordered by.
+            '''
+            if self._key_func is None:
+                return elem
+            return self._key_func(elem)
+
+        def _find_before(self, key, inclusive=False):
+            '''(_Snapshot, obj [, bool]) -> (TowerNode, int)
+            Descends to the last bottom level node whose key is less than the
+            given one (or equal to it as well, if inclusive), returning that
+            node (the head if there is none) and its position.
+
+            RAISES TypeError if there was an issue comparing keys.
+            '''
+            cur_node = self._head
+            next_nodes, widths, count = self._state(cur_node)
+            rank = 0
+            for level in range(len(next_nodes) - 1,
+                               SkipList.BOTTOM_LEVEL - 1, -1):
+                next_node = next_nodes[level]
+                while next_node is not None and (
+                        not key < next_node._key if inclusive
+                        else next_node._key < key):
+                    rank += widths[level]
+                    cur_node = next_node
+                    next_nodes, widths, count = self._state(cur_node)
+                    next_node = next_nodes[level]
+            return cur_node, rank
+
+        def _run(self, elem):
+            '''(_Snapshot, obj) -> generator of (TowerNode, int)
+            Yields the towers holding elem, with their multiplicities.
+
+            RAISES TypeError if there was an issue comparing elements.
+            '''
+            key = self._key_of(elem)
+            node = self._find_before(key)[0]
+            node = self._state(node)[0][SkipList.BOTTOM_LEVEL]
+            while node is not None and node._key == key:
+                next_nodes, widths, count = self._state(node)
+                if count and (self._key_func is None or node._value == elem):
+                    yield node, count
+                node = next_nodes[SkipList.BOTTOM_LEVEL]
+
+        def search(self, elem):
+            '''(_Snapshot, obj) -> obj
+            Returns the element if it was in the list, otherwise None.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            try:
+                for node, count in self._run(elem):
+                    return node._value
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+            return None
+
+        def __contains__(self, elem):
+            '''(_Snapshot, obj) -> bool
+            Returns whether the element was in the list.
+            '''
+            try:
+                return self.search(elem) is not None
+            except TypeError:
+                return False
+
+        def count(self, elem):
+            '''(_Snapshot, obj) -> int
+            Returns the number of occurences the element had in the list.
+            '''
+            return sum(count for node, count in self._run(elem))
+
+        def rank(self, elem):
+            '''(_Snapshot, obj) -> int
+            Returns the number of elements less than the given one (by key).
+
+            RAISES TypeError if trying to rank with incompatible types.
+            '''
+            try:
+                return self._find_before(self._key_of(elem))[1]
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
 
-        REQ: the list formed by the head node must be an appropriate skip list
-        format: non-descending order with head as start, elements in between
-        and tail on the end. fixed_p range is 0 < fixed_p < 1.
+        def bisect_left(self, elem):
+            '''(_Snapshot, obj) -> int
+            Returns the number of elements less than the given one.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            return self.rank(elem)
+
+        def bisect_right(self, elem):
+            '''(_Snapshot, obj) -> int
+            Returns the number of elements not greater than the given one.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            try:
+                return self._find_before(self._key_of(elem), True)[1]
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+        def _range(self, lo, hi, inclusive):
+            '''(_Snapshot, obj, obj, (bool, bool)) -> (TowerNode, int, int)
+            Returns the node just before the first element in range, and the
+            indices the range starts at and stops before.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            try:
+                start_node, start = self._head, 0
+                if lo is not None:
+                    start_node, start = self._find_before(
+                        self._key_of(lo), inclusive=not inclusive[0])
+                stop = self._length
+                if hi is not None:
+                    stop = self._find_before(self._key_of(hi),
+                                             inclusive=inclusive[1])[1]
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+            return start_node, start, stop
+
+        def count_range(self, lo=None, hi=None, inclusive=(True, False)):
+            '''(_Snapshot [, obj, obj, (bool, bool)]) -> int
+            Returns the number of elements between lo and hi, as
+            SkipList.count_range does.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            start_node, start, stop = self._range(lo, hi, inclusive)
+            return max(stop - start, SkipList.EMPTY_LIST_COUNT)
+
+        def irange(self, lo=None, hi=None, inclusive=(True, False)):
+            '''(_Snapshot [, obj, obj, (bool, bool)]) -> generator
+            Lazily yields the elements between lo and hi in order, as
+            SkipList.irange does.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            start_node, start, stop = self._range(lo, hi, inclusive)
+            remaining = stop - start
+            node = self._state(start_node)[0][SkipList.BOTTOM_LEVEL]
+            while remaining > 0:
+                next_nodes, widths, count = self._state(node)
+                for occurence in range(min(count, remaining)):
+                    yield node._value
+                remaining -= count
+                node = next_nodes[SkipList.BOTTOM_LEVEL]
+
+        def _runs(self):
+            '''(_Snapshot) -> generator of (obj, obj, int)
+            Yields every tower on the bottom level as a (key, element,
+            occurences) triple, in order.
+            '''
+            node = self._state(self._head)[0][SkipList.BOTTOM_LEVEL]
+            while node is not None:
+                next_nodes, widths, count = self._state(node)
+                if count:
+                    yield node._key, node._value, count
+                node = next_nodes[SkipList.BOTTOM_LEVEL]
+
+        def __iter__(self):
+            '''(_Snapshot) -> generator
+            Yields every occurence, in order.
+            '''
+            for key, value, count in self._runs():
+                for occurence in range(count):
+                    yield value
+
+        def unique_iter(self):
+            '''(_Snapshot) -> generator
+            Yields every distinct element, in order.
+            '''
+            no_elem = previous = SkipList._SkipIterator._NO_ELEM
+            for key, value, count in self._runs():
+                if previous is no_elem or previous != value:
+                    yield value
+                previous = value
+
+        def __len__(self):
+            '''(_Snapshot) -> int
+            Returns the length the list had.
+            '''
+            return self._length
+
+        def __eq__(self, skiplist2):
+            '''(_Snapshot, SkipList) -> bool
+            Returns whether both hold the same elements, as many times each.
+            '''
+            return (len(self) == len(skiplist2) and
+                    not SkipList._fingerprints_differ(self, skiplist2) and
+                    all(elem == elem2
+                        for elem, elem2 in zip(self, skiplist2)))
+
+        def __add__(self, skiplist2):
+            '''(_Snapshot, SkipList) -> SkipList
+            Returns a new skip list holding the elements of both.
+
+            RAISES: TypeError if the two hold incomparable types.
+            '''
+            sum_list = self.new_empty_skip_list()
+            sum_list += self
+            sum_list += skiplist2
+            return sum_list
+
+    def __init__(self, fixed_p=DEFAULT_PROBABILITY, counted=False, key=None,
+                 levels=None, backward=False, tombstone_ratio=None):
+        '''(SkipList[, float, bool, function, LevelGenerator, bool, float]) ->
+                NoneType
+        Initializes the SkipList the coin-toss probability number given or
+        default at 0.5. If counted is True, duplicates are stored run-length
+        encoded: each distinct element is a single tower carrying its number
+        of occurences, instead of one tower per occurence. If a key function
+        is given, elements are ordered by key(elem) rather than by themselves;
+        each key is computed once, on insertion, and kept on the tower. The
+        heights of new towers come from the given level generator (e.g. a
+        seeded or a DeterministicLevels one), whose probability then replaces
+        fixed_p; by default, an unseeded LevelGenerator with fixed_p. If
+        backward is True, the bottom level is also linked backwards and the
+        last tower is kept, so that max, pop_max and reversed take O(1) per
+        element. If a tombstone_ratio is given, removals are lazy: the last
+        occurence of a tower only leaves a tombstone behind, and tombstones
+        are unlinked all at once (see compact) when there are more of them
+        than that ratio of the towers.
+
+        REQ: fixed_p range is 0 < fixed_p < 1.
 
         RAISES RandProbException if fixed_P is not in said range.
         '''
-        self._head = HeadNode()
-        self._tail = self._head.get_next_node()
+        # The head tower always has at least the bottom level.
+        self._head = HeadTower()
         self._length = 0
+        self._counted = counted
+        self._key_func = key
+
+        # The last tower, kept only along with backward links.
+        self._backward = backward
+        self._tail = None
+
+        # Towers left with no occurences by lazy removals, not unlinked yet,
+        # out of every tower linked (live or not): unlike the length, which
+        # counts occurences, these compare in counted mode too.
+        self._tombstone_ratio = tombstone_ratio
+        self._tombstones = 0
+        self._towers = 0
+
+        # The sum of the hashes of every occurence (see get_fingerprint), or
+        # None once an unhashable element was added.
+        self._reset_fingerprint()
+
+        # Bumped on every change, so fingers know when to forget their path.
+        self._version = 0
+
+        # Bumped by every snapshot; towers changed while any is open keep
+        # images of themselves from before, in their histories.
+        self._epoch = 0
+        self._open_snapshots = 0
+        self._preserved = []
 
         # Probability parameter check w/ customized exceptions.
         if (fixed_p <= SkipList.PROB_LOWER_BOUND or
@@ -399,135 +1333,603 @@ class SkipList:
             # Good probability float, save it (privately) for later use.
             self._probability = fixed_p
 
+        if levels is None:
+            levels = LevelGenerator(fixed_p)
+        self._levels = levels
+        self._probability = levels.get_probability()
+
+        # Only set while instrumented; see instrument.
+        self._stats = None
+
+    @classmethod
+    def from_sorted(cls, iterable, fixed_p=DEFAULT_PROBABILITY, **options):
+        '''(type, iterable [, float, ...]) -> SkipList
+        Returns a new skip list holding every element of the given iterable,
+        built in a single linear pass (no searching). Any other keyword
+        options are passed on to the constructor.
+
+        REQ: the iterable yields its elements in non-descending order.
+        RAISES RandProbException if fixed_p is not in 0 < fixed_p < 1.
+        '''
+        skip_list = cls(fixed_p, **options)
+        skip_list._build_sorted(iterable)
+        return skip_list
+
+    @classmethod
+    def from_iterable(cls, iterable, fixed_p=DEFAULT_PROBABILITY, **options):
+        '''(type, iterable [, float, ...]) -> SkipList
+        Returns a new skip list holding every element of the given iterable,
+        in any order. The elements are sorted once, then bulk-loaded. Any
+        other keyword options are passed on to the constructor.
+
+        RAISES TypeError if the elements are not comparable with each other.
+        RAISES RandProbException if fixed_p is not in 0 < fixed_p < 1.
+        '''
+        skip_list = cls(fixed_p, **options)
+        skip_list._build_sorted(skip_list._sorted_elements(iterable))
+        return skip_list
+
+    def is_counted(self):
+        '''(SkipList) -> bool
+        Returns whether this list stores duplicates as counted towers.
+        '''
+        return self._counted
+
+    def new_empty_skip_list(self):
+        '''(SkipList) -> SkipList
+        Creates an empty SkipList with the same probability, storage mode, key
+        function, links and removal mode as this one.
+        '''
+        return SkipList(fixed_p=self._probability, counted=self._counted,
+                        key=self._key_func, levels=self._levels.spawn(),
+                        backward=self._backward,
+                        tombstone_ratio=self._tombstone_ratio)
+
+    def get_level_generator(self):
+        '''(SkipList) -> LevelGenerator
+        Returns the generator the heights of new towers come from.
+        '''
+        return self._levels
+
+    def get_key_function(self):
+        '''(SkipList) -> function or NoneType
+        Returns the key function elements are ordered by, or None if they are
+        ordered by themselves.
+        '''
+        return self._key_func
+
+    def _key_of(self, elem):
+        '''(SkipList, obj) -> obj
+        Returns the key the given element is ordered by in this list.
+        '''
+        if self._key_func is None:
+            return elem
+        return self._key_func(elem)
+
+    def clear(self):
+        '''(SkipList) -> NoneType
+        Removes every element from this list.
+        '''
+        self._head = HeadTower()
+        self._tail = None
+        self._length = 0
+        self._tombstones = 0
+        self._towers = 0
+        self._reset_fingerprint()
+        self._version += 1
+
+    def snapshot(self):
+        '''(SkipList) -> _Snapshot
+        Returns a read-only view of this list as it is now, in O(1): later
+        changes to the list are not visible through it. While it is open,
+        each tower changed keeps an image of itself from before (once per
+        snapshot at most), which is dropped once every snapshot is closed
+        (or garbage collected).
+        '''
+        snapshot = SkipList._Snapshot(self, self._epoch)
+        self._epoch += 1
+        self._open_snapshots += 1
+        return snapshot
+
+    def _close_snapshot(self):
+        '''(SkipList) -> NoneType
+        Forgets a snapshot, dropping every tower's history once none is open.
+        '''
+        self._open_snapshots -= 1
+        if not self._open_snapshots:
+            for node in self._preserved:
+                node._history = None
+            self._preserved = []
+
+    def _preserve(self, node):
+        '''(SkipList, TowerNode) -> NoneType
+        Saves an image of the given tower, unless it already has one from
+        this epoch, before it changes.
+
+        REQ: a snapshot of this list is open.
+        '''
+        history = node._history
+        if history is None:
+            node._history = history = []
+            self._preserved.append(node)
+        elif history[-1][0] == self._epoch:
+            return
+        history.append((self._epoch, list(node._next_nodes),
+                        list(node._widths), node._count))
+
+    def _preserve_path(self, update):
+        '''(SkipList, list of TowerNode) -> NoneType
+        Saves images of the head and of every tower in the update vector
+        before they change, if a snapshot of this list is open.
+        '''
+        if self._open_snapshots:
+            self._preserve(self._head)
+            for node in update:
+                self._preserve(node)
+
+    def finger(self):
+        '''(SkipList) -> _Finger
+        Returns a new finger on this list: a cursor with search, insert and
+        remove methods that start from wherever its last operation ended, so
+        that runs of nearby (e.g. nearly sorted) elements are cheap.
+        '''
+        return SkipList._Finger(self)
+
+    def instrument(self, stats=None):
+        '''(SkipList [, SkipListStats]) -> SkipListStats
+        Starts counting the work this list does, into the given stats (or new
+        ones), which are returned. Only this list is affected. Descents are
+        counted once they are done, from the nodes they stopped at (see
+        _count_descent), so a list that is not instrumented only pays a check
+        per descent.
+        '''
+        if stats is None:
+            stats = SkipListStats()
+        self._stats = stats
+        return stats
+
+    def uninstrument(self):
+        '''(SkipList) -> NoneType
+        Stops counting the work this list does, if it was.
+        '''
+        self._stats = None
+
+    def get_stats(self):
+        '''(SkipList) -> dict of str: obj
+        Returns a report on this list, suitable for a metrics pipeline: its
+        length, number of towers, height histogram and level lengths, along
+        with the counters of its stats, and their averages per descent, if it
+        is instrumented.
+        '''
+        histogram = self.height_histogram()
+        report = {'length': self._length, 'towers': sum(histogram),
+                  'tombstones': self._tombstones,
+                  'height_histogram': histogram,
+                  'level_lengths': self.level_lengths()}
+        if self._stats is not None:
+            report.update(self._stats.as_dict())
+            report['per_descent'] = self._stats.per_descent()
+        return report
+
+    def height_histogram(self):
+        '''(SkipList) -> list of int
+        Returns the number of towers of each height, indexed by height less
+        one: the first entry counts the towers reaching only the bottom
+        level.
+        '''
+        histogram = [0] * len(self._head._next_nodes)
+        node = self._head._next_nodes[SkipList.BOTTOM_LEVEL]
+        while node is not None:
+            histogram[len(node._next_nodes) - 1] += 1
+            node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+        return histogram
+
+    def level_lengths(self):
+        '''(SkipList) -> list of int
+        Returns the number of towers linked on each level, from the bottom
+        one up.
+        '''
+        lengths = []
+        for level in range(len(self._head._next_nodes)):
+            length = 0
+            node = self._head._next_nodes[level]
+            while node is not None:
+                length += 1
+                node = node._next_nodes[level]
+            lengths.append(length)
+        return lengths
+
+    def _top_level(self):
+        '''(SkipList) -> int
+        Returns the index of the highest level currently in this list.
+        '''
+        return len(self._head._next_nodes) - 1
+
     def search(self, elem):
         '''(SkipList, obj) -> obj
         Returns the element if it is found, otherwise returns None.
 
         RAISES TypeError if trying to search with incompatible types.
         '''
-        # Try searching for the node before, returning None if not found.
-        search_attempt = self._search_before(elem)
-        if search_attempt is not None:
-            # Found, so return the value of the next node.
-            return search_attempt.get_next_node().get_value()
+        # Try searching for the node, returning None if not found.
+        found = self._search(elem)
+        if found is not None:
+            return found._value
         return None
 
-    def _search_before(self, elem):
-        '''(SkipList, obj) -> NoneType or ElementNode
-        Searches for the node that is before the one containing given element.
-        Returns none if the node is not found.
+    def _search(self, elem):
+        '''(SkipList, obj) -> NoneType or TowerNode
+        Searches for a node containing given element. Returns none if the node
+        is not found.
 
         RAISES TypeError if there was an issue comparing elements.
         '''
-        # Try recursively searching for the node
         try:
-            # Start off the helper at the first linked list.
-            return self._rec_search_before(elem, self._head)
+            # Descend to just before its key, then look through the nodes
+            # with it: several elements may share a key, and tombstones may
+            # come first.
+            key = self._key_of(elem)
+            before_node = self._find_before(key)[0]
+            if (self._key_func is None and not self._tombstones and
+                    self._stats is None):
+                node = before_node._next_nodes[0]
+                if node is not None and node._key == key:
+                    return node
+                return None
+            return self._find_in_run(before_node, key, elem)[0]
         except(TypeError):
             # Thrown during a comparison error.
             raise TypeError(SkipList.ERROR_TYPE_SEARCH)
 
-    def _search_before_level(self, elem, cur_node):
-        '''(SkipList, obj, HeadNode, HeadNode) -> HeadNode or TailNode
-        Searches the nodes on a level to return the node before the
-        element sought after.
-
-        REQ: call cur_node on the head, otherwise you may skip the first.
+    def _find_before(self, key, inclusive=False, update=None, ranks=None,
+                     top=None, resume=False):
+        '''(SkipList, obj [, bool, list of TowerNode, list of int, int, bool])
+                -> (TowerNode, int)
+        Descends to the last bottom level node whose key is less than the
+        given one (or equal to it as well, if inclusive), returning that node
+        (the head if there is none) and its position. The descent starts at
+        the top of the head or, if a top level is given, at update[top] (at
+        position ranks[top]); with resume, every level starts from its own
+        entry in update instead, when that one is further along. The last node
+        reached on each level, and its position, are recorded in update and
+        ranks if given. Every descent by key comes through here, so this is
+        where an instrumented list counts them.
+
+        RAISES TypeError if there was an issue comparing keys.
+        '''
+        head = self._head
+        if top is None:
+            top = len(head._next_nodes) - 1
+            cur_node = head
+            rank = 0
+        else:
+            cur_node = update[top]
+            rank = ranks[top]
+        stats = self._stats
+        if stats is not None and update is None:
+            # Counted from the nodes reached on every level, once done.
+            update = [None] * (top + 1)
+            ranks = [0] * (top + 1)
+        start_node = cur_node
+        # With resume, the node every level actually started from.
+        starts = [None] * (top + 1) if resume else None
+
+        # Must be iterative, tall or long lists may cause an issue o/w.
+        for level in range(top, SkipList.BOTTOM_LEVEL - 1, -1):
+            if resume:
+                if (update[level] is not head and
+                        (cur_node is head or
+                         not update[level]._key < cur_node._key)):
+                    cur_node = update[level]
+                    rank = ranks[level]
+                starts[level] = cur_node
+            next_node = cur_node._next_nodes[level]
+            if inclusive:
+                while next_node is not None and not key < next_node._key:
+                    rank += cur_node._widths[level]
+                    cur_node = next_node
+                    next_node = cur_node._next_nodes[level]
+            else:
+                while next_node is not None and next_node._key < key:
+                    rank += cur_node._widths[level]
+                    cur_node = next_node
+                    next_node = cur_node._next_nodes[level]
+            if update is not None:
+                update[level] = cur_node
+                ranks[level] = rank
+
+        if stats is not None:
+            SkipList._count_descent(stats, start_node, update, top, starts)
+        return cur_node, rank
+
+    def _find_before_at(self, position, update=None, ranks=None):
+        '''(SkipList, int [, list of TowerNode, list of int]) ->
+                (TowerNode, int)
+        Descends from the top of the head to the last node whose occurences
+        end before the given position, by span widths alone, returning that
+        node and its position; and recording the last node reached on each
+        level, and its position, in update and ranks if given. Counted, if
+        instrumented, as _find_before is (but with no comparisons).
         '''
-        # Must be iterative, long levels may cause an issue o/w.
-        # We cannot do anything at a tail node.
-        if type(cur_node) is not TailNode:
-            # If not a tail node, keep looking until next == elem.
-            next_node = cur_node.get_next_node()
-            while next_node < elem:
-                # Continue while the next node is less than the element.
+        cur_node = self._head
+        rank = 0
+        top = self._top_level()
+        stats = self._stats
+        if stats is not None and update is None:
+            update = [None] * (top + 1)
+            ranks = [0] * (top + 1)
+        for level in range(top, SkipList.BOTTOM_LEVEL - 1, -1):
+            next_node = cur_node._next_nodes[level]
+            while (next_node is not None and
+                   rank + cur_node._widths[level] < position):
+                rank += cur_node._widths[level]
                 cur_node = next_node
-                next_node = cur_node.get_next_node()
-
-        # returns the current node which could be  head, tail or element.
-        return cur_node
-
-    def _rec_search_before(self, elem, cur_node):
-        '''(SkipList, obj, obj) -> obj or NoneType
-        Recursively searches for the node before the one containing the
-        element sought after.
+                next_node = cur_node._next_nodes[level]
+            if update is not None:
+                update[level] = cur_node
+                ranks[level] = rank
+
+        if stats is not None:
+            SkipList._count_descent(stats, self._head, update, top,
+                                    compared=False)
+        return cur_node, rank
+
+    @staticmethod
+    def _count_descent(stats, start_node, update, top, starts=None,
+                       compared=True):
+        '''(SkipListStats, TowerNode, list of TowerNode, int
+                [, list of TowerNode, bool]) -> NoneType
+        Counts a finished descent into the given stats: it started at
+        start_node on the top level, every level below it started where the
+        one above stopped (or from its entry in starts, if given), and each
+        stopped at its entry in update. If compared, every node stepped onto
+        was compared, and so was the one each level stopped before. Descents
+        are counted this way, afterwards and only if instrumented, so that
+        their own loops carry no counters.
+
+        REQ: every level's stopping node is at or after its starting node.
         '''
-        # Recursively finds and searches the first level containing
-        # Base case: if the level starts null, than element is not found...
-        if cur_node is None:
-            return None
-
-        # Continue linearly until the next node is larger.
-        cur_node = self._search_before_level(elem, cur_node)
-        next_node = cur_node.get_next_node()
+        stats.descents += 1
+        for level in range(top, SkipList.BOTTOM_LEVEL - 1, -1):
+            if starts is not None:
+                start_node = starts[level]
+            end_node = update[level]
+            steps = 0
+            while start_node is not end_node:
+                start_node = start_node._next_nodes[level]
+                steps += 1
+            stats.vertical_steps += 1
+            stats.horizontal_steps += steps
+            if compared:
+                stats.comparisons += (
+                    steps + (end_node._next_nodes[level] is not None))
+
+    def _find_update(self, key):
+        '''(SkipList, obj) -> (list of TowerNode, list of int)
+        Descends from the top level to the bottom one, recording on each level
+        the last node whose key is less than the given one, and that node's
+        position (the occurences up to and including it; 0 for the head). The
+        returned update vector and ranks are indexed by level, and are where
+        an element with that key would be spliced in.
+
+        RAISES TypeError if there was an issue comparing keys.
+        '''
+        # One entry per level, filled in from the top down.
+        update = [None] * len(self._head._next_nodes)
+        ranks = [0] * len(update)
+        self._find_before(key, update=update, ranks=ranks)
+        return update, ranks
+
+    def _find_update_at(self, position):
+        '''(SkipList, int) -> (list of TowerNode, list of int)
+        Returns the update vector and ranks (as _find_update does) of the
+        tower whose occurences end at the given position, found by span
+        widths alone.
+
+        REQ: some tower's occurences end at the given position.
+        '''
+        update = [None] * len(self._head._next_nodes)
+        ranks = [0] * len(update)
+        self._find_before_at(position, update, ranks)
+        return update, ranks
+
+    def _find_in_run(self, before_node, key, elem):
+        '''(SkipList, TowerNode, obj, obj) -> (TowerNode or NoneType, int)
+        Walks the run of nodes with the given key that starts right after
+        before_node on the bottom level. Returns the first node (but no
+        tombstone) holding an element equal to elem (None if there is none),
+        and the number of occurences before it in the run.
 
-        # Iff the next node is equal to the element, return the current node.
-        if next_node == elem:
-            return cur_node
+        RAISES TypeError if there was an issue comparing elements.
+        '''
+        node = before_node._next_nodes[SkipList.BOTTOM_LEVEL]
+        found = None
+        skipped = steps = 0
+        if self._key_func is None:
+            # The key is the element, so only the first node can be it, once
+            # past any tombstones.
+            while node is not None and not node._count and node._key == key:
+                node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+                steps += 1
+            if node is not None and node._key == key:
+                found = node
         else:
-            # otherwise, recurse on the next level.
-            return self._rec_search_before(elem, cur_node.get_below_node())
+            while node is not None and node._key == key:
+                if node._count and node._value == elem:
+                    found = node
+                    break
+                skipped += node._count
+                node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+                steps += 1
+
+        stats = self._stats
+        if stats is not None:
+            # The key of every node passed over was compared, and the next's.
+            stats.horizontal_steps += steps
+            stats.comparisons += steps + (node is not None)
+        return found, skipped
+
+    def _locate_in_run(self, elem, key, update, ranks):
+        '''(SkipList, obj, obj, list of TowerNode, list of int) ->
+                (TowerNode or NoneType, list of TowerNode, list of int)
+        Given the update vector and ranks of the first node with the given
+        key, returns the first node holding elem (None if there is none)
+        along with its own update vector and ranks.
+
+        RAISES TypeError if there was an issue comparing elements.
+        '''
+        found, skipped = self._find_in_run(update[SkipList.BOTTOM_LEVEL],
+                                           key, elem)
+        before_node = update[SkipList.BOTTOM_LEVEL]
+        if (found is not None and
+                found is not before_node._next_nodes[SkipList.BOTTOM_LEVEL]):
+            # Further into the run (or past tombstones) than the path leads;
+            # find its own path.
+            update, ranks = self._find_update_at(
+                ranks[SkipList.BOTTOM_LEVEL] + skipped + found._count)
+        return found, update, ranks
 
     def remove(self, elem):
         '''(SkipList, obj) -> bool
         Returns True iff the remove operation sucessfully found the element
         and removed it.
         '''
-        # Get the node on the first level before the element.
         try:
-            search_before = self._search_before(elem)
+            # The predecessors of the first node with its key on every level.
+            key = self._key_of(elem)
+            update, ranks = self._find_update(key)
+            removed = self._remove_at(elem, key, update, ranks)
         except TypeError:
             # Trying to remove an element whose type is impossible to have.
             return False
+        self._compact_if_due()
+        return removed
 
-        # Operate on a node only. The helper functions ensure this.
-        # Returns true iff the removal was successful, otherwise false.
-        if search_before is not None and search_before.get_next_node() == elem:
-            # Recursively remove, which will return a node if rows were removed
-            head = self._rec_removal(search_before, elem)
+    def _remove_at(self, elem, key, update, ranks):
+        '''(SkipList, obj, obj, list of TowerNode, list of int) -> bool
+        Removes one occurence of the element, given the update vector and
+        ranks of the first node with its key. Returns True iff it was found
+        and removed.
 
-            # If rows were removed, take the first empty row.
-            if head is not None:
-                self._head = head
+        RAISES TypeError if there was an issue comparing elements.
+        '''
+        to_remove, found_update, found_ranks = self._locate_in_run(
+            elem, key, update, ranks)
 
-            # Decrement length of list; return successful remove.
-            self._length -= 1
+        # Returns true iff the removal was successful, otherwise false.
+        if to_remove is not None:
+            self._remove_occurence(to_remove, found_update, found_ranks,
+                                   (update, ranks))
             return True
 
         # Element not found, remove not succesful.
         return False
 
-    def _rec_removal(self, before_elem, elem):
-        '''(SkipList, HeadNode, int) -> bool
-        Recursively removes an element, given the element before to remove.
-
-        REQ: before_elem is a head node or an element node
+    def _remove_occurence(self, tower, update, ranks, *paths):
+        '''(SkipList, TowerNode, list of TowerNode, list of int, ...) ->
+                NoneType
+        Removes one occurence of the given tower, given its update vector and
+        ranks, keeping the given (update, ranks) paths right (as _balance
+        does).
         '''
-        if before_elem is not None:
-            # Given the node before the one to remove, remove below level too.
-            new_head_node = self._rec_removal(before_elem.get_below_node(),
-                                              elem)
+        # Decrement length of list; an empty list starts its fingerprint over.
+        self._length -= 1
+        self._add_to_fingerprint(tower._value, -1)
+        if not self._length:
+            self._reset_fingerprint()
+        if tower._count > 1:
+            # A counted tower only goes once its last occurence does.
+            self._adjust_count(tower, update, -1)
+        elif self._tombstone_ratio is not None:
+            # Lazily: left linked with no occurences, until compacted.
+            self._adjust_count(tower, update, -1)
+            self._tombstones += 1
+        else:
+            self._unlink(tower, update)
+            self._balance(update, ranks, *paths)
 
-            if new_head_node is not None:
-                # If the one below was empty, this one will be as well. To
-                # discard the row, we will just return the new head.
-                return new_head_node
+    def _compact_if_due(self):
+        '''(SkipList) -> NoneType
+        Compacts this list if its tombstones exceed their ratio of the towers,
+        or if they are all that is left.
+        '''
+        if self._tombstones and (
+                not self._length or
+                self._tombstones > self._tombstone_ratio * self._towers):
+            self.compact()
+
+    def compact(self):
+        '''(SkipList) -> NoneType
+        Unlinks every tombstone left by lazy removals, in a single pass along
+        the bottom level that keeps the last live tower on every level (and
+        its position) as the update vector for the next tombstone.
+        '''
+        if not self._tombstones:
+            return
+        update = [self._head] * len(self._head._next_nodes)
+        ranks = [0] * len(update)
+        rank = 0
+        node = self._head._next_nodes[SkipList.BOTTOM_LEVEL]
+        while node is not None:
+            next_node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+            if node._count:
+                rank += node._count
+                for level in range(len(node._next_nodes)):
+                    update[level] = node
+                    ranks[level] = rank
             else:
-                # The last row not empty; must remove an element:
-                # we are guaranteed next is the one to remove, and after is
-                # either value or sentinel (never none).
-                before_elem = self._search_before_level(elem, before_elem)
-                before_elem.set_next_node(
-                    before_elem.get_next_node().get_next_node())
-
-            # Return before elem if it is a head of a now-empty list.
-            if (type(before_elem) is HeadNode
-                    and type(before_elem.get_next_node()) is TailNode):
-                return before_elem
-
-        # Base case, the element before is none. This means all levels done.
-        # Returns None if base case or if this row is not empty.
-        return None
+                self._unlink(node, update)
+                # Levels the head lost are no longer on the path.
+                del update[len(self._head._next_nodes):]
+                del ranks[len(update):]
+                self._balance(update, ranks)
+            node = next_node
+        self._tombstones = 0
+
+    def _adjust_count(self, tower, update, delta):
+        '''(SkipList, TowerNode, list of TowerNode, int) -> NoneType
+        Adds delta occurences (or takes them away, if negative) to the given
+        tower, right after the bottom entry of the update vector: every
+        level's forward pointer out of the update vector passes over them.
+        '''
+        if self._open_snapshots:
+            self._preserve(tower)
+            self._preserve_path(update)
+        tower._count += delta
+        for level in range(len(update)):
+            update[level]._widths[level] += delta
+        self._version += 1
+
+    def _unlink(self, to_remove, update):
+        '''(SkipList, TowerNode, list of TowerNode) -> NoneType
+        Splices a tower out of every level it is linked on, given the update
+        vector of its predecessors, then discards any levels left empty.
+        '''
+        self._preserve_path(update)
+
+        # The node after the update vector on a level is this tower, on every
+        # level the tower reaches; the predecessor takes over its span.
+        height = len(to_remove._next_nodes)
+        for level in range(height):
+            before_node = update[level]
+            before_node._next_nodes[level] = to_remove._next_nodes[level]
+            before_node._widths[level] += (to_remove._widths[level] -
+                                           to_remove._count)
+
+        # Levels above the tower simply pass over fewer occurences.
+        for level in range(height, len(update)):
+            update[level]._widths[level] -= to_remove._count
+        if self._backward:
+            self._link_back(update[SkipList.BOTTOM_LEVEL],
+                            to_remove._next_nodes[SkipList.BOTTOM_LEVEL])
+
+        self._towers -= 1
+
+        # Discard any levels left empty, always keeping the bottom one.
+        head_nodes = self._head._next_nodes
+        while len(head_nodes) > 1 and head_nodes[-1] is None:
+            self._head.remove_level()
+        self._version += 1
 
     def insert(self, elem):
         '''(SkipList, obj) -> NoneType
@@ -538,113 +1940,715 @@ class SkipList:
         RAISES: TypeError if trying to add a non-comparable type (w/ those in
         the list).
         '''
-        # Try to insert the element, which will fail for incomparable types.
+        # Try to locate the insertion point, which will fail for incomparable
+        # types.
         try:
-            # Recursively insert to present levels, return last level inserted
-            elem_below = self._rec_insert(self._head, elem)
-            if elem_below is not None:
-                # If the last level was inserted, then add levels
-                self._head = self._rec_insert_level(elem, elem_below,
-                                                    self._head)
+            key = self._key_of(elem)
+            update, ranks = self._find_update(key)
         except TypeError:
             # Raise a customized message
             raise TypeError(SkipList.ERROR_TYPE_INSERT)
 
-        # Increment length of list, since insert either works or crashes.
-        self._length += 1
-
-    def _rec_insert(self, before_node, elem):
-        '''(SkipList, ElementNode, obj) -> obj or NoneType
-        Helper for recursively inserting a element, given the node before it
-        This function returns the a inserted Node or None if level did not pass
-        the coin toss.
-
-        REQ: before_node, elem not None. elem comparable with those in the
-        list, otherwise a TypeError will be raised.
-        '''
-        # Insert on level after, to get details regarding how to insert on this
-        # First, get the position to add to, by looping through all nodes
-        # and finding the node before where to add.
-        before_node = self._search_before_level(elem, before_node)
-
-        # The place where we will add_before, can be used as a hint for the
-        # level below. Leave the height as-is, since we don't know the depth
-        # of the insertion.
-        below_node = before_node.get_below_node()
-        insert = None
-        if below_node is not None:
-            insert = self._rec_insert(below_node, elem)
-
-        # Try insert if at last level, or below was inserted.
-        if (insert is not None) or (below_node is None):
-            # Perform a coin toss to determine if one should add, overriden
-            # By if it is the last level.
-            if (below_node is None) or (random.random() < self._probability):
-                # Create the node to add to this level. Set "before" to it.
-                to_add = ElementNode(elem, below_node=insert,
-                                     next_node=before_node.get_next_node())
-                before_node.set_next_node(to_add)
-
-                # Return added node so previous frame can reference it below.
-                return to_add
-
-        # Base Case: when this level did not add a node.
-        return None
+        self._insert_at(elem, key, update, ranks)
 
-    def _rec_insert_level(self, elem, elem_below, head_below):
-        '''(SkipList, obj, ElementNode, HeadNode) -> HeadNode
-        Recursively inserts levels, used after inserting when coin tosses are
-        continuously succesful.
-        '''
-        # Perform a coin toss and add iff we get a value >= probability.
-        if random.random() < self._probability:
-            # Link node -> tail, then head -> node (-> tail)
-            # Created given all links to the level below.
-            elem_link = ElementNode(elem, below_node=elem_below,
-                                    next_node=self._tail)
-            list_head = HeadNode(below_node=head_below, next_node=elem_link)
-
-            # Use this created level as the below pointers, and request another
-            # level to be created recursively.
-            return self._rec_insert_level(elem, elem_link, list_head)
+    def _insert_at(self, elem, key, update, ranks):
+        '''(SkipList, obj, obj, list of TowerNode, list of int) -> NoneType
+        Inserts an element with the given key, at the point given by the
+        update vector and ranks of the first node with that key.
+        '''
+        # Look for an equal element if it matters: in counted mode, an
+        # existing tower just gains an occurence; with a key function, equal
+        # elements must stay together among those sharing their key.
+        found = None
+        if self._counted or self._key_func is not None:
+            found, found_update, found_ranks = self._locate_in_run(
+                elem, key, update, ranks)
+        if found is not None and self._counted:
+            self._adjust_count(found, found_update, 1)
+            self._length += 1
         else:
-            # On the last call, when all levels inserted, return new head
-            return head_below
+            link_update, link_ranks = update, ranks
+            if found is not None:
+                # Go in just before the equal element.
+                link_update, link_ranks = found_update, found_ranks
+            # Draw the height of the tower, then splice it in.
+            self._link(self._new_tower(elem, key, self._levels.height()),
+                       link_update, link_ranks)
+
+            # Increment length of list, since insert either works or crashes;
+            # then keep a deterministic list balanced, and the given path on
+            # the towers that it raises.
+            self._length += 1
+            self._balance(link_update, link_ranks, (update, ranks))
+        self._add_to_fingerprint(elem, 1)
+
+    def _new_tower(self, elem, key, height, count=1):
+        '''(SkipList, obj, obj, int [, int]) -> TowerNode
+        Returns a new, unlinked tower for the element with the given key.
+        '''
+        if self._stats is not None:
+            self._stats.allocations += 1
+        if self._backward:
+            to_add = BackLinkedTowerNode(elem, height, count)
+        else:
+            to_add = TowerNode(elem, height, count)
+        if self._key_func is not None:
+            to_add._key = key
+        return to_add
+
+    def _link(self, to_add, update, ranks):
+        '''(SkipList, TowerNode, list of TowerNode, list of int) -> NoneType
+        Splices a tower in after its predecessors in the update vector (at the
+        given positions), adding levels to the head (and the update vector)
+        when it is the tallest.
+        '''
+        self._preserve_path(update)
+
+        # New levels start out empty, so the head precedes the tower there and
+        # spans the whole list.
+        while len(update) < len(to_add._next_nodes):
+            self._head.add_level(width=self._length)
+            update.append(self._head)
+            ranks.append(0)
+
+        # The tower's own position, once spliced in after the bottom entry.
+        rank = ranks[SkipList.BOTTOM_LEVEL] + to_add._count
+
+        # Link: before -> to_add -> (what before pointed to), on every level,
+        # splitting the predecessor's span at the tower.
+        height = len(to_add._next_nodes)
+        for level in range(height):
+            before_node = update[level]
+            to_add._next_nodes[level] = before_node._next_nodes[level]
+            before_node._next_nodes[level] = to_add
+            to_add._widths[level] = (before_node._widths[level] + ranks[level]
+                                     - ranks[SkipList.BOTTOM_LEVEL])
+            before_node._widths[level] = rank - ranks[level]
+
+        # Levels above the tower simply pass over more occurences.
+        for level in range(height, len(update)):
+            update[level]._widths[level] += to_add._count
+        if self._backward:
+            self._link_back(to_add, to_add._next_nodes[SkipList.BOTTOM_LEVEL])
+            self._link_back(update[SkipList.BOTTOM_LEVEL], to_add)
+        self._towers += 1
+        self._version += 1
+
+    def _link_back(self, before_node, next_node):
+        '''(SkipList, TowerNode, TowerNode or NoneType) -> NoneType
+        Links next_node back to before_node, its new predecessor on the bottom
+        level (to nothing if that is the head); or, if next_node is None,
+        makes before_node the tail.
+        '''
+        if before_node is self._head:
+            before_node = None
+        if next_node is None:
+            self._tail = before_node
+        else:
+            next_node._prev = before_node
+
+    def _balance(self, update, ranks, *paths):
+        '''(SkipList, list of TowerNode, list of int, ...) -> NoneType
+        Restores the 1-2-3 invariant of a deterministic list after a tower
+        was linked or unlinked at the point given by the update vector and
+        ranks: on every level, the towers between the update vector's entry
+        above and its successor are counted, and if there are more than
+        BALANCED_GAP_MAX, every BALANCED_GAP_MAX-th of them is raised a level
+        (which may overflow the gap above in turn). The update vector, and
+        any other (update vector, ranks) paths given, are kept pointing at the
+        last towers before their points. Does nothing unless the level
+        generator asks for it.
+        '''
+        if not self._levels.is_balancing():
+            return
+        head = self._head
+        self._preserve_path(update)
+        paths = ((update, ranks),) + tuple(
+            path for path in paths if path[0] is not update)
+        for path_update, path_ranks in paths:
+            # Levels the head just lost.
+            del path_update[len(head._next_nodes):]
+            del path_ranks[len(head._next_nodes):]
+
+        level = SkipList.BOTTOM_LEVEL
+        while level < len(head._next_nodes):
+            above = level + 1
+            if above < len(head._next_nodes):
+                before_node = update[above]
+                before_rank = ranks[above]
+                stop_node = before_node._next_nodes[above]
+            else:
+                # The top level is a single gap, after the head.
+                before_node = head
+                before_rank = 0
+                stop_node = None
+
+            # The towers in the gap, along with their positions.
+            gap = []
+            cur_node = before_node
+            rank = before_rank
+            while cur_node._next_nodes[level] is not stop_node:
+                rank += cur_node._widths[level]
+                cur_node = cur_node._next_nodes[level]
+                gap.append((cur_node, rank))
+
+            raised = gap[SkipList.BALANCED_GAP_MAX - 1:-1:
+                         SkipList.BALANCED_GAP_MAX]
+            if raised and above == len(head._next_nodes):
+                # The head rises first, spanning the whole list.
+                head.add_level(width=self._length)
+                for path_update, path_ranks in paths:
+                    path_update.append(head)
+                    path_ranks.append(0)
+
+            # Raise the towers, splitting the span above them.
+            for node, rank in raised:
+                if self._open_snapshots:
+                    self._preserve(before_node)
+                node.add_level(before_node._next_nodes[above],
+                               before_node._widths[above] -
+                               (rank - before_rank))
+                before_node._next_nodes[above] = node
+                before_node._widths[above] = rank - before_rank
+                before_node = node
+                before_rank = rank
+                for path_update, path_ranks in paths:
+                    if (not self._precedes(node, rank, path_update[above],
+                                           path_ranks[above]) and
+                            self._precedes(
+                                node, rank,
+                                path_update[SkipList.BOTTOM_LEVEL],
+                                path_ranks[SkipList.BOTTOM_LEVEL])):
+                        path_update[above] = node
+                        path_ranks[above] = rank
+            level += 1
+
+    def _precedes(self, node, rank, path_node, path_rank):
+        '''(SkipList, TowerNode, int, TowerNode, int) -> bool
+        Returns whether the given node (at the given position) is path_node
+        (at path_rank) or comes before it on the bottom level. Positions
+        alone tell, unless they are equal: then only tombstones, which take
+        up no position, can be between the two, and they are walked.
+        '''
+        if rank != path_rank:
+            return rank < path_rank
+        while node is not path_node:
+            node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+            if node is None or (node._count and node is not path_node):
+                return False
+        return True
 
     def insert_all(self, iterable):
         '''(SkipList, dict or list or SkipList) -> NoneType
         Inserts all of a given iterable structure to this list.
+
+        RAISES: TypeError if trying to add a non-comparable type.
+        '''
+        if self._length == SkipList.EMPTY_LIST_LEN:
+            # Nothing to search through; sort once and bulk-load instead.
+            self._build_sorted(self._sorted_elements(iterable))
+        else:
+            # Add ever element into this skip list, through a finger so that
+            # runs of nearby elements do not each start from the top.
+            finger = self.finger()
+            for elem in iterable:
+                finger.insert(elem)
+
+    def insert_many(self, iterable):
+        '''(SkipList, iterable) -> NoneType
+        Inserts every element of the given iterable, sorted first so that a
+        single finger sweeps this list once from front to back, each insert
+        picking up the path where the one before left it.
+
+        RAISES: TypeError if trying to add a non-comparable type.
+        '''
+        elems = self._sorted_elements(iterable)
+        if self._length == SkipList.EMPTY_LIST_LEN:
+            self._build_sorted(elems)
+        else:
+            finger = self.finger()
+            for elem in elems:
+                finger.insert(elem)
+
+    def search_many(self, iterable):
+        '''(SkipList, iterable) -> list
+        Returns, for each element of the given iterable in its order, what
+        search would: the element if it is found, otherwise None. They are
+        looked up in sorted order in a single sweep of a finger.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        elems = list(iterable)
+        try:
+            order = self._batch_order(elems)
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        results = [None] * len(elems)
+        finger = self.finger()
+        for index in order:
+            results[index] = finger.search(elems[index])
+        return results
+
+    def count_many(self, iterable):
+        '''(SkipList, iterable) -> list of int
+        Returns the number of occurences of each element of the given
+        iterable, in its order, counted in sorted order in a single sweep of
+        a finger.
+
+        RAISES TypeError if trying to count with incompatible types.
+        '''
+        elems = list(iterable)
+        try:
+            order = self._batch_order(elems)
+            results = [SkipList.EMPTY_LIST_COUNT] * len(elems)
+            finger = self.finger()
+            for index in order:
+                results[index] = finger.count(elems[index])
+        except TypeError:
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return results
+
+    def remove_many(self, iterable):
+        '''(SkipList, iterable) -> list of bool
+        Removes one occurence of each element of the given iterable, and
+        returns, in its order, whether each was found and removed (as remove
+        does). They are removed in sorted order in a single sweep of a
+        finger.
+        '''
+        elems = list(iterable)
+        try:
+            order = self._batch_order(elems)
+        except TypeError:
+            # Some cannot be in this list at all; remove them one by one.
+            return [self.remove(elem) for elem in elems]
+        results = [False] * len(elems)
+        finger = self.finger()
+        for index in order:
+            results[index] = finger.remove(elems[index])
+        return results
+
+    def _batch_order(self, elems):
+        '''(SkipList, list) -> list of int
+        Returns the indices of the given elements in the order of their keys,
+        those with equal keys in their given order.
+
+        RAISES TypeError if the elements are not comparable with each other.
+        '''
+        keys = [self._key_of(elem) for elem in elems]
+        return sorted(range(len(keys)), key=keys.__getitem__)
+
+    def _sorted_elements(self, iterable):
+        '''(SkipList, iterable) -> list
+        Returns the elements of the given iterable in non-descending order
+        (of their keys).
+
+        RAISES: TypeError if the elements are not comparable with each other.
+        '''
+        try:
+            return sorted(iterable, key=self._key_func)
+        except TypeError:
+            # Raise a customized message
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+
+    def _build_sorted(self, iterable):
+        '''(SkipList, iterable) -> NoneType
+        Bulk-loads the elements of a sorted iterable into this empty list in a
+        single pass.
+
+        REQ: this list is empty and the iterable is in non-descending order
+        (of its keys).
+        '''
+        key_of = self._key_of
+        self._build_runs((key_of(elem), elem, 1) for elem in iterable)
+
+    def _build_runs(self, runs):
+        '''(SkipList, iterable of (obj, obj, int)) -> NoneType
+        Bulk-loads sorted (key, element, occurences) runs into this empty list
+        in a single pass, appending each new tower at the end of every level
+        it reaches.
+
+        REQ: this list is empty and the runs are in non-descending order (of
+        their keys).
+        '''
+        # The last tower on every level so far (the head while it is empty),
+        # and its position, so the span up to the next one is known.
+        last_nodes = [self._head] * len(self._head._next_nodes)
+        last_ranks = [0] * len(last_nodes)
+        self._preserve_path(last_nodes)
+        length = 0
+        towers_built = 0
+        if self._key_func is not None:
+            # Equal elements must be together (and share one tower, if
+            # counted), but sorting by key alone may have left them apart.
+            runs = self._grouped_runs(runs)
+        elif self._counted:
+            # Equal neighbours must share one tower.
+            runs = self._coalesced_runs(runs)
+        for key, elem, count in runs:
+            if self._counted:
+                towers = 1
+            else:
+                # Without counts, every occurence needs its own tower.
+                towers, count = count, 1
+
+            for tower in range(towers):
+                towers_built += 1
+                to_add = self._new_tower(
+                    elem, key, self._levels.height_at(towers_built), count)
+                height = len(to_add._next_nodes)
+                length += count
+                self._add_to_fingerprint(elem, count)
+
+                # A taller tower than any before it needs new head levels.
+                while len(last_nodes) < height:
+                    self._head.add_level()
+                    last_nodes.append(self._head)
+                    last_ranks.append(0)
+
+                # Append the tower to every level it reaches.
+                if self._backward:
+                    self._link_back(last_nodes[SkipList.BOTTOM_LEVEL], to_add)
+                for level in range(height):
+                    last_node = last_nodes[level]
+                    last_node._next_nodes[level] = to_add
+                    last_node._widths[level] = length - last_ranks[level]
+                    last_nodes[level] = to_add
+                    last_ranks[level] = length
+
+        # The last tower on every level spans to the end of the list.
+        for level in range(len(last_nodes)):
+            last_nodes[level]._widths[level] = length - last_ranks[level]
+        if self._backward:
+            self._link_back(last_nodes[SkipList.BOTTOM_LEVEL], None)
+        self._length += length
+        self._towers += towers_built
+        self._version += 1
+
+    def _coalesced_runs(self, runs):
+        '''(SkipList, iterable of (obj, obj, int)) ->
+                generator of (obj, obj, int)
+        Yields the given sorted runs with equal neighbouring elements merged
+        into one run.
+        '''
+        # The run being accumulated, if any yet.
+        started = False
+        for next_key, next_elem, next_count in runs:
+            if started and next_elem == elem:
+                count += next_count
+            else:
+                if started:
+                    yield key, elem, count
+                key, elem, count = next_key, next_elem, next_count
+                started = True
+        if started:
+            yield key, elem, count
+
+    def _grouped_runs(self, runs):
+        '''(SkipList, iterable of (obj, obj, int)) ->
+                generator of (obj, obj, int)
+        Yields the given runs, sorted by key, with the runs of equal elements
+        among those sharing a key merged into one run.
         '''
-        # Add ever element into this skip list.
-        for elem in iterable:
-            self.insert(elem)
+        # The runs sharing the current key, merged so far.
+        groups = []
+        for key, elem, count in runs:
+            if groups and key == groups[0][0]:
+                for group in groups:
+                    if group[1] == elem:
+                        group[2] += count
+                        break
+                else:
+                    groups.append([key, elem, count])
+            else:
+                for group in groups:
+                    yield tuple(group)
+                groups = [[key, elem, count]]
+        for group in groups:
+            yield tuple(group)
+
+    def _runs(self):
+        '''(SkipList) -> generator of (obj, obj, int)
+        Yields every tower on the bottom level as a (key, element, occurences)
+        triple, in order, passing over tombstones.
+        '''
+        cur_node = self._head._next_nodes[SkipList.BOTTOM_LEVEL]
+        while cur_node is not None:
+            if cur_node._count:
+                yield cur_node._key, cur_node._value, cur_node._count
+            cur_node = cur_node._next_nodes[SkipList.BOTTOM_LEVEL]
+
+    def _runs_of(self, skiplist2):
+        '''(SkipList, SkipList) -> iterable of (obj, obj, int)
+        Returns the runs of the given list, keyed and ordered the way this
+        list orders its elements.
+        '''
+        if skiplist2._key_func is self._key_func:
+            return skiplist2._runs()
+
+        # Ordered by some other key; re-key and sort them.
+        return sorted(((self._key_of(elem), elem, count)
+                       for key, elem, count in skiplist2._runs()),
+                      key=operator.itemgetter(0))
 
     def count(self, elem):
         '''(SkipList, obj) -> int
         Returns the number of occurences of a given object in a skip list.
         '''
+        # A counted list keeps every occurence on a single tower, as long as
+        # no other elements share its key.
+        if self._counted and self._key_func is None:
+            found = self._search(elem)
+            if found is None:
+                return SkipList.EMPTY_LIST_COUNT
+            return found._count
+
+        # Descend to the node before the first one with this element's key.
+        key = self._key_of(elem)
+        start = self._find_before(key)[0]
+
         # Must be iterative or else it may exceed rec. depth. Starting at 0.
         count = 0
-        # Start at the bottom most level's first occurence of this element.
-        start = self._search_before_level(elem,
-                                          self._head.get_last_below_node())
-        start = start.get_next_node()
+        start = start._next_nodes[SkipList.BOTTOM_LEVEL]
 
-        # count until start is no longer = to elem.
-        while start == elem:
-            start = start.get_next_node()
-            count += 1
+        # count until start no longer has the key, skipping other elements
+        # that share it.
+        while start is not None and start._key == key:
+            if self._key_func is None or start._value == elem:
+                count += start._count
+            start = start._next_nodes[SkipList.BOTTOM_LEVEL]
 
         return count
 
+    def rank(self, elem):
+        '''(SkipList, obj) -> int
+        Returns the number of elements in this list less than the given one
+        (by key), which is the index its first occurence has (or would have).
+
+        RAISES TypeError if trying to rank with incompatible types.
+        '''
+        try:
+            # The position of the node before it is the count of those less.
+            return self._find_before(self._key_of(elem))[1]
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+    def bisect_left(self, elem):
+        '''(SkipList, obj) -> int
+        Returns the index at which elem would be inserted before any equal
+        elements already in this list (the number of elements less than it).
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self.rank(elem)
+
+    def bisect_right(self, elem):
+        '''(SkipList, obj) -> int
+        Returns the index at which elem would be inserted after any equal
+        elements already in this list (the number of elements not greater
+        than it).
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            return self._find_before(self._key_of(elem), inclusive=True)[1]
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+    def _range_start(self, lo, inclusive):
+        '''(SkipList, obj, bool) -> (TowerNode, int)
+        Returns the node just before the first element in range of the lower
+        bound lo (None meaning unbounded), and that node's position.
+        '''
+        if lo is None:
+            return self._head, 0
+        return self._find_before(self._key_of(lo), inclusive=not inclusive)
+
+    def _range_stop(self, hi, inclusive):
+        '''(SkipList, obj, bool) -> int
+        Returns the index just past the last element in range of the upper
+        bound hi (None meaning unbounded).
+        '''
+        if hi is None:
+            return self._length
+        return self._find_before(self._key_of(hi), inclusive=inclusive)[1]
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(SkipList [, obj, obj, (bool, bool)]) -> int
+        Returns the number of elements between lo and hi, each bound being
+        included or not as given by inclusive (lo in, hi out by default). A
+        bound of None is unbounded. Two descents, no matter the range size.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            start = self._range_start(lo, inclusive[0])[1]
+            stop = self._range_stop(hi, inclusive[1])
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return max(stop - start, SkipList.EMPTY_LIST_COUNT)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, False),
+               reverse=False):
+        '''(SkipList [, obj, obj, (bool, bool), bool]) -> generator
+        Lazily yields the elements between lo and hi in order (or in reverse
+        order, if reverse), each bound being included or not as given by
+        inclusive (lo in, hi out by default). A bound of None is unbounded.
+        The range is found by descending the express lanes, after which a
+        forward range walks the bottom level; a reverse one walks the backward
+        links from its last element if there are any, and otherwise selects
+        each element by index.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            start_node, start = self._range_start(lo, inclusive[0])
+            stop = self._range_stop(hi, inclusive[1])
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+        if reverse and self._backward and start < stop:
+            # Select the last element once, then walk back from its tower.
+            node, rank = self._select_node(stop - 1)
+            remaining = stop - start
+            occurences = stop - rank
+            while remaining > 0:
+                for occurence in range(min(occurences, remaining)):
+                    yield node._value
+                remaining -= occurences
+                node = node._prev
+                if node is not None:
+                    occurences = node._count
+        elif reverse:
+            for index in range(stop - 1, start - 1, -1):
+                yield self._select_node(index)[0]._value
+        else:
+            # The range is known by position, so no comparisons are needed.
+            remaining = stop - start
+            node = start_node._next_nodes[SkipList.BOTTOM_LEVEL]
+            while remaining > 0:
+                for occurence in range(min(node._count, remaining)):
+                    yield node._value
+                remaining -= node._count
+                node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+
+    def select(self, index):
+        '''(SkipList, int) -> obj
+        Returns the element at the given index of this list (in sorted order),
+        found by following span widths down from the head. Negative indices
+        count back from the end.
+
+        RAISES IndexError if the index is out of range.
+        '''
+        return self._select_node(self._normalized_index(index))[0]._value
+
+    def _normalized_index(self, index):
+        '''(SkipList, int) -> int
+        Returns the given index as a non-negative one.
+
+        RAISES IndexError if the index is out of range.
+        '''
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError(SkipList.ERROR_INDEX)
+        return index
+
+    def _select_node(self, index):
+        '''(SkipList, int) -> (TowerNode, int)
+        Returns the tower holding the element at the given index, and the
+        index of that tower's first occurence.
+
+        REQ: 0 <= index < len(self)
+        '''
+        # Move right while the next node's position is still before the
+        # sought (1-based) position; the node after where we stop holds it.
+        cur_node, rank = self._find_before_at(index + 1)
+        return cur_node._next_nodes[SkipList.BOTTOM_LEVEL], rank
+
+    def __getitem__(self, index):
+        '''(SkipList, int or slice) -> obj or iterator
+        Returns the element at the given index, in O(log n). A slice returns
+        a lazy iterator over the elements it selects instead of a copy.
+
+        RAISES IndexError if an integer index is out of range.
+        '''
+        if isinstance(index, slice):
+            return self._slice_iter(index)
+        return self.select(index)
+
+    def _slice_iter(self, index_slice):
+        '''(SkipList, slice) -> generator
+        Yields the elements selected by the given slice. Forward slices find
+        their start by span widths, then walk the bottom level; backward ones
+        select each element.
+        '''
+        start, stop, step = index_slice.indices(self._length)
+        if step < 0:
+            for index in range(start, stop, step):
+                yield self._select_node(index)[0]._value
+        elif start < stop:
+            node, rank = self._select_node(start)
+            # How far into the current (possibly counted) tower we are.
+            offset = start - rank
+            for index in range(start, stop, step):
+                yield node._value
+                offset += step
+                while node is not None and offset >= node._count:
+                    offset -= node._count
+                    node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+
+    def _level_nodes(self, level):
+        '''(SkipList, int) -> generator of TowerNode
+        Yields the towers linked on the given level, in order.
+        '''
+        h = self._head._next_nodes[level]
+        while h is not None:
+            yield h
+            h = h._next_nodes[level]
+
+    def _level_to_str(self, level, node_sep=' -> '):
+        '''(SkipList, int [, str]) -> str
+        Returns a string representation of the given level of this list.
+        '''
+        # Joined once, rather than grown one node at a time.
+        return node_sep.join([str(self._head)] +
+                             [str(node) for node in self._level_nodes(level)])
+
+    def write_levels(self, file, node_sep=' -> ', max_width=None,
+                     max_depth=None):
+        '''(SkipList, file [, str, int, int]) -> NoneType
+        Writes the levels of this list to the given text file, as __str__
+        shows them (from the top level down), a node at a time so that no
+        string of a whole level is ever built. At most max_width nodes after
+        the head are written per level, and at most max_depth levels, if
+        given; what is left out is marked by '...'.
+        '''
+        for depth, level in enumerate(range(self._top_level(),
+                                            SkipList.BOTTOM_LEVEL - 1, -1)):
+            if depth:
+                file.write(HeadNode.NEW_LINE)
+            if depth == max_depth:
+                file.write(HeadNode.TRUNCATED_STR)
+                return
+            HeadNode._write_level(file, self._head, self._level_nodes(level),
+                                  node_sep, max_width)
+
     def __str__(self):
         '''(SkipList) -> str
-        Returns a string representation of this object, in the
-        form '{Head_Node_Str} -> {Next_Node_str} -> ... -> {Tail_Node_Str}'
-        - an example would be: 'head -> 1 -> 2 -> tail'.
+        Returns a string representation of this object, one line per level
+        from the top level down, each in the form
+        '{Head_Node_Str} -> {Next_Node_str} -> ...'
+        - an example would be: 'head -> 1 -> 2'.
         '''
-        # Recursively get and print the levels, starting at the head.
-        return self._head.levels_to_str()
+        # Get the levels, starting at the top.
+        return HeadNode.NEW_LINE.join(
+            self._level_to_str(level)
+            for level in range(self._top_level(), SkipList.BOTTOM_LEVEL - 1,
+                               -1))
 
     def __len__(self):
         '''(SkipList) -> int
@@ -659,8 +2663,9 @@ class SkipList:
         Returns whether or not two skiplists are equal. Determine if they have
         same elements and the same number of them.
         '''
-        # Quick O(1) length check
-        if (len(self) == len(skiplist2)):
+        # Quick O(1) length and fingerprint checks
+        if (len(self) == len(skiplist2) and
+                not SkipList._fingerprints_differ(self, skiplist2)):
             # Both are the same size, ordered. Comparing each element, compares
             # occurences... we start with getting (non-unique) iterators:
             self_iter = iter(self)
@@ -678,56 +2683,237 @@ class SkipList:
                     done = True
             return not fail
 
-        # Lengths where not equal, immediate failure.
+        # Lengths or fingerprints where not equal, immediate failure.
         return False
 
+    def get_fingerprint(self):
+        '''(SkipList) -> int or NoneType
+        Returns the fingerprint of this list's contents: the sum of the hashes
+        of all its occurences, modulo 2 ** 64, kept up to date by every change
+        in O(1). It does not depend on how the list is built, so lists with
+        different fingerprints are never equal. It is None if an unhashable
+        element was ever added (until the list is emptied).
+        '''
+        return self._fingerprint
+
+    def _add_to_fingerprint(self, elem, count):
+        '''(SkipList, obj, int) -> NoneType
+        Adds count occurences of the element (or takes them away, if negative)
+        to this list's fingerprint.
+        '''
+        if self._fingerprint is not None:
+            try:
+                self._fingerprint = ((self._fingerprint + hash(elem) * count)
+                                     & SkipList.FINGERPRINT_MASK)
+            except TypeError:
+                # Unhashable; the fingerprint cannot be kept.
+                self._fingerprint = None
+
+    def _reset_fingerprint(self):
+        '''(SkipList) -> NoneType
+        Starts this list's fingerprint over, as that of an empty list.
+        '''
+        self._fingerprint = 0
+
+    @staticmethod
+    def _fingerprints_differ(skiplist1, skiplist2):
+        '''(SkipList, SkipList) -> bool
+        Returns True iff both lists have fingerprints and they differ, which
+        means they cannot be equal.
+        '''
+        fingerprint1 = getattr(skiplist1, '_fingerprint', None)
+        fingerprint2 = getattr(skiplist2, '_fingerprint', None)
+        return (fingerprint1 is not None and fingerprint2 is not None and
+                fingerprint1 != fingerprint2)
+
+    def __reduce__(self):
+        '''(SkipList) -> tuple
+        Pickles this list as its configuration plus its state (see
+        __getstate__), never as its towers, so the pickle stays small and
+        no recursion is involved. The key function and level generator must
+        be picklable themselves.
+        '''
+        return (self.__class__, (self._probability, self._counted,
+                                 self._key_func, self._levels,
+                                 self._backward, self._tombstone_ratio),
+                self.__getstate__())
+
+    def __getstate__(self):
+        '''(SkipList) -> (list, list of int or NoneType)
+        Returns the distinct elements of this list in order, and how many
+        occurences each has (None if every element occurs once).
+        '''
+        values = []
+        counts = []
+        for key, value, count in self._runs():
+            if values and values[-1] == value:
+                counts[-1] += count
+            else:
+                values.append(value)
+                counts.append(count)
+        if len(counts) == self._length:
+            counts = None
+        return values, counts
+
+    def __setstate__(self, state):
+        '''(SkipList, (list, list of int or NoneType)) -> NoneType
+        Bulk-loads the state returned by __getstate__ into this (new, empty)
+        list, in a single pass.
+        '''
+        values, counts = state
+        if counts is None:
+            counts = [1] * len(values)
+        key_of = self._key_of
+        self._build_runs((key_of(value), value, count)
+                         for value, count in zip(values, counts))
+
     def __iter__(self):
         '''(SkipList) -> iterator
         Returns an iterator for iteration processes on this list.
         '''
-        # Return a Non-None iterator iff the list is Non-empty.
-        if self._head is not None:
-            # The iterator to return is that of the first element in the
-            # lowest level.
-            return SkipList._SkipIterator(self._head.get_last_below_node())
-        return None
+        # The iterator walks the bottom level, starting after the head.
+        return SkipList._SkipIterator(self._head)
 
     def unique_iter(self):
         '''(SkipList) -> iterator
         Returns an iterator for iteration processes on this list, in unique
         mode.
         '''
-        # Return a Non-None iterator iff the list is Non-empty.
-        if self._head is not None:
-            # The iterator to return is that of the first element in the
-            # lowest level.
-            return SkipList._SkipIterator(self._head.get_last_below_node(),
-                                          unique_mode=True)
-        return None
+        # The iterator walks the bottom level, starting after the head, and
+        # skips runs of duplicates along the express lanes; unless a key
+        # function may have put unequal elements in the same run.
+        return SkipList._SkipIterator(self._head, unique_mode=True,
+                                      express=self._key_func is None)
+
+    def __reversed__(self):
+        '''(SkipList) -> iterator
+        Returns an iterator over this list from its last element back to its
+        first. With backward links, it walks them; otherwise the elements are
+        collected first.
+        '''
+        if not self._backward:
+            return reversed(list(self))
+        return self._backward_iter()
+
+    def _backward_iter(self):
+        '''(SkipList) -> generator
+        Yields every occurence in this list, last first, along the backward
+        links.
+
+        REQ: this list has backward links.
+        '''
+        node = self._tail
+        while node is not None:
+            for occurence in range(node._count):
+                yield node._value
+            node = node._prev
+
+    def min(self):
+        '''(SkipList) -> obj
+        Returns the first (least) element in this list, in O(1) (unless
+        there are tombstones).
+
+        RAISES IndexError if this list is empty, as pop_min does.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        if self._tombstones:
+            # The first towers may be tombstones; go by position instead.
+            return self._select_node(0)[0]._value
+        return self._head._next_nodes[SkipList.BOTTOM_LEVEL]._value
+
+    def max(self):
+        '''(SkipList) -> obj
+        Returns the last (greatest) element in this list: in O(1) with
+        backward links, otherwise by descending the last tower on every
+        level.
+
+        RAISES IndexError if this list is empty, as pop_max does.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        if self._tombstones:
+            # The last towers may be tombstones; go by position instead.
+            return self._select_node(self._length - 1)[0]._value
+        if self._backward:
+            return self._tail._value
+        node = self._head
+        for level in range(self._top_level(), SkipList.BOTTOM_LEVEL - 1, -1):
+            while node._next_nodes[level] is not None:
+                node = node._next_nodes[level]
+        return node._value
+
+    def pop_min(self):
+        '''(SkipList) -> obj
+        Removes one occurence of the first (least) element in this list and
+        returns it. Its predecessor is the head on every level (unless there
+        are tombstones), so nothing needs searching.
+
+        RAISES IndexError if this list is empty.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        if self._tombstones:
+            # The first towers may be tombstones; go by position instead.
+            update, ranks = self._find_update_at(1)
+        else:
+            update = [self._head] * len(self._head._next_nodes)
+            ranks = [0] * len(update)
+        first = update[SkipList.BOTTOM_LEVEL]._next_nodes[
+            SkipList.BOTTOM_LEVEL]
+        self._remove_occurence(first, update, ranks)
+        self._compact_if_due()
+        return first._value
+
+    def pop_max(self):
+        '''(SkipList) -> obj
+        Removes one occurence of the last (greatest) element in this list and
+        returns it. Its predecessors are found by span widths alone.
+
+        RAISES IndexError if this list is empty.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        update, ranks = self._find_update_at(self._length)
+        last = update[SkipList.BOTTOM_LEVEL]._next_nodes[SkipList.BOTTOM_LEVEL]
+        self._remove_occurence(last, update, ranks)
+        self._compact_if_due()
+        return last._value
 
     def new_averaged_skip_list(self, skiplist2):
         '''(SkipList, SkipList) -> SkipList
         Creates a SkipList for purposes of operations, which has the average
         of the two probabilities of given skiplists.
         '''
-        # Take the average of the two probabilities for the new list
+        # Take the average of the two probabilities for the new list, which
+        # keeps this list's storage mode and key function.
         ret_list_prob = (self._probability + skiplist2._probability) / 2
-        ret_list = SkipList(fixed_p=ret_list_prob)
+        ret_list = SkipList(fixed_p=ret_list_prob, counted=self._counted,
+                            key=self._key_func,
+                            levels=self._levels.spawn(ret_list_prob),
+                            backward=self._backward,
+                            tombstone_ratio=self._tombstone_ratio)
 
         return ret_list
 
     def __add__(self, skiplist2):
         '''(SkipList, SkipList) -> SkipList
         Returns a new skiplist which are both skip list's concatenated.
+
+        RAISES: TypeError if the two lists hold incomparable types.
         '''
         # Create a skiplist with the average of two probabilities.
         sum_list = self.new_averaged_skip_list(skiplist2)
 
-        # Now for each element in self, insert it.
-        sum_list.insert_all(self)
-
-        # Now for each element in skiplist2, insert it to new one.
-        sum_list.insert_all(skiplist2)
+        # Both operands are sorted, so walk their bottom levels together and
+        # bulk-load the merged result in a single pass.
+        try:
+            sum_list._build_runs(heapq.merge(self._runs(),
+                                             self._runs_of(skiplist2),
+                                             key=operator.itemgetter(0)))
+        except TypeError:
+            # Raise a customized message
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
 
         return sum_list
 
@@ -735,8 +2921,68 @@ class SkipList:
         '''(SkipList, SkipList) -> NoneType
         Adds to this skiplist, all elements and the number of there occurencesw
         in the given skiplist.
+
+        RAISES: TypeError if the two lists hold incomparable types.
         '''
-        # Insert every element in given skip list to this one.
-        self.insert_all(skiplist2)
+        # Adding a list to itself must not iterate over what it splices in.
+        runs = self._runs_of(skiplist2)
+        if skiplist2 is self:
+            runs = list(runs)
+
+        # Splice every element of the (sorted) given list into this one.
+        try:
+            self._splice_runs(runs)
+        except TypeError:
+            # Raise a customized message
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
 
-        return self
\ No newline at end of file
+        return self
+
+    def _splice_runs(self, runs):
+        '''(SkipList, iterable of (obj, obj, int)) -> NoneType
+        Merges sorted (key, element, occurences) runs into this list in place.
+        The update vector only ever moves forward, so each level of this list
+        is walked at most once over the whole merge.
+
+        REQ: the runs are in non-descending order (of their keys).
+        '''
+        update = [self._head] * len(self._head._next_nodes)
+        ranks = [0] * len(update)
+        for key, elem, count in runs:
+            # Levels the head gained since are entered from the head.
+            while len(update) < len(self._head._next_nodes):
+                update.append(self._head)
+                ranks.append(0)
+
+            # Resume from the old predecessor on every level, unless the one
+            # found on the level above is further along.
+            self._find_before(key, update=update, ranks=ranks, resume=True)
+
+            # As with insert, look for an equal element if it matters.
+            found = None
+            if self._counted or self._key_func is not None:
+                found, found_update, found_ranks = self._locate_in_run(
+                    elem, key, update, ranks)
+            if found is not None and self._counted:
+                # An existing tower just gains the occurences.
+                self._adjust_count(found, found_update, count)
+                self._length += count
+            elif self._counted:
+                self._link(self._new_tower(elem, key, self._levels.height(),
+                                           count), update, ranks)
+                self._length += count
+                self._balance(update, ranks)
+            else:
+                if found is not None:
+                    # Go in just before the equal element, on a fresh path
+                    # so this merge's own stays where it is.
+                    link_update, link_ranks = found_update, found_ranks
+                else:
+                    link_update, link_ranks = update, ranks
+                for tower in range(count):
+                    self._link(self._new_tower(elem, key,
+                                               self._levels.height()),
+                               link_update, link_ranks)
+                    self._length += 1
+                    self._balance(link_update, link_ranks, (update, ranks))
+            self._add_to_fingerprint(elem, count)
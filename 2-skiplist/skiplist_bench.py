@@ -0,0 +1,406 @@
+'''Benchmark suite for SkipList, to be run locally:
+
+    python skiplist_bench.py [--sizes N [N ...]] [--distributions D [D ...]]
+                             [--probabilities P [P ...]] [--ops OP [OP ...]]
+                             [--structures S [S ...]] [--repeat R]
+                             [--seed SEED] [--output FILE]
+
+Every operation (insert, search, remove, count, iter, unique_iter, add, eq)
+is timed on every structure (SkipList for each fixed_p, TypedSkipList, a
+list kept sorted with bisect, and collections.Counter), for every size and
+distribution of keys (random, sorted, reversed, heavy duplicates). The data
+comes from a seeded generator, so runs are reproducible; the best of the
+repeated timings is kept. Results are written as JSON, one record per
+measurement, for comparing versions against each other.'''
+
+import argparse
+import bisect
+import collections
+import heapq
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+
+from skiplist import SkipList
+from typed_skiplist import TypedSkipList
+
+
+# Defaults for the command line.
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_PROBABILITIES = [0.25, 0.5]
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 0
+
+# In the heavy duplicates distribution, the number of distinct keys is the
+# size divided by this.
+DUPLICATE_FACTOR = 100
+
+# Version of the JSON output layout.
+RESULTS_VERSION = 1
+
+
+def random_keys(size, rand):
+    '''(int, random.Random) -> list of int
+    Returns size keys in random order, mostly distinct.
+    '''
+    return [rand.randrange(size * 10) for index in range(size)]
+
+
+def sorted_keys(size, rand):
+    '''(int, random.Random) -> list of int
+    Returns size keys in ascending order.
+    '''
+    return sorted(random_keys(size, rand))
+
+
+def reversed_keys(size, rand):
+    '''(int, random.Random) -> list of int
+    Returns size keys in descending order.
+    '''
+    return sorted(random_keys(size, rand), reverse=True)
+
+
+def duplicate_keys(size, rand):
+    '''(int, random.Random) -> list of int
+    Returns size keys in random order, with few distinct ones.
+    '''
+    distinct = max(1, size // DUPLICATE_FACTOR)
+    return [rand.randrange(distinct) for index in range(size)]
+
+
+DISTRIBUTIONS = collections.OrderedDict([
+    ('random', random_keys), ('sorted', sorted_keys),
+    ('reversed', reversed_keys), ('duplicates', duplicate_keys)])
+
+
+class SkipListSubject:
+
+    '''Benchmarks a SkipList (or anything with its API).'''
+
+    def __init__(self, new_list):
+        '''(SkipListSubject, function) -> NoneType
+        Initializes a subject making its empty lists with new_list.
+        '''
+        self._new_list = new_list
+
+    def build(self, keys):
+        '''(SkipListSubject, list) -> SkipList
+        Returns a new list holding the keys, inserted one at a time.
+        '''
+        skip_list = self._new_list()
+        for key in keys:
+            skip_list.insert(key)
+        return skip_list
+
+    def search(self, skip_list, keys):
+        '''(SkipListSubject, SkipList, list) -> NoneType
+        Searches for every key.
+        '''
+        for key in keys:
+            skip_list.search(key)
+
+    def remove(self, skip_list, keys):
+        '''(SkipListSubject, SkipList, list) -> NoneType
+        Removes every key.
+        '''
+        for key in keys:
+            skip_list.remove(key)
+
+    def count(self, skip_list, keys):
+        '''(SkipListSubject, SkipList, list) -> NoneType
+        Counts every key.
+        '''
+        for key in keys:
+            skip_list.count(key)
+
+    def iterate(self, skip_list):
+        '''(SkipListSubject, SkipList) -> NoneType
+        Iterates over every occurence.
+        '''
+        for key in skip_list:
+            pass
+
+    def unique_iterate(self, skip_list):
+        '''(SkipListSubject, SkipList) -> NoneType
+        Iterates over every distinct key.
+        '''
+        for key in skip_list.unique_iter():
+            pass
+
+    def add(self, skip_list, skip_list2):
+        '''(SkipListSubject, SkipList, SkipList) -> SkipList
+        Returns the sum of both lists.
+        '''
+        return skip_list + skip_list2
+
+    def equal(self, skip_list, skip_list2):
+        '''(SkipListSubject, SkipList, SkipList) -> bool
+        Compares both lists.
+        '''
+        return skip_list == skip_list2
+
+
+class BisectSubject(SkipListSubject):
+
+    '''Benchmarks a plain list kept sorted with bisect.'''
+
+    def __init__(self):
+        '''(BisectSubject) -> NoneType
+        Initializes a subject of sorted lists.
+        '''
+        super().__init__(list)
+
+    def build(self, keys):
+        '''(BisectSubject, list) -> list
+        Returns a sorted list of the keys, inserted one at a time.
+        '''
+        sorted_list = []
+        for key in keys:
+            bisect.insort(sorted_list, key)
+        return sorted_list
+
+    def search(self, sorted_list, keys):
+        '''(BisectSubject, list, list) -> NoneType
+        Binary searches for every key.
+        '''
+        for key in keys:
+            index = bisect.bisect_left(sorted_list, key)
+            index < len(sorted_list) and sorted_list[index] == key
+
+    def remove(self, sorted_list, keys):
+        '''(BisectSubject, list, list) -> NoneType
+        Removes every key.
+        '''
+        for key in keys:
+            index = bisect.bisect_left(sorted_list, key)
+            if index < len(sorted_list) and sorted_list[index] == key:
+                del sorted_list[index]
+
+    def count(self, sorted_list, keys):
+        '''(BisectSubject, list, list) -> NoneType
+        Counts every key with two binary searches.
+        '''
+        for key in keys:
+            (bisect.bisect_right(sorted_list, key) -
+             bisect.bisect_left(sorted_list, key))
+
+    def unique_iterate(self, sorted_list):
+        '''(BisectSubject, list) -> NoneType
+        Iterates over every distinct key.
+        '''
+        for key, group in itertools.groupby(sorted_list):
+            pass
+
+    def add(self, sorted_list, sorted_list2):
+        '''(BisectSubject, list, list) -> list
+        Returns both lists merged.
+        '''
+        return list(heapq.merge(sorted_list, sorted_list2))
+
+
+class CounterSubject(SkipListSubject):
+
+    '''Benchmarks a collections.Counter, iterated in sorted order to match
+    what a skip list yields.'''
+
+    def __init__(self):
+        '''(CounterSubject) -> NoneType
+        Initializes a subject of counters.
+        '''
+        super().__init__(collections.Counter)
+
+    def build(self, keys):
+        '''(CounterSubject, list) -> Counter
+        Returns a counter of the keys, counted one at a time.
+        '''
+        counter = collections.Counter()
+        for key in keys:
+            counter[key] += 1
+        return counter
+
+    def search(self, counter, keys):
+        '''(CounterSubject, Counter, list) -> NoneType
+        Looks up every key.
+        '''
+        for key in keys:
+            key in counter
+
+    def remove(self, counter, keys):
+        '''(CounterSubject, Counter, list) -> NoneType
+        Removes an occurence of every key.
+        '''
+        for key in keys:
+            if counter[key] > 1:
+                counter[key] -= 1
+            else:
+                counter.pop(key, None)
+
+    def count(self, counter, keys):
+        '''(CounterSubject, Counter, list) -> NoneType
+        Counts every key.
+        '''
+        for key in keys:
+            counter[key]
+
+    def iterate(self, counter):
+        '''(CounterSubject, Counter) -> NoneType
+        Iterates over every occurence, in order.
+        '''
+        for key in sorted(counter.elements()):
+            pass
+
+    def unique_iterate(self, counter):
+        '''(CounterSubject, Counter) -> NoneType
+        Iterates over every distinct key, in order.
+        '''
+        for key in sorted(counter):
+            pass
+
+
+def subjects(probabilities):
+    '''(list of float) -> OrderedDict of str: SkipListSubject
+    Returns every structure to benchmark, by name.
+    '''
+    to_ret = collections.OrderedDict()
+    for fixed_p in probabilities:
+        to_ret['SkipList(p={})'.format(fixed_p)] = SkipListSubject(
+            lambda fixed_p=fixed_p: SkipList(fixed_p))
+    to_ret['TypedSkipList'] = SkipListSubject(TypedSkipList)
+    to_ret['bisect list'] = BisectSubject()
+    to_ret['Counter'] = CounterSubject()
+    return to_ret
+
+
+def best_time(function, repeat):
+    '''(function, int) -> float
+    Calls the function repeat times, each on fresh input it returns the
+    timed part of, and returns the best time in seconds.
+    '''
+    best = None
+    for run in range(repeat):
+        timed = function()
+        start = time.perf_counter()
+        timed()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def measure(subject, keys, keys2, probes, op, repeat):
+    '''(SkipListSubject, list, list, list, str, int) -> float
+    Returns the best time of the given operation on the subject, built from
+    keys (and keys2, for add and eq), probing with probes.
+    '''
+    if op == 'insert':
+        return best_time(lambda: lambda: subject.build(keys), repeat)
+
+    built = subject.build(keys)
+    if op == 'search':
+        return best_time(lambda: lambda: subject.search(built, probes), repeat)
+    if op == 'count':
+        return best_time(lambda: lambda: subject.count(built, probes), repeat)
+    if op == 'iter':
+        return best_time(lambda: lambda: subject.iterate(built), repeat)
+    if op == 'unique_iter':
+        return best_time(lambda: lambda: subject.unique_iterate(built),
+                         repeat)
+    if op == 'remove':
+        def fresh():
+            to_remove = subject.build(keys)
+            return lambda: subject.remove(to_remove, probes)
+        return best_time(fresh, repeat)
+
+    built2 = subject.build(keys2)
+    if op == 'add':
+        return best_time(lambda: lambda: subject.add(built, built2), repeat)
+    if op == 'eq':
+        same = subject.build(keys)
+        return best_time(lambda: lambda: subject.equal(built, same), repeat)
+    raise ValueError("Unknown operation: " + op)
+
+
+OPS = ['insert', 'search', 'remove', 'count', 'iter', 'unique_iter', 'add',
+       'eq']
+
+
+def run(sizes, distributions, probabilities, ops, structures, repeat, seed,
+        report=None):
+    '''(list of int, list of str, list of float, list of str, list of str,
+            int, int [, function]) -> list of dict
+    Runs every measurement and returns its records. Each is also passed to
+    report, if given, as soon as it is taken.
+    '''
+    records = []
+    for size in sizes:
+        for distribution in distributions:
+            # The same data for every structure, whatever ran before.
+            rand = random.Random('{}/{}/{}'.format(seed, size, distribution))
+            keys = DISTRIBUTIONS[distribution](size, rand)
+            keys2 = DISTRIBUTIONS[distribution](size, rand)
+            # Half present, half (most likely) absent.
+            probes = keys[::2] + keys2[::2]
+            rand.shuffle(probes)
+
+            for name, subject in subjects(probabilities).items():
+                if structures and name not in structures:
+                    continue
+                for op in ops:
+                    seconds = measure(subject, keys, keys2, probes, op,
+                                      repeat)
+                    record = {'structure': name, 'size': size,
+                              'distribution': distribution, 'op': op,
+                              'seconds': seconds,
+                              'ns_per_key': seconds * 1e9 / size}
+                    records.append(record)
+                    if report is not None:
+                        report(record)
+    return records
+
+
+def main(argv=None):
+    '''([list of str]) -> NoneType
+    Parses the command line, runs the benchmarks and writes the results as
+    JSON, with progress on standard error.
+    '''
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--distributions', nargs='+',
+                        default=list(DISTRIBUTIONS),
+                        choices=list(DISTRIBUTIONS))
+    parser.add_argument('--probabilities', type=float, nargs='+',
+                        default=DEFAULT_PROBABILITIES)
+    parser.add_argument('--ops', nargs='+', default=OPS, choices=OPS)
+    parser.add_argument('--structures', nargs='+', default=None,
+                        help='names as printed, e.g. "bisect list"')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', default=None,
+                        help='file to write the JSON to (default: stdout)')
+    args = parser.parse_args(argv)
+
+    def report(record):
+        print("{structure:>20} {size:>9} {distribution:>10} {op:>11} "
+              "{ns_per_key:12.1f} ns/key".format(**record), file=sys.stderr)
+
+    records = run(args.sizes, args.distributions, args.probabilities,
+                  args.ops, args.structures, args.repeat, args.seed, report)
+    results = {'version': RESULTS_VERSION,
+               'python': platform.python_version(),
+               'implementation': platform.python_implementation(),
+               'machine': platform.machine(),
+               'seed': args.seed, 'repeat': args.repeat,
+               'results': records}
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as out_file:
+            json.dump(results, out_file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+import operator
+from collections.abc import Mapping
+
+from skiplist import SkipList
+
+
+class _MapSkipList(SkipList):
+
+    '''The skip list under a SkipListDict: each tower keeps a mapping's key
+    in its key slot and the mapped value in its value slot, so there is no
+    key function and no (key, value) tuple, and only keys are compared.'''
+
+    def _new_tower(self, elem, key, height, count=1):
+        '''(_MapSkipList, obj, obj, int [, int]) -> TowerNode
+        Returns a new, unlinked tower mapping the given key to elem.
+        '''
+        to_add = super()._new_tower(elem, key, height, count)
+        to_add._key = key
+        return to_add
+
+    def _reset_fingerprint(self):
+        '''(_MapSkipList) -> NoneType
+        Keeps no fingerprint: mapped values need not be hashable, and a
+        mapping's equality is not the list's.
+        '''
+        self._fingerprint = None
+
+    def _add_to_fingerprint(self, elem, count):
+        '''(_MapSkipList, obj, int) -> NoneType
+        Does nothing, as there is no fingerprint to keep.
+        '''
+
+
+class SkipListDict:
+
+    '''A mapping ordered by its keys, which must be comparable with each
+    other (but need not be hashable). It is kept in a skip list: lookups,
+    insertions and deletions take O(log n) expected time, and iteration (of
+    the whole mapping, or of any range of keys) is in key order.'''
+
+    # Representation of SkipListDict constants
+    REPR_START = "SkipListDict({"
+    REPR_DELIMETER = ', '
+    REPR_ITEM = '{!r}: {!r}'
+    REPR_END = "})"
+
+    # Marker for "no default given" in pop.
+    _NO_DEFAULT = object()
+
+    def __init__(self, items=None, fixed_p=SkipList.DEFAULT_PROBABILITY,
+                 levels=None):
+        '''(SkipListDict [, dict or iterable, float, LevelGenerator]) ->
+                NoneType
+        Initializes this mapping with the given items (a mapping, or an
+        iterable of (key, value) pairs), if any. Its skip list gets the given
+        probability or level generator.
+
+        RAISES: TypeError if the keys are not comparable with each other.
+        '''
+        self._skip_list = _MapSkipList(fixed_p, levels=levels)
+        if items is not None:
+            self.update(items)
+
+    def update(self, items):
+        '''(SkipListDict, dict or iterable) -> NoneType
+        Maps every key of the given items (a mapping, or an iterable of (key,
+        value) pairs) to its value, the last value winning for repeated keys.
+        An empty mapping is bulk-loaded in a single pass.
+
+        RAISES: TypeError if the keys are not comparable with each other.
+        '''
+        if hasattr(items, 'items'):
+            items = items.items()
+        if len(self._skip_list):
+            for key, value in items:
+                self[key] = value
+            return
+
+        try:
+            pairs = sorted(items, key=operator.itemgetter(0))
+        except TypeError:
+            # Raise a customized message
+            raise TypeError(SkipList.ERROR_TYPE_INSERT)
+        # Sorting is stable, so the last of equal keys is the one kept.
+        runs = [(key, value, 1)
+                for index, (key, value) in enumerate(pairs)
+                if index + 1 == len(pairs) or pairs[index + 1][0] != key]
+        self._skip_list._build_runs(runs)
+
+    def _find(self, key):
+        '''(SkipListDict, obj) ->
+                (TowerNode or NoneType, list of TowerNode, list of int)
+        Returns the tower with the given key (None if there is none), along
+        with the update vector and ranks of where it is or would be.
+
+        RAISES TypeError if the key is incomparable with those in here.
+        '''
+        try:
+            update, ranks = self._skip_list._find_update(key)
+            node = update[SkipList.BOTTOM_LEVEL]._next_nodes[
+                SkipList.BOTTOM_LEVEL]
+            if node is not None and node._key == key:
+                return node, update, ranks
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        return None, update, ranks
+
+    def __getitem__(self, key):
+        '''(SkipListDict, obj) -> obj
+        Returns the value the given key maps to.
+
+        RAISES: KeyError if the key is not in this mapping; TypeError if it
+        is incomparable with those in here.
+        '''
+        node = self._find(key)[0]
+        if node is None:
+            raise KeyError(key)
+        return node._value
+
+    def __setitem__(self, key, value):
+        '''(SkipListDict, obj, obj) -> NoneType
+        Maps the given key to the given value, replacing any value it had.
+
+        RAISES: TypeError if the key is incomparable with those in here.
+        '''
+        node, update, ranks = self._find(key)
+        if node is not None:
+            node._value = value
+        else:
+            self._skip_list._insert_at(value, key, update, ranks)
+
+    def __delitem__(self, key):
+        '''(SkipListDict, obj) -> NoneType
+        Removes the given key and its value from this mapping.
+
+        RAISES: KeyError if the key is not in this mapping; TypeError if it
+        is incomparable with those in here.
+        '''
+        node, update, ranks = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        self._skip_list._remove_occurence(node, update, ranks)
+
+    def get(self, key, default=None):
+        '''(SkipListDict, obj [, obj]) -> obj
+        Returns the value the given key maps to, or default if it is not in
+        this mapping.
+
+        RAISES: TypeError if the key is incomparable with those in here.
+        '''
+        node = self._find(key)[0]
+        if node is None:
+            return default
+        return node._value
+
+    def pop(self, key, default=_NO_DEFAULT):
+        '''(SkipListDict, obj [, obj]) -> obj
+        Removes the given key from this mapping and returns its value, or
+        returns default if it is not in this mapping.
+
+        RAISES: KeyError if the key is not in this mapping and there is no
+        default; TypeError if it is incomparable with those in here.
+        '''
+        node, update, ranks = self._find(key)
+        if node is None:
+            if default is SkipListDict._NO_DEFAULT:
+                raise KeyError(key)
+            return default
+        self._skip_list._remove_occurence(node, update, ranks)
+        return node._value
+
+    def __contains__(self, key):
+        '''(SkipListDict, obj) -> bool
+        Returns whether the given key is in this mapping.
+        '''
+        try:
+            return self._find(key)[0] is not None
+        except TypeError:
+            # An incomparable key cannot be in here.
+            return False
+
+    def clear(self):
+        '''(SkipListDict) -> NoneType
+        Removes every key from this mapping.
+        '''
+        self._skip_list.clear()
+
+    def __len__(self):
+        '''(SkipListDict) -> int
+        Returns the number of keys in this mapping.
+        '''
+        return len(self._skip_list)
+
+    def _range(self, lo, hi, inclusive):
+        '''(SkipListDict, obj, obj, (bool, bool)) -> generator of TowerNode
+        Lazily yields the towers whose keys are between lo and hi (None
+        meaning unbounded), each bound included as inclusive says.
+
+        RAISES TypeError if a bound is incomparable with the keys.
+        '''
+        try:
+            start_node, start = self._skip_list._range_start(lo,
+                                                             inclusive[0])
+            stop = self._skip_list._range_stop(hi, inclusive[1])
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+        # The range is known by position, so no comparisons are needed.
+        node = start_node
+        for index in range(start, stop):
+            node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+            yield node
+
+    def keys(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(SkipListDict [, obj, obj, (bool, bool)]) -> generator
+        Lazily yields the keys of this mapping in order; only those between
+        lo and hi if either is given, lo included and hi excluded unless
+        inclusive says otherwise.
+
+        RAISES TypeError if a bound is incomparable with the keys.
+        '''
+        return (node._key for node in self._range(lo, hi, inclusive))
+
+    def values(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(SkipListDict [, obj, obj, (bool, bool)]) -> generator
+        Lazily yields the values of this mapping in the order of their keys;
+        only those of the keys in range, as keys selects them.
+
+        RAISES TypeError if a bound is incomparable with the keys.
+        '''
+        return (node._value for node in self._range(lo, hi, inclusive))
+
+    def items(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(SkipListDict [, obj, obj, (bool, bool)]) -> generator
+        Lazily yields the (key, value) pairs of this mapping in key order;
+        only those of the keys in range, as keys selects them.
+
+        RAISES TypeError if a bound is incomparable with the keys.
+        '''
+        return ((node._key, node._value)
+                for node in self._range(lo, hi, inclusive))
+
+    def __iter__(self):
+        '''(SkipListDict) -> generator
+        Lazily yields the keys of this mapping in order.
+        '''
+        return self.keys()
+
+    def floor_key(self, key):
+        '''(SkipListDict, obj) -> obj
+        Returns the greatest key in this mapping not greater than the given
+        one, or None if there is none.
+
+        RAISES TypeError if the key is incomparable with those in here.
+        '''
+        try:
+            node = self._skip_list._find_before(key, inclusive=True)[0]
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        if node is self._skip_list._head:
+            return None
+        return node._key
+
+    def ceiling_key(self, key):
+        '''(SkipListDict, obj) -> obj
+        Returns the least key in this mapping not less than the given one, or
+        None if there is none.
+
+        RAISES TypeError if the key is incomparable with those in here.
+        '''
+        try:
+            node = self._skip_list._find_before(key)[0]
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+        if node is None:
+            return None
+        return node._key
+
+    def __eq__(self, other):
+        '''(SkipListDict, dict or SkipListDict) -> bool
+        Returns whether both map the same keys to equal values. Anything but
+        a mapping is left for the other object to compare.
+        '''
+        if not isinstance(other, (SkipListDict, Mapping)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        if isinstance(other, SkipListDict):
+            # Both are in key order.
+            return all(item == item2
+                       for item, item2 in zip(self.items(), other.items()))
+        try:
+            return all(key in other and other[key] == value
+                       for key, value in self.items())
+        except TypeError:
+            # An unhashable key, which a hashed mapping cannot hold.
+            return False
+
+    def __reduce__(self):
+        '''(SkipListDict) -> tuple
+        Pickles this mapping as its items, in order, and its level generator.
+        '''
+        return (self.__class__, (list(self.items()),
+                                 self._skip_list._probability,
+                                 self._skip_list._levels))
+
+    def __repr__(self):
+        '''(SkipListDict) -> str
+        Returns a developer-friendly string representation of this mapping,
+        in the format SkipListDict({k1: v1, ..., kn: vn}) in key order.
+        '''
+        return (SkipListDict.REPR_START +
+                SkipListDict.REPR_DELIMETER.join(
+                    SkipListDict.REPR_ITEM.format(key, value)
+                    for key, value in self.items()) +
+                SkipListDict.REPR_END)
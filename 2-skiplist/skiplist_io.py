@@ -0,0 +1,629 @@
+'''A compact binary format for skip lists, and a memory-mapped reader.
+
+A file holds the bottom level of a skip list, one record per tower, in
+order, along with each tower's height (the level metadata), so that loading
+rebuilds the very same towers in a single linear pass. Laid out as:
+
+    header      HEADER (magic, version, value kind, flags, number of
+                towers, number of occurences, probability, tallest height)
+    ends        one unsigned 64-bit integer per tower: the number of
+                occurences up to and including it
+    heights     one byte per tower (0 if unknown), padded to 8 bytes
+    values      fixed-width values (signed 64-bit integers or doubles) when
+                every element is one, else one unsigned 64-bit offset per
+                tower (plus the end) into the pickled values that follow
+
+Numbers are little-endian. MappedSkipList answers searches, counts and
+range queries by binary search straight over the mapped file; fixed-width
+values are read in place, with no copying or unpickling at all. Only open
+files you trust: pickled values are unpickled as they are read.'''
+
+import array
+import bisect
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from skiplist import DeterministicLevels, LevelGenerator, SkipList
+
+
+# Header layout, and the file's signature.
+HEADER = struct.Struct('<4sBBBBQQdI4x')
+MAGIC = b'SKPL'
+FORMAT_VERSION = 1
+
+# Kinds of values: pickled objects, or one of the fixed-width kinds.
+KIND_PICKLE = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_TYPECODES = {KIND_INT: 'q', KIND_FLOAT: 'd'}
+INT_MIN = -2 ** 63
+INT_MAX = 2 ** 63 - 1
+
+# Flags, describing the list the file was written from.
+FLAG_COUNTED = 1
+FLAG_KEYED = 2
+FLAG_DETERMINISTIC = 4
+
+# Every section starts on a multiple of this many bytes.
+ALIGNMENT = 8
+# Width of ends, offsets and fixed-width values; and the tallest height
+# a byte holds.
+WORD_SIZE = 8
+MAX_STORED_HEIGHT = 255
+UNKNOWN_HEIGHT = 0
+
+# Errors for files that cannot be read.
+ERROR_MAGIC = "Not a skip list file."
+ERROR_VERSION = "Unsupported skip list file version."
+ERROR_KEY = "This skip list was ordered by a key function; give it again."
+
+
+def _padding(size):
+    '''(int) -> bytes
+    Returns the zero bytes bringing the given size to a multiple of
+    ALIGNMENT.
+    '''
+    return bytes(-size % ALIGNMENT)
+
+
+def _little_endian(words):
+    '''(array.array) -> bytes
+    Returns the bytes of the given array, in little-endian order.
+    '''
+    if sys.byteorder != 'little':
+        words = array.array(words.typecode, words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def _towers(skip_list):
+    '''(SkipList or iterable) -> generator of (obj, int, int)
+    Yields the towers on the bottom level of the given list as (element,
+    occurences, height) triples, in order. Anything that is not a SkipList
+    (e.g. a snapshot, or a concurrent list) has its heights unknown.
+    '''
+    if isinstance(skip_list, SkipList):
+        node = skip_list._head._next_nodes[SkipList.BOTTOM_LEVEL]
+        while node is not None:
+            # Tombstones (no occurences left) are not written.
+            if node._count:
+                yield node._value, node._count, len(node._next_nodes)
+            node = node._next_nodes[SkipList.BOTTOM_LEVEL]
+    elif hasattr(skip_list, '_runs'):
+        # Runs may group equal elements even if the list is not counted;
+        # then every occurence is a tower of its own.
+        counted = skip_list.is_counted()
+        for key, value, count in skip_list._runs():
+            if counted:
+                yield value, count, UNKNOWN_HEIGHT
+            else:
+                for occurence in range(count):
+                    yield value, 1, UNKNOWN_HEIGHT
+    else:
+        # Only its elements are known; a counted list gets one tower for
+        # every run of equal ones.
+        counted = skip_list.is_counted()
+        towers = []
+        for value in skip_list:
+            if counted and towers and towers[-1][0] == value:
+                towers[-1][1] += 1
+            else:
+                towers.append([value, 1])
+        for value, count in towers:
+            yield value, count, UNKNOWN_HEIGHT
+
+
+def _value_kind(values, keyed):
+    '''(list, bool) -> int
+    Returns the kind of values the given ones can be written as: fixed-width
+    if they are all integers in range, or all floats, and ordered by
+    themselves; pickled otherwise.
+    '''
+    if keyed:
+        return KIND_PICKLE
+    if all(type(value) is int and INT_MIN <= value <= INT_MAX
+           for value in values):
+        return KIND_INT
+    if all(type(value) is float for value in values):
+        return KIND_FLOAT
+    return KIND_PICKLE
+
+
+def dump(skip_list, file):
+    '''(SkipList, str or file) -> NoneType
+    Writes the given skip list (or a snapshot of one, or a concurrent one)
+    to the given path or binary file, in a single pass over its bottom
+    level. A key function is not written; it must be given again to read
+    the file.
+    '''
+    values = []
+    ends = array.array('Q')
+    heights = bytearray()
+    length = 0
+    tallest = 0
+    for value, count, height in _towers(skip_list):
+        values.append(value)
+        length += count
+        ends.append(length)
+        heights.append(min(height, MAX_STORED_HEIGHT))
+        tallest = max(tallest, height)
+
+    keyed = skip_list.get_key_function() is not None
+    flags = 0
+    if skip_list.is_counted():
+        flags |= FLAG_COUNTED
+    if keyed:
+        flags |= FLAG_KEYED
+    levels = getattr(skip_list, '_levels', None)
+    if levels is not None and levels.is_balancing():
+        flags |= FLAG_DETERMINISTIC
+    kind = _value_kind(values, keyed)
+
+    sections = [HEADER.pack(MAGIC, FORMAT_VERSION, kind, flags, 0,
+                            len(values), length,
+                            getattr(skip_list, '_probability',
+                                    SkipList.DEFAULT_PROBABILITY),
+                            tallest),
+                _little_endian(ends), bytes(heights),
+                _padding(len(heights))]
+    if kind == KIND_PICKLE:
+        pickles = [pickle.dumps(value) for value in values]
+        offsets = array.array('Q', [0])
+        for pickled in pickles:
+            offsets.append(offsets[-1] + len(pickled))
+        sections.append(_little_endian(offsets))
+        sections.extend(pickles)
+    else:
+        sections.append(_little_endian(
+            array.array(KIND_TYPECODES[kind], values)))
+
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'wb') as out_file:
+            out_file.writelines(sections)
+    else:
+        file.writelines(sections)
+
+
+def load(file, key=None, levels=None):
+    '''(str or file [, function, LevelGenerator]) -> SkipList
+    Reads a skip list back from the given path or binary file, rebuilding
+    the towers it was written with in a single pass (no searching), ordered
+    by the given key function if it was written with one. New towers get
+    their heights from the given level generator, by default one like the
+    written list's.
+
+    RAISES ValueError if the file is not a skip list file, or the key
+    function is missing.
+    '''
+    with MappedSkipList(file, key) as mapped:
+        return mapped.to_skip_list(levels)
+
+
+class _ReplayLevels(LevelGenerator):
+
+    '''A level generator that hands out the heights a file recorded, falling
+    back on another generator for unknown ones (or once released).'''
+
+    def __init__(self, heights, levels):
+        '''(sequence of int, LevelGenerator) -> NoneType
+        Initializes a generator replaying the given heights, in order.
+        '''
+        self._heights = heights
+        self._levels = levels
+        self._probability = levels.get_probability()
+        self._max_level = levels.get_max_level()
+
+    def height(self):
+        '''(_ReplayLevels) -> int
+        Returns the height of a new tower, from the fallback generator.
+        '''
+        return self._levels.height()
+
+    def height_at(self, position):
+        '''(_ReplayLevels, int) -> int
+        Returns the recorded height of the tower at the given (one-based)
+        position, if it is known.
+        '''
+        if position > len(self._heights):
+            return self._levels.height_at(position)
+        height = self._heights[position - 1]
+        if height == UNKNOWN_HEIGHT:
+            return self._levels.height_at(position)
+        return height
+
+    def release(self):
+        '''(_ReplayLevels) -> NoneType
+        Lets go of the recorded heights (a view into a mapped file, which
+        cannot be closed while it is held); every height is unknown after.
+        '''
+        self._heights = ()
+
+
+class _PickledValues:
+
+    '''The pickled values of a mapped file, as a read-only sequence that
+    unpickles each one only when it is indexed.'''
+
+    def __init__(self, buffer, offsets, start):
+        '''(_PickledValues, mmap, sequence of int, int) -> NoneType
+        Initializes the sequence of values pickled in the buffer from the
+        given start, at the given offsets from it.
+        '''
+        self._buffer = buffer
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self):
+        '''(_PickledValues) -> int
+        Returns the number of values.
+        '''
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        '''(_PickledValues, int) -> obj
+        Unpickles and returns the value at the given index.
+        '''
+        if not 0 <= index < len(self):
+            raise IndexError(SkipList.ERROR_INDEX)
+        return pickle.loads(
+            self._buffer[self._start + self._offsets[index]:
+                         self._start + self._offsets[index + 1]])
+
+
+class MappedSkipList:
+
+    '''A read-only skip list answering queries straight from a memory-mapped
+    file written by dump, with no rehydration: its towers are binary
+    searched in place. Fixed-width values are read without copying, and
+    pickled ones are only unpickled when probed. It can be closed, or used
+    as a context manager.'''
+
+    def __init__(self, file, key=None):
+        '''(MappedSkipList, str or file [, function]) -> NoneType
+        Maps the given path or binary file (which must have a fileno), its
+        elements ordered by the given key function if it was written with
+        one.
+
+        RAISES ValueError if the file is not a skip list file, or the key
+        function is missing.
+        '''
+        self._file = None
+        if isinstance(file, (str, bytes, os.PathLike)):
+            file = self._file = open(file, 'rb')
+        try:
+            self._buffer = mmap.mmap(file.fileno(), 0,
+                                     access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # E.g. an empty file, which cannot be mapped.
+            if self._file is not None:
+                self._file.close()
+            raise
+
+        try:
+            (magic, version, kind, flags, reserved, towers, length,
+             probability, tallest) = HEADER.unpack_from(self._buffer)
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(ERROR_MAGIC)
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(ERROR_VERSION)
+        if flags & FLAG_KEYED and key is None:
+            self.close()
+            raise ValueError(ERROR_KEY)
+
+        self._length = length
+        self._counted = bool(flags & FLAG_COUNTED)
+        self._deterministic = bool(flags & FLAG_DETERMINISTIC)
+        self._key_func = key
+        self._probability = probability
+
+        # The sections, each just after the one before.
+        offset = HEADER.size
+        self._ends = self._words(offset, towers, 'Q')
+        offset += towers * WORD_SIZE
+        self._heights = memoryview(self._buffer)[offset:offset + towers]
+        offset += towers + len(_padding(towers))
+        if kind == KIND_PICKLE:
+            offsets = self._words(offset, towers + 1, 'Q')
+            self._values = _PickledValues(
+                self._buffer, offsets, offset + (towers + 1) * WORD_SIZE)
+        else:
+            self._values = self._words(offset, towers, KIND_TYPECODES[kind])
+
+    def _words(self, offset, count, typecode):
+        '''(MappedSkipList, int, int, str) -> sequence
+        Returns the given number of 8-byte words from the given offset of the
+        mapped file, in place (or copied, on big-endian machines).
+        '''
+        words = memoryview(self._buffer)[offset:offset + count * WORD_SIZE]
+        words = words.cast(typecode)
+        if sys.byteorder != 'little':
+            words = array.array(typecode, words)
+            words.byteswap()
+        return words
+
+    def close(self):
+        '''(MappedSkipList) -> NoneType
+        Unmaps the file, closing it if it was opened from a path.
+        '''
+        # Views into the map must go before it can be closed.
+        self._ends = self._heights = self._values = None
+        self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        '''(MappedSkipList) -> MappedSkipList
+        Returns this list, for use in a with statement.
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''(MappedSkipList, type, Exception, traceback) -> NoneType
+        Closes this list at the end of a with statement.
+        '''
+        self.close()
+
+    def is_counted(self):
+        '''(MappedSkipList) -> bool
+        Returns whether the written list stored duplicates as counted towers.
+        '''
+        return self._counted
+
+    def get_key_function(self):
+        '''(MappedSkipList) -> function or NoneType
+        Returns the key function elements are ordered by, if any.
+        '''
+        return self._key_func
+
+    def new_empty_skip_list(self):
+        '''(MappedSkipList) -> SkipList
+        Creates an empty SkipList configured like the written one.
+        '''
+        return SkipList(self._probability, counted=self._counted,
+                        key=self._key_func, levels=self._new_levels())
+
+    def _new_levels(self):
+        '''(MappedSkipList) -> LevelGenerator
+        Returns a new level generator like the written list's.
+        '''
+        if self._deterministic:
+            return DeterministicLevels()
+        return LevelGenerator(self._probability)
+
+    def to_skip_list(self, levels=None):
+        '''(MappedSkipList [, LevelGenerator]) -> SkipList
+        Returns a new SkipList holding every element, with the towers it was
+        written with, rebuilt in a single pass. New towers get their heights
+        from the given level generator, by default one like the written
+        list's.
+        '''
+        if levels is None:
+            levels = self._new_levels()
+        replay = _ReplayLevels(self._heights, levels)
+        skip_list = SkipList(levels.get_probability(), counted=self._counted,
+                             key=self._key_func, levels=replay)
+        try:
+            skip_list._build_runs(self._runs())
+        finally:
+            # Even if the build failed, so that this list can still close.
+            replay.release()
+        skip_list._levels = levels
+        return skip_list
+
+    def _key_of(self, elem):
+        '''(MappedSkipList, obj) -> obj
+        Returns the key the given element is ordered by.
+        '''
+        if self._key_func is None:
+            return elem
+        return self._key_func(elem)
+
+    def _bisect(self, elem, right=False):
+        '''(MappedSkipList, obj [, bool]) -> int
+        Returns the index of the first tower whose key is not less than the
+        element's (or greater than it, if right).
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        if right:
+            search = bisect.bisect_right
+        else:
+            search = bisect.bisect_left
+        try:
+            return search(self._values, self._key_of(elem),
+                          key=self._key_func)
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+    def _position(self, index):
+        '''(MappedSkipList, int) -> int
+        Returns the number of occurences before the tower at the given index.
+        '''
+        if index == 0:
+            return 0
+        return self._ends[index - 1]
+
+    def _towers_of(self, elem):
+        '''(MappedSkipList, obj) -> generator of int
+        Yields the indices of the towers holding the given element.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        first = self._bisect(elem)
+        last = self._bisect(elem, right=True)
+        for index in range(first, last):
+            if self._key_func is None or self._values[index] == elem:
+                yield index
+
+    def search(self, elem):
+        '''(MappedSkipList, obj) -> obj
+        Returns the element if it is found, otherwise returns None.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        for index in self._towers_of(elem):
+            return self._values[index]
+        return None
+
+    def __contains__(self, elem):
+        '''(MappedSkipList, obj) -> bool
+        Returns whether the element is in this list.
+        '''
+        try:
+            return self.search(elem) is not None
+        except TypeError:
+            return False
+
+    def count(self, elem):
+        '''(MappedSkipList, obj) -> int
+        Returns the number of occurences of the given element.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return sum(self._ends[index] - self._position(index)
+                   for index in self._towers_of(elem))
+
+    def rank(self, elem):
+        '''(MappedSkipList, obj) -> int
+        Returns the number of elements less than the given one (by key).
+
+        RAISES TypeError if trying to rank with incompatible types.
+        '''
+        return self._position(self._bisect(elem))
+
+    def bisect_left(self, elem):
+        '''(MappedSkipList, obj) -> int
+        Returns the number of elements less than the given one.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self.rank(elem)
+
+    def bisect_right(self, elem):
+        '''(MappedSkipList, obj) -> int
+        Returns the number of elements not greater than the given one.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self._position(self._bisect(elem, right=True))
+
+    def _range(self, lo, hi, inclusive):
+        '''(MappedSkipList, obj, obj, (bool, bool)) -> (int, int)
+        Returns the indices of the first tower in range and of the one just
+        past the last, as SkipList.irange bounds them.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start = 0
+        if lo is not None:
+            start = self._bisect(lo, right=not inclusive[0])
+        stop = len(self._values)
+        if hi is not None:
+            stop = self._bisect(hi, right=inclusive[1])
+        return start, max(start, stop)
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(MappedSkipList [, obj, obj, (bool, bool)]) -> int
+        Returns the number of elements between lo and hi, as
+        SkipList.count_range does.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start, stop = self._range(lo, hi, inclusive)
+        return self._position(stop) - self._position(start)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, False),
+               reverse=False):
+        '''(MappedSkipList [, obj, obj, (bool, bool), bool]) -> generator
+        Lazily yields the elements between lo and hi in order (or in reverse
+        order, if reverse), as SkipList.irange does.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start, stop = self._range(lo, hi, inclusive)
+        indices = range(start, stop)
+        if reverse:
+            indices = reversed(indices)
+        for index in indices:
+            value = self._values[index]
+            for occurence in range(self._ends[index] - self._position(index)):
+                yield value
+
+    def select(self, index):
+        '''(MappedSkipList, int) -> obj
+        Returns the element at the given index (negative ones counting from
+        the end).
+
+        RAISES IndexError if the index is out of range.
+        '''
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(SkipList.ERROR_INDEX)
+        return self._values[bisect.bisect_right(self._ends, index)]
+
+    def __getitem__(self, index):
+        '''(MappedSkipList, int) -> obj
+        Returns the element at the given index, as select does.
+
+        RAISES IndexError if the index is out of range.
+        '''
+        return self.select(index)
+
+    def _runs(self):
+        '''(MappedSkipList) -> generator of (obj, obj, int)
+        Yields every tower as a (key, element, occurences) triple, in order.
+        '''
+        for index in range(len(self._values)):
+            value = self._values[index]
+            yield (self._key_of(value), value,
+                   self._ends[index] - self._position(index))
+
+    def __iter__(self):
+        '''(MappedSkipList) -> generator
+        Yields every occurence, in order.
+        '''
+        return self.irange()
+
+    def unique_iter(self):
+        '''(MappedSkipList) -> generator
+        Yields every distinct element, in order.
+        '''
+        no_elem = previous = SkipList._SkipIterator._NO_ELEM
+        for index in range(len(self._values)):
+            value = self._values[index]
+            if previous is no_elem or previous != value:
+                yield value
+            previous = value
+
+    def __len__(self):
+        '''(MappedSkipList) -> int
+        Returns the number of occurences in this list.
+        '''
+        return self._length
+
+    def __eq__(self, skiplist2):
+        '''(MappedSkipList, SkipList) -> bool
+        Returns whether both hold the same elements, as many times each.
+        '''
+        return (len(self) == len(skiplist2) and
+                all(elem == elem2 for elem, elem2 in zip(self, skiplist2)))
+
+    def __add__(self, skiplist2):
+        '''(MappedSkipList, SkipList) -> SkipList
+        Returns a new skip list holding the elements of both.
+
+        RAISES: TypeError if the two hold incomparable types.
+        '''
+        sum_list = self.new_empty_skip_list()
+        sum_list += self
+        sum_list += skiplist2
+        return sum_list
@@ -0,0 +1,194 @@
+import os
+import pickle
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from concurrent_skiplist import ConcurrentSkipList
+from skiplist import DeterministicLevels, LevelGenerator
+
+
+class TestConcurrentSkipList(unittest.TestCase):
+
+    THREADS = 4
+    STEPS = 3000
+    VALUES = 100
+
+    def test_sequential(self):
+        skip_list = ConcurrentSkipList(levels=LevelGenerator(seed=1))
+        skip_list.insert_all([3, 1, 2, 3])
+        self.assertEqual(list(skip_list), [1, 2, 3, 3])
+        self.assertEqual(skip_list.count(3), 2)
+        self.assertEqual(list(skip_list.unique_iter()), [1, 2, 3])
+        self.assertTrue(skip_list.remove(3))
+        self.assertFalse(skip_list.remove(4))
+        self.assertFalse('a' in skip_list)
+        self.assertEqual(len(skip_list), 3)
+        skip_list += [0, 5]
+        self.assertEqual(list(skip_list), [0, 1, 2, 3, 5])
+        self.assertEqual(list(skip_list + skip_list),
+                         [0, 0, 1, 1, 2, 2, 3, 3, 5, 5])
+
+    def test_concurrent_writes(self):
+        # Every writer inserts and removes its own random values, keeping
+        # its net count of each; the list must end up with their sum.
+        skip_list = ConcurrentSkipList()
+        net_counts = [[0] * TestConcurrentSkipList.VALUES
+                      for thread in range(TestConcurrentSkipList.THREADS)]
+        failures = []
+
+        def write(thread):
+            rand = random.Random(thread)
+            counts = net_counts[thread]
+            for step in range(TestConcurrentSkipList.STEPS):
+                value = rand.randrange(TestConcurrentSkipList.VALUES)
+                if rand.random() < 0.6 or not counts[value]:
+                    skip_list.insert(value)
+                    counts[value] += 1
+                elif skip_list.remove(value):
+                    counts[value] -= 1
+                else:
+                    # No writer removes more than it inserted, so the list
+                    # holds at least this one's occurences: one was lost.
+                    failures.append(value)
+
+        def read():
+            # Readers always see the elements in order.
+            for scan in range(20):
+                values = list(skip_list)
+                if values != sorted(values):
+                    failures.append(values)
+                for value in range(0, TestConcurrentSkipList.VALUES, 10):
+                    if skip_list.count(value) < 0:
+                        failures.append(value)
+
+        threads = [threading.Thread(target=write, args=(thread,))
+                   for thread in range(TestConcurrentSkipList.THREADS)]
+        threads.append(threading.Thread(target=read))
+        # Switch threads as often as possible, so their steps interleave.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(failures, [])
+        expected = [sum(counts[value] for counts in net_counts)
+                    for value in range(TestConcurrentSkipList.VALUES)]
+        for value in range(TestConcurrentSkipList.VALUES):
+            self.assertEqual(skip_list.count(value), expected[value])
+        self.assertEqual(len(skip_list), sum(expected))
+        self.assertEqual(list(skip_list),
+                         [value for value in range(TestConcurrentSkipList.VALUES)
+                          for occurence in range(expected[value])])
+
+    def test_clear_while_writing(self):
+        # Writes racing with a clear land either in the list or in what it
+        # discarded; either way, the length counts just what the list holds.
+        skip_list = ConcurrentSkipList()
+
+        def write(thread):
+            rand = random.Random(thread)
+            for step in range(TestConcurrentSkipList.STEPS):
+                value = rand.randrange(TestConcurrentSkipList.VALUES)
+                if rand.random() < 0.6:
+                    skip_list.insert(value)
+                else:
+                    skip_list.remove(value)
+
+        def clear():
+            for step in range(200):
+                skip_list.clear()
+
+        threads = [threading.Thread(target=write, args=(thread,))
+                   for thread in range(TestConcurrentSkipList.THREADS)]
+        threads.append(threading.Thread(target=clear))
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(len(skip_list), len(list(skip_list)))
+        skip_list.clear()
+        self.assertEqual(len(skip_list), 0)
+        self.assertEqual(list(skip_list), [])
+
+    def test_insert_retried_after_clear(self):
+        # The list is cleared once, between finding where 2 goes and linking
+        # it: the insert must be made again in the new list.
+        skip_list = ConcurrentSkipList()
+        skip_list.insert_all([1, 3])
+        link = skip_list._link
+        clears = []
+
+        def clearing_link(*args):
+            if not clears:
+                clears.append(True)
+                skip_list.clear()
+            return link(*args)
+
+        skip_list._link = clearing_link
+        skip_list.insert(2)
+        self.assertEqual(list(skip_list), [2])
+        self.assertEqual(len(skip_list), 1)
+
+    def test_balancing_levels(self):
+        self.assertRaises(ValueError, ConcurrentSkipList,
+                          levels=DeterministicLevels())
+
+    def test_pickle(self):
+        skip_list = ConcurrentSkipList(levels=LevelGenerator(seed=2))
+        rand = random.Random(2)
+        values = [rand.randrange(500) for step in range(2000)]
+        skip_list.insert_all(values)
+        copy = pickle.loads(pickle.dumps(skip_list))
+        self.assertEqual(list(copy), sorted(values))
+        self.assertEqual(len(copy), len(values))
+        for value in range(500):
+            self.assertEqual(copy.count(value), values.count(value))
+        for value in values[:1000]:
+            self.assertTrue(copy.remove(value))
+        copy.insert(-1)
+        self.assertEqual(list(copy), [-1] + sorted(values[1000:]))
+
+    def test_unpickled_levels(self):
+        skip_list = ConcurrentSkipList(levels=LevelGenerator(seed=3,
+                                                             max_level=6))
+        skip_list.insert_all(value // 3 for value in range(3000))
+        copy = pickle.loads(pickle.dumps(skip_list))
+        # Every level holds live towers in order, none above the head's top.
+        heights = []
+        node = copy._head._next_nodes[0]
+        while node is not None:
+            self.assertTrue(node.is_live())
+            heights.append(len(node._next_nodes))
+            node = node._next_nodes[0]
+        self.assertEqual(len(heights), 1000)
+        self.assertEqual(copy._top, max(heights))
+        self.assertTrue(copy._top <= len(copy._head._next_nodes))
+        for level in range(copy._top):
+            values = []
+            node = copy._head._next_nodes[level]
+            while node is not None:
+                values.append(node._value)
+                node = node._next_nodes[level]
+            self.assertEqual(len(values),
+                             sum(1 for height in heights if height > level))
+            self.assertEqual(values, sorted(set(values)))
+        self.assertEqual(len(copy), 3000)
+        self.assertEqual(copy.count(500), 3)
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
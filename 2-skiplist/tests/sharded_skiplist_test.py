@@ -0,0 +1,139 @@
+import multiprocessing
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from sharded_skiplist import ShardedSkipList
+from skiplist import SkipList
+from typed_skiplist import TypedSkipList
+
+
+class TestShardedSkipList(unittest.TestCase):
+
+    def test_against_model(self):
+        rand = random.Random(4)
+        values = [rand.randrange(1000) for step in range(3000)]
+        sharded = ShardedSkipList.from_iterable(values, shards=4, seed=4)
+        model = sorted(values)
+        for step in range(2000):
+            value = rand.randrange(1000)
+            if rand.random() < 0.5:
+                sharded.insert(value)
+                model.append(value)
+            else:
+                self.assertEqual(sharded.remove(value), value in model)
+                if value in model:
+                    model.remove(value)
+        model.sort()
+        self.assertEqual(list(sharded), model)
+        self.assertEqual(len(sharded), len(model))
+        self.assertEqual(sum(sharded.get_shard_lengths()), len(model))
+        self.assertEqual(list(sharded.irange(100, 200)),
+                         [value for value in model if 100 <= value < 200])
+        self.assertEqual(sharded.count_many([5, 1001]),
+                         [model.count(5), 0])
+
+    def test_rebalance(self):
+        sharded = ShardedSkipList(4)
+        sharded.insert_all(range(4000))
+        lengths = sharded.get_shard_lengths()
+        self.assertEqual(sum(lengths), 4000)
+        self.assertTrue(max(lengths) <= 2 * 4000 / 4)
+
+    def test_unsplittable_skew(self):
+        # One key outweighs every shard's share; rebalancing cannot help,
+        # so it must not run again on every insert.
+        rebalances = []
+        sharded = ShardedSkipList(4)
+        sharded.insert_all(list(range(2000)) + [1999] * 6000)
+        rebalance = sharded.rebalance
+
+        def counted_rebalance():
+            rebalances.append(len(sharded))
+            rebalance()
+
+        sharded.rebalance = counted_rebalance
+        for value in range(200):
+            sharded.insert(value)
+        self.assertEqual(rebalances, [])
+        self.assertEqual(len(sharded), 8200)
+
+    def test_compare(self):
+        sharded = ShardedSkipList.from_iterable(range(100), shards=3)
+        self.assertTrue(sharded == TypedSkipList.from_iterable(range(100)))
+        self.assertFalse(sharded == TypedSkipList.from_iterable(range(1, 101)))
+        skip_list = SkipList.from_iterable(range(100))
+        with skip_list.snapshot() as snapshot:
+            self.assertTrue(sharded == snapshot)
+        skip_list.insert(3)
+        skip_list.remove(99)
+        self.assertFalse(sharded == skip_list)
+
+    def test_contains(self):
+        sharded = ShardedSkipList.from_iterable(range(100), shards=3)
+        self.assertTrue(5 in sharded)
+        self.assertFalse(100 in sharded)
+        self.assertFalse('a' in sharded)
+        self.assertFalse(sharded.remove('a'))
+
+    def test_processes(self):
+        with ShardedSkipList.from_iterable(range(50), shards=2,
+                                           processes=True) as sharded:
+            sharded.insert(10)
+            self.assertEqual(sharded.count(10), 2)
+            self.assertEqual(list(sharded.unique_iter()), list(range(50)))
+            self.assertFalse('a' in sharded)
+
+
+    def test_spawned_processes(self):
+        # Spawned workers hash strings with seeds of their own.
+        words = ['w{}'.format(value) for value in range(300)]
+        start_method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method('spawn', force=True)
+        try:
+            with ShardedSkipList.from_iterable(words, shards=3,
+                                               processes=True) as sharded:
+                skip_list = SkipList.from_iterable(words)
+                self.assertEqual(sharded.get_fingerprint(),
+                                 skip_list.get_fingerprint())
+                self.assertTrue(sharded == skip_list)
+                skip_list.remove('w1')
+                skip_list.insert('x')
+                self.assertFalse(sharded == skip_list)
+        finally:
+            multiprocessing.set_start_method(start_method, force=True)
+
+    def test_add(self):
+        for processes in (False, True):
+            with ShardedSkipList.from_iterable(range(0, 300, 2), shards=3,
+                                               processes=processes) as sharded:
+                other = ShardedSkipList.from_iterable(range(0, 300, 3),
+                                                      shards=3)
+                other2 = ShardedSkipList.from_iterable(range(100), shards=2)
+                for addend in (sharded, other, other2,
+                               SkipList.from_iterable(range(-50, 50)),
+                               TypedSkipList.from_iterable(range(250, 350))):
+                    total = sharded + addend
+                    self.assertEqual(list(total),
+                                     sorted(list(sharded) + list(addend)))
+                    self.assertEqual(len(total), len(sharded) + len(addend))
+                    self.assertEqual(sum(total.get_shard_lengths()),
+                                     len(total))
+                    self.assertEqual(total.count(60),
+                                     sharded.count(60) + addend.count(60))
+                    total.close()
+                other.close()
+                other2.close()
+                self.assertRaises(TypeError, sharded.__add__,
+                                  SkipList.from_iterable(['a']))
+                with self.assertRaises(TypeError) as raised:
+                    sharded.count('a')
+                self.assertEqual(str(raised.exception),
+                                 SkipList.ERROR_TYPE_SEARCH)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
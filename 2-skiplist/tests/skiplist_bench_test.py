@@ -0,0 +1,64 @@
+import collections
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import skiplist_bench
+
+
+def contents(built):
+    '''(obj) -> list
+    Returns every occurence a benchmarked structure holds, in order.
+    '''
+    if isinstance(built, collections.Counter):
+        return sorted(built.elements())
+    return list(built)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_subjects_agree(self):
+        keys = skiplist_bench.duplicate_keys(500, random.Random(16))
+        keys2 = skiplist_bench.random_keys(300, random.Random(17))
+        for name, subject in skiplist_bench.subjects([0.5]).items():
+            built = subject.build(keys)
+            self.assertEqual(contents(built), sorted(keys), "Failed: " + name)
+            self.assertEqual(contents(subject.add(built, subject.build(keys2))),
+                             sorted(keys + keys2))
+            self.assertTrue(subject.equal(built, subject.build(keys)))
+            subject.remove(built, keys[:250])
+            self.assertEqual(contents(built), sorted(keys[250:]))
+
+    def test_reproducible_keys(self):
+        for name, distribution in skiplist_bench.DISTRIBUTIONS.items():
+            self.assertEqual(distribution(100, random.Random(1)),
+                             distribution(100, random.Random(1)))
+
+    def test_json_output(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'results.json')
+            skiplist_bench.main(['--sizes', '50', '--repeat', '1',
+                                 '--probabilities', '0.5',
+                                 '--output', path])
+            with open(path) as in_file:
+                results = json.load(in_file)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(results['version'], skiplist_bench.RESULTS_VERSION)
+        records = results['results']
+        self.assertEqual(len(records),
+                         len(skiplist_bench.DISTRIBUTIONS) *
+                         len(skiplist_bench.subjects([0.5])) *
+                         len(skiplist_bench.OPS))
+        self.assertTrue(all(record['seconds'] >= 0 for record in records))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,69 @@
+import os
+import pickle
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from skiplist_dict import SkipListDict
+
+
+class TestSkipListDict(unittest.TestCase):
+
+    def test_against_dict(self):
+        rand = random.Random(6)
+        mapping = SkipListDict()
+        model = {}
+        for step in range(2000):
+            key = rand.randrange(150)
+            if rand.random() < 0.6:
+                mapping[key] = step
+                model[key] = step
+            else:
+                self.assertEqual(mapping.pop(key, None), model.pop(key, None))
+        self.assertEqual(list(mapping.items()), sorted(model.items()))
+        self.assertEqual(len(mapping), len(model))
+        self.assertTrue(mapping == model)
+        for key in range(150):
+            self.assertEqual(key in mapping, key in model)
+            self.assertEqual(mapping.get(key), model.get(key))
+
+    def test_bulk_load(self):
+        mapping = SkipListDict([(3, 'c'), (1, 'a'), (3, 'C'), (2, 'b')])
+        self.assertEqual(list(mapping.keys()), [1, 2, 3])
+        self.assertEqual(mapping[3], 'C')
+        self.assertRaises(KeyError, mapping.__getitem__, 4)
+        del mapping[1]
+        self.assertRaises(KeyError, mapping.__delitem__, 1)
+        self.assertEqual(mapping.floor_key(5), 3)
+        self.assertEqual(mapping.ceiling_key(0), 2)
+
+    def test_unhashable_values(self):
+        mapping = SkipListDict({1: [1]})
+        del mapping[1]
+        mapping[2] = [2]
+        mapping[3] = {}
+        self.assertEqual(list(mapping.values()), [[2], {}])
+        mapping.clear()
+        mapping[1] = []
+        self.assertEqual(mapping, SkipListDict({1: []}))
+
+    def test_compare(self):
+        mapping = SkipListDict([([1], 'a'), ([2], 'b')])
+        # Its keys are unhashable, so no dict can hold them.
+        self.assertFalse(mapping == {1: 'a', 2: 'b'})
+        self.assertTrue(mapping != {1: 'a', 2: 'b'})
+        self.assertFalse(mapping == [[1], [2]])
+        self.assertTrue(mapping != 2)
+        self.assertTrue(SkipListDict({1: 'a'}) == {1: 'a'})
+        self.assertTrue({1: 'a'} == SkipListDict({1: 'a'}))
+        self.assertEqual(SkipListDict({1: 'a'}).__eq__(5), NotImplemented)
+
+    def test_pickle(self):
+        mapping = SkipListDict({'b': [2], 'a': [1]})
+        self.assertEqual(pickle.loads(pickle.dumps(mapping)), mapping)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
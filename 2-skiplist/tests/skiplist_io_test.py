@@ -0,0 +1,96 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+import skiplist_io
+from skiplist import DeterministicLevels, SkipList
+from typed_skiplist import TypedSkipList
+
+
+def tower_heights(skip_list):
+    '''(SkipList) -> list of int
+    Returns the heights of the towers on the bottom level, in order.
+    '''
+    heights = []
+    node = skip_list._head._next_nodes[0]
+    while node is not None:
+        heights.append(len(node._next_nodes))
+        node = node._next_nodes[0]
+    return heights
+
+
+class TestSkipListIO(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'list.skpl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        values = [5, 1, 3, 3, 9, 1, 1]
+        for skip_list in (SkipList.from_iterable(values),
+                          SkipList.from_iterable(values, counted=True),
+                          SkipList.from_iterable(
+                              values, levels=DeterministicLevels()),
+                          SkipList.from_iterable([float(value)
+                                                  for value in values]),
+                          SkipList.from_iterable([str(value)
+                                                  for value in values])):
+            skiplist_io.dump(skip_list, self.path)
+            loaded = skiplist_io.load(self.path)
+            self.assertEqual(list(loaded), list(skip_list))
+            self.assertEqual(loaded.is_counted(), skip_list.is_counted())
+            self.assertEqual(tower_heights(loaded), tower_heights(skip_list))
+            loaded.insert(loaded[0])
+            self.assertEqual(len(loaded), len(values) + 1)
+
+    def test_uncounted_runs(self):
+        typed_list = TypedSkipList.from_iterable([1, 2, 2, 3, 3, 3])
+        skiplist_io.dump(typed_list, self.path)
+        loaded = skiplist_io.load(self.path)
+        self.assertEqual(list(loaded), [1, 2, 2, 3, 3, 3])
+        self.assertEqual(loaded.count(3), 3)
+
+    def test_snapshot(self):
+        skip_list = SkipList.from_iterable([2, 1, 2])
+        with skip_list.snapshot() as snapshot:
+            skiplist_io.dump(snapshot, self.path)
+        self.assertEqual(list(skiplist_io.load(self.path)), [1, 2, 2])
+
+    def test_mapped(self):
+        skip_list = SkipList.from_iterable([4, 2, 2, 8, 6], counted=True)
+        skiplist_io.dump(skip_list, self.path)
+        with skiplist_io.MappedSkipList(self.path) as mapped:
+            self.assertEqual(len(mapped), 5)
+            self.assertEqual(mapped.search(8), 8)
+            self.assertIsNone(mapped.search(5))
+            self.assertEqual(mapped.count(2), 2)
+            self.assertEqual(mapped.rank(6), 3)
+            self.assertEqual(mapped.count_range(2, 6), 3)
+            self.assertEqual(list(mapped.irange(3, None)), [4, 6, 8])
+            self.assertEqual(mapped.select(1), 2)
+            self.assertEqual(list(mapped.unique_iter()), [2, 4, 6, 8])
+
+    def test_key(self):
+        skip_list = SkipList.from_iterable(['ccc', 'a', 'bb'], key=len)
+        skiplist_io.dump(skip_list, self.path)
+        self.assertRaises(ValueError, skiplist_io.load, self.path)
+        self.assertEqual(list(skiplist_io.load(self.path, key=len)),
+                         ['a', 'bb', 'ccc'])
+
+    def test_bad_files(self):
+        with open(self.path, 'wb') as out_file:
+            out_file.write(b'not a skip list file at all, not at all')
+        self.assertRaises(ValueError, skiplist_io.load, self.path)
+        open(self.path, 'wb').close()
+        self.assertRaises(ValueError, skiplist_io.load, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,844 @@
+import os
+import pickle
+import random
+import sys
+import io
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from skiplist import (DeterministicLevels, ElementNode, HeadNode,
+                      LevelGenerator, SkipList, SkipListStats, TailNode,
+                      TowerNode)
+
+
+def random_operations(skip_list, seed, steps=2000, values=200):
+    '''(SkipList, obj [, int, int]) -> list
+    Inserts and removes random values in the given list, returning the sorted
+    list of what it should hold.
+    '''
+    rand = random.Random(seed)
+    model = []
+    for step in range(steps):
+        value = rand.randrange(values)
+        if rand.random() < 0.6:
+            skip_list.insert(value)
+            model.append(value)
+        else:
+            assert skip_list.remove(value) == (value in model)
+            if value in model:
+                model.remove(value)
+    return sorted(model)
+
+
+def level_spans(skip_list):
+    '''(SkipList) -> list of int
+    Returns the sum of the span widths along every level of the list, from
+    the bottom up; each must be the length of the list.
+    '''
+    spans = []
+    for level in range(len(skip_list._head._next_nodes)):
+        node = skip_list._head
+        span = 0
+        while node is not None:
+            span += node._widths[level]
+            node = node._next_nodes[level]
+        spans.append(span)
+    return spans
+
+
+class TestSkipList(unittest.TestCase):
+
+    # Constructor options of every kind of list to check against a model.
+    CONFIGS = [{}, {'counted': True},
+               {'levels': DeterministicLevels()},
+               {'levels': LevelGenerator(seed=3, max_level=4)},
+               {'backward': True}, {'counted': True, 'backward': True},
+               {'tombstone_ratio': 0.5},
+               {'counted': True, 'backward': True, 'tombstone_ratio': 0.5}]
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config))
+            self.assertEqual(list(skip_list), model, "Failed: " + repr(config))
+            self.assertEqual(len(skip_list), len(model))
+            for value in range(-1, 201):
+                self.assertEqual(skip_list.count(value), model.count(value))
+                self.assertEqual(skip_list.search(value),
+                                 value if value in model else None)
+            self.assertEqual(list(skip_list.unique_iter()),
+                             sorted(set(model)))
+            self.assertEqual(set(level_spans(skip_list)), {len(model)})
+            self.assertEqual(list(reversed(skip_list)), model[::-1])
+            for index in range(len(model)):
+                self.assertEqual(skip_list[index], model[index])
+            for value in range(-1, 201, 7):
+                self.assertEqual(skip_list.rank(value),
+                                 sum(1 for elem in model if elem < value))
+
+    def test_towers(self):
+        self.assertFalse(hasattr(TowerNode(1), '__dict__'))
+        skip_list = SkipList()
+        skip_list.insert_all([2, 1, 3])
+        self.assertTrue(str(skip_list).endswith('head -> 1 -> 2 -> 3'))
+        self.assertFalse(skip_list.remove('a'))
+        self.assertRaises(TypeError, skip_list.insert, 'a')
+
+    def test_tall_towers(self):
+        # Towers about a thousand levels tall would have exhausted the
+        # recursion limit of a recursive descent.
+        skip_list = SkipList(fixed_p=0.999)
+        skip_list.insert_all(range(100, 0, -1))
+        self.assertEqual(list(skip_list), list(range(1, 101)))
+        self.assertEqual(skip_list.count(50), 1)
+        self.assertTrue(skip_list.remove(50))
+        self.assertIsNone(skip_list.search(50))
+
+    def test_operators(self):
+        skip_list = SkipList()
+        skip_list.insert_all([3, 1, 2])
+        other = SkipList()
+        other.insert_all([2, 4])
+        self.assertEqual(list(skip_list + other), [1, 2, 2, 3, 4])
+        self.assertFalse(skip_list == other)
+        skip_list += other
+        self.assertEqual(list(skip_list), [1, 2, 2, 3, 4])
+        copy = SkipList()
+        copy.insert_all([4, 3, 2, 2, 1])
+        self.assertTrue(skip_list == copy)
+
+
+class TestEnds(unittest.TestCase):
+
+    def assertLinked(self, skip_list):
+        '''(TestEnds, SkipList) -> NoneType
+        Asserts every backward link points at the tower before, and the tail
+        at the last one.
+        '''
+        previous = None
+        node = skip_list._head._next_nodes[0]
+        while node is not None:
+            self.assertTrue(node._prev is previous)
+            previous = node
+            node = node._next_nodes[0]
+        self.assertTrue(skip_list._tail is previous)
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config), steps=500)
+            rand = random.Random(repr(config))
+            while model:
+                self.assertEqual(skip_list.min(), model[0],
+                                 "Failed: " + repr(config))
+                self.assertEqual(skip_list.max(), model[-1])
+                if rand.random() < 0.5:
+                    self.assertEqual(skip_list.pop_min(), model.pop(0))
+                else:
+                    self.assertEqual(skip_list.pop_max(), model.pop())
+                if rand.random() < 0.2:
+                    value = rand.randrange(200)
+                    skip_list.insert(value)
+                    model.append(value)
+                    model.sort()
+                self.assertEqual(len(skip_list), len(model))
+            self.assertEqual(set(level_spans(skip_list)), {0})
+            self.assertRaises(IndexError, skip_list.min)
+            self.assertRaises(IndexError, skip_list.max)
+            self.assertRaises(IndexError, skip_list.pop_min)
+            self.assertRaises(IndexError, skip_list.pop_max)
+
+    def test_links(self):
+        for counted in (False, True):
+            skip_list = SkipList(counted=counted, backward=True)
+            model = random_operations(skip_list, counted, steps=500)
+            self.assertLinked(skip_list)
+            skip_list += SkipList.from_iterable(range(0, 300, 7))
+            self.assertLinked(skip_list)
+            self.assertLinked(skip_list + skip_list)
+            self.assertLinked(SkipList.from_iterable(model, backward=True))
+            skip_list.clear()
+            self.assertLinked(skip_list)
+            self.assertEqual(list(reversed(skip_list)), [])
+
+
+def tombstones(skip_list):
+    '''(SkipList) -> int
+    Returns the number of towers left linked with no occurences.
+    '''
+    return sum(1 for node in skip_list._level_nodes(0) if not node._count)
+
+
+class TestTombstones(unittest.TestCase):
+
+    def test_compact(self):
+        for config in [{}, {'counted': True}, {'key': tens},
+                       {'backward': True}]:
+            skip_list = SkipList(tombstone_ratio=0.9, **config)
+            skip_list.insert_all(range(100))
+            with skip_list.snapshot() as snapshot:
+                for value in range(0, 100, 2):
+                    self.assertTrue(skip_list.remove(value))
+                self.assertEqual(tombstones(skip_list), 50,
+                                 "Failed: " + repr(config))
+                self.assertEqual(list(skip_list), list(range(1, 100, 2)))
+                self.assertEqual(skip_list.count(4), 0)
+                self.assertEqual(skip_list.rank(51), 25)
+                self.assertEqual(skip_list[10], 21)
+                skip_list.compact()
+                self.assertEqual(list(snapshot), list(range(100)))
+            self.assertEqual(tombstones(skip_list), 0)
+            self.assertEqual(list(skip_list), list(range(1, 100, 2)))
+            self.assertEqual(set(level_spans(skip_list)), {50})
+
+    def test_ratio(self):
+        # Compaction starts on its own once tombstones exceed the ratio of
+        # towers; in counted mode too, where towers hold many occurences.
+        for counted in (False, True):
+            skip_list = SkipList(counted=counted, tombstone_ratio=0.25)
+            skip_list.insert_all(value // 10 for value in range(1000))
+            compactions = dead = 0
+            for value in range(400):
+                skip_list.remove(value // 10)
+                towers = len(list(skip_list._level_nodes(0)))
+                compactions += tombstones(skip_list) < dead
+                dead = tombstones(skip_list)
+                self.assertEqual(skip_list._towers, towers)
+                self.assertTrue(dead <= 0.25 * towers)
+            self.assertTrue(compactions > 0)
+            self.assertEqual(list(skip_list),
+                             [value // 10 for value in range(400, 1000)])
+            for value in range(400, 1000):
+                skip_list.remove(value // 10)
+            self.assertEqual(tombstones(skip_list), 0)
+            self.assertEqual(skip_list._towers, 0)
+            self.assertEqual(level_spans(skip_list), [0])
+
+class TestBulkLoad(unittest.TestCase):
+
+    def test_from_sorted(self):
+        values = sorted(random.Random(3).randrange(100) for step in range(500))
+        skip_list = SkipList.from_sorted(values)
+        self.assertEqual(list(skip_list), values)
+        self.assertEqual(len(skip_list), 500)
+        # The towers built must be searchable and updatable as usual.
+        for value in range(100):
+            self.assertEqual(skip_list.count(value), values.count(value))
+        skip_list.insert(-1)
+        self.assertTrue(skip_list.remove(values[250]))
+        values.remove(values[250])
+        self.assertEqual(list(skip_list), [-1] + values)
+
+    def test_from_iterable(self):
+        skip_list = SkipList.from_iterable([3, 1, 2, 1])
+        self.assertEqual(list(skip_list), [1, 1, 2, 3])
+        self.assertEqual(list(SkipList.from_iterable([])), [])
+        self.assertRaises(TypeError, SkipList.from_iterable, [1, 'a'])
+        empty = SkipList()
+        empty.insert_all([5, 4])
+        self.assertEqual(list(empty), [4, 5])
+
+
+class TestMerge(unittest.TestCase):
+
+    def test_merges(self):
+        rand = random.Random(4)
+        for case in range(20):
+            values = [rand.randrange(50) for step in range(rand.randrange(60))]
+            values2 = [rand.randrange(50)
+                       for step in range(rand.randrange(60))]
+            skip_list = SkipList.from_iterable(values)
+            other = SkipList.from_iterable(values2)
+            merged = sorted(values + values2)
+            self.assertEqual(list(skip_list + other), merged)
+            skip_list += other
+            self.assertEqual(list(skip_list), merged)
+            self.assertEqual(len(skip_list), len(merged))
+            # The spliced towers must be linked right on every level.
+            for value in range(50):
+                self.assertEqual(skip_list.count(value), merged.count(value))
+            self.assertEqual(list(other), sorted(values2))
+
+    def test_merge_itself(self):
+        skip_list = SkipList.from_iterable([2, 1])
+        skip_list += skip_list
+        self.assertEqual(list(skip_list), [1, 1, 2, 2])
+
+
+class TestCounted(unittest.TestCase):
+
+    def test_one_tower_per_value(self):
+        skip_list = SkipList(counted=True)
+        skip_list.insert_all([2, 1, 2, 2, 3])
+        skip_list.insert(2)
+        towers = []
+        node = skip_list._head._next_nodes[0]
+        while node is not None:
+            towers.append((node._value, node._count))
+            node = node._next_nodes[0]
+        self.assertEqual(towers, [(1, 1), (2, 4), (3, 1)])
+        self.assertEqual(skip_list.count(2), 4)
+        self.assertEqual(list(skip_list.unique_iter()), [1, 2, 3])
+
+    def test_merge_and_clear(self):
+        skip_list = SkipList.from_iterable([1, 2, 2], counted=True)
+        other = SkipList.from_iterable([2, 3], counted=True)
+        self.assertEqual(list(skip_list + other), [1, 2, 2, 2, 3])
+        skip_list += other
+        self.assertEqual(skip_list.count(2), 3)
+        skip_list.clear()
+        self.assertEqual(len(skip_list), 0)
+        self.assertTrue(skip_list.is_counted())
+        self.assertTrue(skip_list.new_empty_skip_list().is_counted())
+
+
+class TestPositions(unittest.TestCase):
+
+    def test_indices_and_slices(self):
+        values = [5, 1, 3, 3, 9, 7]
+        model = sorted(values)
+        for counted in (False, True):
+            skip_list = SkipList.from_iterable(values, counted=counted)
+            self.assertEqual(skip_list[-1], 9)
+            self.assertEqual(skip_list.select(2), 3)
+            self.assertRaises(IndexError, skip_list.select, 6)
+            self.assertRaises(IndexError, skip_list.__getitem__, -7)
+            for index_slice in (slice(1, 4), slice(None, None, 2),
+                                slice(None, None, -1), slice(4, 0, -2),
+                                slice(10, 20)):
+                self.assertEqual(list(skip_list[index_slice]),
+                                 model[index_slice])
+
+
+class TestRanges(unittest.TestCase):
+
+    def test_irange(self):
+        rand = random.Random(5)
+        for config in TestSkipList.CONFIGS:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config))
+            for case in range(100):
+                lo = rand.choice([None, rand.randrange(-5, 205)])
+                hi = rand.choice([None, rand.randrange(-5, 205)])
+                inclusive = (rand.random() < 0.5, rand.random() < 0.5)
+                expected = [value for value in model
+                            if (lo is None or value > lo or
+                                inclusive[0] and value == lo) and
+                            (hi is None or value < hi or
+                             inclusive[1] and value == hi)]
+                self.assertEqual(
+                    list(skip_list.irange(lo, hi, inclusive)), expected)
+                self.assertEqual(
+                    list(skip_list.irange(lo, hi, inclusive, reverse=True)),
+                    expected[::-1])
+                self.assertEqual(skip_list.count_range(lo, hi, inclusive),
+                                 len(expected))
+
+    def test_reverse_walk(self):
+        # With backward links, a reverse range selects only its last element.
+        skip_list = SkipList.from_iterable(
+            [value // 2 for value in range(200)], counted=True, backward=True)
+        selected = []
+        select_node = skip_list._select_node
+
+        def counted_select_node(index):
+            selected.append(index)
+            return select_node(index)
+
+        skip_list._select_node = counted_select_node
+        self.assertEqual(list(skip_list.irange(10, 20, reverse=True)),
+                         [value // 2 for value in range(39, 19, -1)])
+        self.assertEqual(selected, [39])
+
+    def test_bisect(self):
+        skip_list = SkipList.from_iterable([1, 3, 3, 5])
+        self.assertEqual(skip_list.bisect_left(3), 1)
+        self.assertEqual(skip_list.bisect_right(3), 3)
+        self.assertEqual(skip_list.bisect_left(0), 0)
+        self.assertEqual(skip_list.bisect_right(9), 4)
+        self.assertEqual(list(skip_list.irange(4, 2)), [])
+        self.assertRaises(TypeError, list, skip_list.irange('a'))
+
+
+class TestFinger(unittest.TestCase):
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS:
+            skip_list = SkipList(**config)
+            finger = skip_list.finger()
+            rand = random.Random(8)
+            model = []
+            value = 100
+            for step in range(3000):
+                # Wander, so most operations are close to the last one.
+                value = max(0, min(200, value + rand.randrange(-5, 6)))
+                choice = rand.random()
+                if choice < 0.5:
+                    finger.insert(value)
+                    model.append(value)
+                elif choice < 0.8:
+                    self.assertEqual(finger.remove(value), value in model)
+                    if value in model:
+                        model.remove(value)
+                elif choice < 0.9:
+                    self.assertEqual(finger.search(value),
+                                     value if value in model else None)
+                else:
+                    # Changes behind the finger's back.
+                    skip_list.insert(value + 1)
+                    model.append(value + 1)
+            model.sort()
+            self.assertEqual(list(skip_list), model, "Failed: " + repr(config))
+            self.assertEqual(set(level_spans(skip_list)), {len(model)})
+
+    def test_insert_all(self):
+        skip_list = SkipList.from_iterable([10, 20])
+        skip_list.insert_all([25, 5, 15, 15])
+        self.assertEqual(list(skip_list), [5, 10, 15, 15, 20, 25])
+        self.assertEqual(set(level_spans(skip_list)), {6})
+
+
+def tens(value):
+    '''(int) -> int
+    Returns the key of a value in the keyed tests: its tens.
+    '''
+    return value // 10
+
+
+class TestKey(unittest.TestCase):
+
+    def test_against_model(self):
+        for counted in (False, True):
+            skip_list = SkipList(counted=counted, key=tens)
+            model = random_operations(skip_list, counted)
+            values = list(skip_list)
+            self.assertEqual(sorted(values), model)
+            self.assertEqual([tens(value) for value in values],
+                             sorted(tens(value) for value in model))
+            # Equal elements stay together within their key's run.
+            unique = list(skip_list.unique_iter())
+            self.assertEqual(sorted(unique), sorted(set(model)))
+            self.assertEqual(len(unique), len(set(unique)))
+            for value in range(200):
+                self.assertEqual(skip_list.count(value), model.count(value))
+            self.assertEqual(set(level_spans(skip_list)), {len(model)})
+
+    def test_words(self):
+        skip_list = SkipList(key=len)
+        skip_list.insert_all(['ccc', 'a', 'bb', 'dd', 'a'])
+        self.assertEqual([len(word) for word in skip_list], [1, 1, 2, 2, 3])
+        self.assertEqual(skip_list.count('dd'), 1)
+        self.assertIsNone(skip_list.search('ee'))
+        self.assertTrue(skip_list.remove('bb'))
+        self.assertFalse(skip_list.remove('bb'))
+        self.assertEqual(skip_list.rank('zz'), 2)
+
+
+def tower_heights(skip_list):
+    '''(SkipList) -> list of int
+    Returns the heights of the towers on the bottom level, in order.
+    '''
+    heights = []
+    node = skip_list._head._next_nodes[0]
+    while node is not None:
+        heights.append(len(node._next_nodes))
+        node = node._next_nodes[0]
+    return heights
+
+
+class TestLevels(unittest.TestCase):
+
+    def assertBalanced(self, skip_list):
+        # Between two towers reaching a level, at most BALANCED_GAP_MAX
+        # towers reach exactly the level below.
+        heights = tower_heights(skip_list) + [len(skip_list._head._next_nodes)]
+        for level in range(1, heights[-1] + 1):
+            gap = 0
+            for height in heights:
+                if height >= level + 1:
+                    gap = 0
+                elif height == level:
+                    gap += 1
+                    self.assertTrue(gap <= SkipList.BALANCED_GAP_MAX,
+                                    "Failed: level " + str(level))
+
+    def test_seeded(self):
+        first = SkipList(levels=LevelGenerator(seed=7))
+        second = SkipList(levels=LevelGenerator(seed=7))
+        first.insert_all(range(300))
+        second.insert_all(range(300))
+        self.assertEqual(tower_heights(first), tower_heights(second))
+        spawned = first.new_empty_skip_list()
+        spawned2 = second.new_empty_skip_list()
+        spawned.insert_all(range(50))
+        spawned2.insert_all(range(50))
+        self.assertEqual(tower_heights(spawned), tower_heights(spawned2))
+
+    def test_capped(self):
+        levels = LevelGenerator(fixed_p=0.9, max_level=3, seed=1)
+        self.assertTrue(all(levels.height() <= 3 for draw in range(1000)))
+        self.assertEqual(LevelGenerator(expected_size=2 ** 10).get_max_level(),
+                         10)
+        skip_list = SkipList(levels=levels)
+        skip_list.insert_all(range(500, 0, -1))
+        self.assertTrue(max(tower_heights(skip_list)) <= 3)
+        self.assertRaises(SkipList.RandProbException, LevelGenerator, 1.0)
+
+    def test_deterministic(self):
+        skip_list = SkipList(levels=DeterministicLevels())
+        rand = random.Random(10)
+        for step in range(3000):
+            value = rand.randrange(300)
+            if rand.random() < 0.6:
+                skip_list.insert(value)
+            else:
+                skip_list.remove(value)
+        self.assertBalanced(skip_list)
+        for size in (1, 7, 64, 1000):
+            bulk = SkipList.from_sorted(range(size),
+                                        levels=DeterministicLevels())
+            self.assertBalanced(bulk)
+            self.assertEqual(set(level_spans(bulk)), {size})
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS:
+            skip_list = SkipList(**config)
+            rand = random.Random(12)
+            model = []
+            snapshots = []
+            for step in range(2000):
+                value = rand.randrange(100)
+                if rand.random() < 0.6:
+                    skip_list.insert(value)
+                    model.append(value)
+                elif skip_list.remove(value):
+                    model.remove(value)
+                if step % 250 == 0:
+                    snapshots.append((skip_list.snapshot(), sorted(model)))
+                if step == 1000:
+                    skip_list += SkipList.from_iterable(range(0, 100, 3))
+                    model.extend(range(0, 100, 3))
+            for snapshot, expected in snapshots:
+                self.assertEqual(list(snapshot), expected,
+                                 "Failed: " + repr(config))
+                self.assertEqual(len(snapshot), len(expected))
+                for value in range(0, 100, 9):
+                    self.assertEqual(snapshot.count(value),
+                                     expected.count(value))
+                    self.assertEqual(snapshot.rank(value),
+                                     sum(1 for elem in expected
+                                         if elem < value))
+                self.assertEqual(list(snapshot.irange(20, 40)),
+                                 [elem for elem in expected
+                                  if 20 <= elem < 40])
+                snapshot.close()
+            self.assertEqual(list(skip_list), sorted(model))
+
+    def test_clear(self):
+        skip_list = SkipList.from_iterable([1, 2, 2, 3])
+        with skip_list.snapshot() as snapshot:
+            skip_list.insert(0)
+            skip_list.remove(2)
+            skip_list.clear()
+            self.assertEqual(list(snapshot), [1, 2, 2, 3])
+            self.assertEqual(snapshot.count(2), 2)
+            self.assertTrue(2 in snapshot)
+            self.assertEqual(len(skip_list), 0)
+
+
+class TestPickle(unittest.TestCase):
+
+    def test_round_trip(self):
+        for config in TestSkipList.CONFIGS + [{'key': tens}]:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config), steps=500)
+            copy = pickle.loads(pickle.dumps(skip_list))
+            self.assertEqual(sorted(copy), model)
+            self.assertTrue(copy == skip_list)
+            self.assertEqual(copy.is_counted(), skip_list.is_counted())
+            self.assertEqual(set(level_spans(copy)), {len(model)})
+            copy.insert(5)
+            self.assertEqual(copy.count(5), model.count(5) + 1)
+
+    def test_size(self):
+        # Only distinct values and their counts are written.
+        skip_list = SkipList.from_iterable(
+            value % 100 for value in range(100000))
+        self.assertTrue(len(pickle.dumps(skip_list)) < 10000)
+
+
+class TestStats(unittest.TestCase):
+
+    def test_counters(self):
+        for config in TestSkipList.CONFIGS + [{'key': tens}]:
+            skip_list = SkipList(**config)
+            stats = skip_list.instrument()
+            model = random_operations(skip_list, repr(config), steps=500)
+            # Instrumenting changes what is counted, never what is found.
+            self.assertEqual(sorted(skip_list), model,
+                             "Failed: " + repr(config))
+            self.assertEqual(set(level_spans(skip_list)), {len(model)})
+            self.assertTrue(stats.descents > 0)
+            self.assertTrue(stats.comparisons > 0)
+            self.assertTrue(stats.vertical_steps >= stats.descents)
+            self.assertTrue(0 < stats.allocations <= 500)
+            self.assertEqual(skip_list.get_stats()['descents'],
+                             stats.descents)
+            skip_list.uninstrument()
+            descents = stats.descents
+            skip_list.insert(5)
+            self.assertEqual(stats.descents, descents)
+            self.assertFalse('descents' in skip_list.get_stats())
+
+    def test_shared_stats(self):
+        stats = SkipListStats()
+        skip_list = SkipList.from_iterable(range(100))
+        skip_list2 = SkipList.from_iterable(range(100))
+        skip_list.instrument(stats)
+        skip_list2.instrument(stats)
+        skip_list.search(50)
+        skip_list2.search(50)
+        self.assertEqual(stats.descents, 2)
+        # Other lists are never counted.
+        SkipList.from_iterable(range(10)).search(5)
+        self.assertEqual(stats.descents, 2)
+        stats.reset()
+        self.assertEqual(set(stats.as_dict().values()), {0})
+
+    def test_exact_counts(self):
+        # Towers 1 to 7 are 1, 2, 1, 3, 1, 2 and 1 levels tall: finding 7
+        # steps onto 4 and 6, then compares 7 (stopping before it) and finds
+        # it equal.
+        skip_list = SkipList.from_iterable(range(1, 8),
+                                           levels=DeterministicLevels())
+        stats = skip_list.instrument()
+        self.assertEqual(skip_list.search(7), 7)
+        self.assertEqual(stats.as_dict(),
+                         {'descents': 1, 'comparisons': 4,
+                          'horizontal_steps': 2, 'vertical_steps': 3,
+                          'allocations': 0})
+        self.assertEqual(stats.per_descent(),
+                         {'comparisons': 4, 'horizontal_steps': 2,
+                          'vertical_steps': 3})
+        self.assertEqual(skip_list.get_stats()['per_descent'],
+                         stats.per_descent())
+        # Indexing descends by widths alone, comparing nothing.
+        stats.reset()
+        self.assertEqual(skip_list[6], 7)
+        self.assertEqual((stats.descents, stats.comparisons,
+                          stats.horizontal_steps, stats.vertical_steps),
+                         (1, 0, 2, 3))
+        stats.reset()
+        self.assertEqual(stats.per_descent(),
+                         {'comparisons': 0, 'horizontal_steps': 0,
+                          'vertical_steps': 0})
+
+    def test_every_descent_counted(self):
+        skip_list = SkipList.from_iterable(range(100))
+        stats = skip_list.instrument()
+        skip_list[50]
+        self.assertEqual(stats.descents, 1)
+        finger = skip_list.finger()
+        self.assertEqual(finger.search(10), 10)
+        self.assertEqual(finger.search(20), 20)
+        self.assertEqual(stats.descents, 3)
+        skip_list += SkipList.from_iterable(range(0, 100, 10))
+        self.assertTrue(stats.descents > 3)
+        self.assertTrue(stats.allocations >= 10)
+        descents = stats.descents
+        self.assertEqual(skip_list.count(10), 2)
+        self.assertEqual(skip_list.rank(10), 11)
+        self.assertEqual(stats.descents, descents + 2)
+
+    def test_structure(self):
+        skip_list = SkipList(levels=LevelGenerator(seed=4))
+        skip_list.insert_all(range(1000))
+        report = skip_list.get_stats()
+        heights = tower_heights(skip_list)
+        self.assertEqual(report['length'], 1000)
+        self.assertEqual(report['towers'], 1000)
+        self.assertEqual(report['height_histogram'],
+                         [heights.count(height)
+                          for height in range(1, max(heights) + 1)])
+        self.assertEqual(report['level_lengths'],
+                         [sum(1 for height in heights if height > level)
+                          for level in range(max(heights))])
+
+
+class TestBatches(unittest.TestCase):
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS + [{'key': tens}]:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config), steps=500)
+            rand = random.Random(repr(config))
+            batch = [rand.randrange(220) for step in range(300)]
+            self.assertEqual(skip_list.search_many(batch),
+                             [value if value in model else None
+                              for value in batch], "Failed: " + repr(config))
+            self.assertEqual(skip_list.count_many(batch),
+                             [model.count(value) for value in batch])
+            # Results come back in the batch's order, even when a value
+            # occurs in it more often than in the list.
+            expected = []
+            for value in batch:
+                expected.append(value in model)
+                if value in model:
+                    model.remove(value)
+            self.assertEqual(skip_list.remove_many(batch), expected)
+            self.assertEqual(sorted(skip_list), sorted(model))
+            skip_list.insert_many(batch)
+            model.extend(batch)
+            self.assertEqual(sorted(skip_list), sorted(model))
+            self.assertEqual(set(level_spans(skip_list)), {len(model)})
+
+    def test_equal_keys(self):
+        # Elements with equal keys are handled in the batch's order.
+        skip_list = SkipList.from_iterable([12, 15, 15, 31], key=tens)
+        self.assertEqual(skip_list.remove_many([15, 13, 12, 15, 15]),
+                         [True, False, True, True, False])
+        self.assertEqual(list(skip_list), [31])
+        # As with insert, each goes in front of those with its key.
+        skip_list.insert_many([17, 11, 33, 14])
+        self.assertEqual(list(skip_list), [14, 11, 17, 33, 31])
+
+    def test_incomparable(self):
+        skip_list = SkipList.from_iterable([1, 2, 3])
+        self.assertEqual(skip_list.remove_many([2, 'a', 3]),
+                         [True, False, True])
+        self.assertRaises(TypeError, skip_list.search_many, [1, 'a'])
+        self.assertRaises(TypeError, skip_list.count_many, [1, 'a'])
+        self.assertRaises(TypeError, skip_list.insert_many, [1, 'a'])
+        self.assertEqual(list(skip_list), [1])
+
+
+class TestLevelDumps(unittest.TestCase):
+
+    # Deeper than the default recursion limit.
+    DEPTH = 5000
+
+    def test_long_level(self):
+        head = HeadNode()
+        node = head
+        for value in range(TestLevelDumps.DEPTH):
+            node.set_next_node(ElementNode(value // 2, None, TailNode()))
+            node = node.get_next_node()
+        # The head, every element and the tail.
+        self.assertEqual(len(head), TestLevelDumps.DEPTH + 2)
+        first = head.get_next_node()
+        self.assertEqual(first.count(7), 2)
+        self.assertEqual(first.count(TestLevelDumps.DEPTH), 0)
+        self.assertEqual(head.level_to_str(','),
+                         ','.join(['head'] +
+                                  [str(value // 2) for value in
+                                   range(TestLevelDumps.DEPTH)]))
+        dump = io.StringIO()
+        head.write_levels(dump, max_width=3)
+        self.assertEqual(dump.getvalue(), 'head -> 0 -> 0 -> 1 -> ...')
+
+    def test_tall_levels(self):
+        bottom = head = HeadNode()
+        for level in range(TestLevelDumps.DEPTH):
+            head = HeadNode(head)
+        self.assertTrue(head.get_last_below_node() is bottom)
+        self.assertEqual(head.levels_to_str(', '),
+                         '\n'.join(['head'] * (TestLevelDumps.DEPTH + 1)))
+        dump = io.StringIO()
+        head.write_levels(dump, max_depth=2)
+        self.assertEqual(dump.getvalue(), 'head\nhead\n...')
+
+    def test_skip_list(self):
+        skip_list = SkipList(levels=DeterministicLevels())
+        skip_list.insert_all(range(100))
+        dump = io.StringIO()
+        skip_list.write_levels(dump)
+        self.assertEqual(dump.getvalue(), str(skip_list))
+        dump = io.StringIO()
+        skip_list.write_levels(dump, ' ', max_width=2, max_depth=3)
+        lines = dump.getvalue().split('\n')
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[-1], '...')
+        # Each level written is cut after two nodes past the head.
+        for line, level in zip(lines[:-1], str(skip_list).split('\n')):
+            nodes = level.split(' -> ')
+            if len(nodes) > 3:
+                nodes = nodes[:3] + ['...']
+            self.assertEqual(line, ' '.join(nodes))
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_against_model(self):
+        for config in TestSkipList.CONFIGS + [{'key': tens}]:
+            skip_list = SkipList(**config)
+            model = random_operations(skip_list, repr(config), steps=500)
+            # However it was built, equal contents give equal fingerprints.
+            copy = SkipList.from_iterable(skip_list, key=config.get('key'))
+            self.assertEqual(SkipList.from_iterable(reversed(model))
+                             .get_fingerprint(), copy.get_fingerprint())
+            self.assertEqual(skip_list.get_fingerprint(),
+                             copy.get_fingerprint(), "Failed: " + repr(config))
+            self.assertEqual(SkipList.from_iterable(model).get_fingerprint(),
+                             (skip_list + SkipList()).get_fingerprint())
+            with skip_list.snapshot() as snapshot:
+                skip_list.insert(5)
+                self.assertNotEqual(skip_list.get_fingerprint(),
+                                    copy.get_fingerprint())
+                self.assertFalse(skip_list == copy)
+                self.assertTrue(snapshot == copy)
+                skip_list.remove(5)
+            self.assertEqual(skip_list.get_fingerprint(),
+                             copy.get_fingerprint())
+            skip_list.clear()
+            self.assertEqual(skip_list.get_fingerprint(), 0)
+
+    def test_unhashable(self):
+        skip_list = SkipList.from_iterable([[1], [2]])
+        self.assertIsNone(skip_list.get_fingerprint())
+        self.assertTrue(skip_list == SkipList.from_iterable([[2], [1]]))
+        self.assertFalse(skip_list == SkipList.from_iterable([[1], [3]]))
+        skip_list.remove([1])
+        skip_list.remove([2])
+        self.assertEqual(skip_list.get_fingerprint(), 0)
+        skip_list.insert(1)
+        self.assertEqual(skip_list.get_fingerprint(),
+                         SkipList.from_iterable([1]).get_fingerprint())
+
+
+class TestUniqueIter(unittest.TestCase):
+
+    def test_long_runs(self):
+        values = [value // 100 for value in range(10000)]
+        for config in TestSkipList.CONFIGS + [{'key': tens}]:
+            skip_list = SkipList(**config)
+            skip_list.insert_all(values)
+            self.assertEqual(list(skip_list.unique_iter()), list(range(100)),
+                             "Failed: " + repr(config))
+            # Runs cut short by removals, some leaving tombstones behind.
+            for value in range(0, 10000, 3):
+                skip_list.remove(value // 100)
+            self.assertEqual(list(skip_list.unique_iter()), list(range(100)))
+            for value in range(100):
+                skip_list.remove(7)
+            expected = [value for value in range(100) if value != 7]
+            self.assertEqual(list(skip_list.unique_iter()), expected)
+
+    def test_run_end(self):
+        skip_list = SkipList(levels=LevelGenerator(seed=5))
+        skip_list.insert_all([1] + [2] * 1000 + [3])
+        nodes = list(skip_list._level_nodes(0))
+        for start in (1, 2, 500, 1000):
+            iterator = SkipList._SkipIterator(nodes[start], True, True)
+            self.assertTrue(iterator._run_end() is nodes[1000])
+        iterator = SkipList._SkipIterator(nodes[0], True, True)
+        self.assertTrue(iterator._run_end() is nodes[0])
+        iterator = SkipList._SkipIterator(nodes[-1], True, True)
+        self.assertTrue(iterator._run_end() is nodes[-1])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,180 @@
+import inspect
+import os
+import pickle
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from skiplist import SkipList
+from typed_skiplist import TypedSkipList
+
+
+class TestTypedSkipList(unittest.TestCase):
+
+    def test_against_model(self):
+        for load in (2, 3, 8, TypedSkipList.BLOCK_LOAD):
+            typed_list = TypedSkipList('q', load=load)
+            rand = random.Random(load)
+            model = []
+            for step in range(3000):
+                value = rand.randrange(300)
+                if rand.random() < 0.55:
+                    typed_list.insert(value)
+                    model.append(value)
+                else:
+                    self.assertEqual(typed_list.remove(value), value in model,
+                                     "Failed: load " + str(load))
+                    if value in model:
+                        model.remove(value)
+            model.sort()
+            self.assertEqual(list(typed_list), model)
+            self.assertEqual(len(typed_list), len(model))
+            for index in range(0, len(model), 7):
+                self.assertEqual(typed_list[index], model[index])
+            for value in list(model):
+                typed_list.remove(value)
+            self.assertEqual(len(typed_list), 0)
+            self.assertEqual(list(typed_list), [])
+
+    def test_remove_keeps_other_blocks(self):
+        typed_list = TypedSkipList('q', load=2)
+        for value in range(10):
+            typed_list.insert(value)
+        self.assertTrue(typed_list.remove(0))
+        self.assertEqual(list(typed_list), list(range(1, 10)))
+
+    def test_load_too_small(self):
+        self.assertRaises(ValueError, TypedSkipList, 'q', 1)
+        self.assertRaises(ValueError, TypedSkipList, 'x')
+
+    def test_floats(self):
+        typed_list = TypedSkipList.from_iterable([2.5, -1.0, 2.5], 'd')
+        self.assertEqual(list(typed_list), [-1.0, 2.5, 2.5])
+        self.assertEqual(typed_list.count(2.5), 2)
+        self.assertFalse(typed_list.remove('a'))
+        self.assertRaises(TypeError, typed_list.insert, 'a')
+        self.assertRaises(ValueError, TypedSkipList, 'x')
+
+    def test_positions_and_ranges(self):
+        rand = random.Random(15)
+        values = [rand.randrange(1000) for step in range(5000)]
+        model = sorted(values)
+        typed_list = TypedSkipList.from_iterable(values, load=16)
+        for value in range(0, 1000, 37):
+            self.assertEqual(typed_list.rank(value),
+                             sum(1 for elem in model if elem < value))
+            self.assertEqual(list(typed_list.irange(value, value + 50)),
+                             [elem for elem in model
+                              if value <= elem < value + 50])
+            self.assertEqual(
+                list(typed_list.irange(value, value + 50, reverse=True)),
+                [elem for elem in model if value <= elem < value + 50][::-1])
+            self.assertEqual(typed_list.count_range(value, None, (False,
+                                                                   False)),
+                             sum(1 for elem in model if elem > value))
+        for index_slice in (slice(10, 4000, 7), slice(None, None, -3)):
+            self.assertEqual(list(typed_list[index_slice]),
+                             model[index_slice])
+        self.assertEqual(typed_list.select(-1), model[-1])
+        self.assertEqual(list(typed_list.unique_iter()), sorted(set(model)))
+
+    def test_merges_and_pickle(self):
+        typed_list = TypedSkipList.from_iterable([5, 1, 3])
+        other = TypedSkipList.from_iterable([2, 3])
+        self.assertEqual(list(typed_list + other), [1, 2, 3, 3, 5])
+        typed_list += other
+        typed_list.insert_all(range(100))
+        self.assertEqual(len(typed_list), 105)
+        self.assertEqual(typed_list.count(3), 3)
+        copy = pickle.loads(pickle.dumps(typed_list))
+        self.assertTrue(copy == typed_list)
+        self.assertEqual(copy.get_typecode(), 'q')
+
+    def test_ends(self):
+        typed_list = TypedSkipList.from_iterable([5, 1, 3], load=2)
+        self.assertEqual((typed_list.min(), typed_list.max()), (1, 5))
+        typed_list.insert(7)
+        self.assertEqual(typed_list.max(), 7)
+        typed_list.clear()
+        self.assertRaises(IndexError, typed_list.min)
+        self.assertRaises(IndexError, typed_list.max)
+
+    def test_snapshot(self):
+        rand = random.Random(16)
+        values = [rand.randrange(300) for step in range(500)]
+        typed_list = TypedSkipList.from_iterable(values, load=4)
+        model = sorted(values)
+        with typed_list.snapshot() as snapshot:
+            fingerprint = typed_list.get_fingerprint()
+            for step in range(1000):
+                value = rand.randrange(300)
+                if rand.random() < 0.5:
+                    typed_list.insert(value)
+                    model.append(value)
+                elif typed_list.remove(value):
+                    model.remove(value)
+            model.sort()
+            # The snapshot still reads the blocks as they were.
+            self.assertEqual(list(snapshot), sorted(values))
+            self.assertEqual(snapshot.count(values[0]),
+                             values.count(values[0]))
+            self.assertEqual(snapshot.get_fingerprint(), fingerprint)
+            self.assertEqual(list(pickle.loads(pickle.dumps(snapshot))),
+                             sorted(values))
+            self.assertEqual(list(typed_list), model)
+        self.assertEqual(typed_list._owned, None)
+        typed_list.insert(5)
+        self.assertEqual(len(typed_list), len(model) + 1)
+
+    def test_finger(self):
+        typed_list = TypedSkipList('q', load=4)
+        finger = typed_list.finger()
+        model = []
+        rand = random.Random(17)
+        # Nearly sorted runs, as fingers are meant for.
+        for step in range(2000):
+            value = step // 4 + rand.randrange(5)
+            if rand.random() < 0.7:
+                finger.insert(value)
+                model.append(value)
+            else:
+                self.assertEqual(finger.remove(value), value in model)
+                if value in model:
+                    model.remove(value)
+            self.assertEqual(finger.count(value), model.count(value))
+            self.assertEqual(finger.search(value),
+                             value if value in model else None)
+        model.sort()
+        self.assertEqual(list(typed_list), model)
+        self.assertEqual(len(typed_list), len(model))
+        self.assertRaises(TypeError, finger.search, 'a')
+        self.assertFalse(finger.remove('a'))
+
+    def test_fingerprint(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        typed_list = TypedSkipList.from_iterable(values, load=2)
+        self.assertEqual(typed_list.get_fingerprint(),
+                         SkipList.from_iterable(values).get_fingerprint())
+        typed_list.insert(7)
+        typed_list.remove(1)
+        expected = TypedSkipList.from_iterable([3, 4, 1, 5, 9, 2, 6, 7])
+        self.assertEqual(typed_list.get_fingerprint(),
+                         expected.get_fingerprint())
+        floats = TypedSkipList.from_iterable([1.0, 3.0], 'd')
+        self.assertEqual(floats.get_fingerprint(),
+                         TypedSkipList.from_iterable([3, 1]).get_fingerprint())
+        self.assertFalse(typed_list == floats)
+
+    def test_lazy_reverse_range(self):
+        typed_list = TypedSkipList.from_iterable(range(100), load=4)
+        values = typed_list.irange(10, 90, reverse=True)
+        self.assertTrue(inspect.isgenerator(values))
+        self.assertEqual(list(values), list(range(89, 9, -1)))
+        self.assertEqual(list(typed_list.irange(reverse=True)),
+                         list(range(99, -1, -1)))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
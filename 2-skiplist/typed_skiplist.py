@@ -0,0 +1,857 @@
+import array
+import bisect
+import heapq
+import weakref
+
+from skiplist import HeadNode, SkipList
+
+
+class TypedSkipList:
+
+    '''A sorted container of machine integers or doubles with the SkipList
+    API, for homogeneous numeric data. Instead of one Python object per
+    element (and a tower of pointers), the values are packed into sorted
+    array.array blocks of at most twice BLOCK_LOAD values, with a small
+    index on top: the last value of every block, to find a block by value,
+    and a Fenwick tree of block lengths, to find one by position. Like a
+    skip list with a single express lane, every operation binary searches
+    the index, then one block; the searches within blocks run in C over the
+    packed values, and inserting or removing shifts the block in one move.
+
+    There is no key function and duplicates are stored as they come, as in
+    an uncounted SkipList.'''
+
+    # Nested, private finger class; fingers are handed out by finger().
+    class _Finger:
+
+        '''A finger (cursor) into a typed skip list that remembers the block
+        its last operation ended in. Searches, inserts and removes try that
+        block first, checking it against its neighbour's last value, and only
+        binary search the index if the value belongs elsewhere; so runs of
+        nearby (e.g. nearly sorted) values skip the index.
+        '''
+
+        def __init__(self, typed_list):
+            '''(_Finger, TypedSkipList) -> NoneType
+            Creates a finger on the given typed list, at its first block.
+            '''
+            self._typed_list = typed_list
+            self._block_index = 0
+
+        def _find_block(self, value, right=False):
+            '''(_Finger, obj [, bool]) -> int
+            Returns the index of the first block whose last value is not
+            less than the given one (or greater than it, if right), as a
+            bisection of the index would; past the last block, if none is.
+
+            RAISES TypeError if there was an issue comparing values.
+            '''
+            maxes = self._typed_list._maxes
+            block_index = self._block_index
+            if block_index < len(maxes):
+                if right:
+                    if not block_index or not value < maxes[block_index - 1]:
+                        if value < maxes[block_index]:
+                            return block_index
+                        if block_index == len(maxes) - 1:
+                            # Past every block, as when appending in order.
+                            return len(maxes)
+                elif ((not block_index or maxes[block_index - 1] < value) and
+                      not maxes[block_index] < value):
+                    return block_index
+
+            # Not near the last operation; search the index.
+            search = bisect.bisect_right if right else bisect.bisect_left
+            block_index = search(maxes, value)
+            self._block_index = min(block_index, max(len(maxes) - 1, 0))
+            return block_index
+
+        def search(self, value):
+            '''(_Finger, obj) -> obj
+            Returns the stored value equal to the given one if there is one,
+            otherwise returns None, starting from the last block used.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            typed_list = self._typed_list
+            try:
+                block_index = self._find_block(value)
+                if block_index == len(typed_list._blocks):
+                    return None
+                block = typed_list._blocks[block_index]
+                offset = bisect.bisect_left(block, value)
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+            if block[offset] == value:
+                return block[offset]
+            return None
+
+        def count(self, value):
+            '''(_Finger, obj) -> int
+            Returns the number of occurences of the given value, within the
+            last block used if they all are.
+
+            RAISES TypeError if trying to search with incompatible types.
+            '''
+            typed_list = self._typed_list
+            try:
+                block_index = self._find_block(value)
+                if block_index == len(typed_list._blocks):
+                    return SkipList.EMPTY_LIST_COUNT
+                block = typed_list._blocks[block_index]
+                if value < block[-1]:
+                    # Every occurence is in this block.
+                    return (bisect.bisect_right(block, value) -
+                            bisect.bisect_left(block, value))
+            except TypeError:
+                # Thrown during a comparison error.
+                raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+            return typed_list.count(value)
+
+        def insert(self, value):
+            '''(_Finger, obj) -> NoneType
+            Inserts a value into the list, after any equal ones, starting
+            from the last block used.
+
+            RAISES: TypeError if the value does not fit the typecode.
+            '''
+            typed_list = self._typed_list
+            packed = typed_list._packed((value,))
+            if not typed_list._blocks:
+                typed_list.insert(packed[0])
+                return
+            value = packed[0]
+            typed_list._insert_into(self._find_block(value, right=True),
+                                    value)
+
+        def remove(self, value):
+            '''(_Finger, obj) -> bool
+            Returns True iff the remove operation sucessfully found the value
+            and removed it, starting from the last block used.
+            '''
+            typed_list = self._typed_list
+            try:
+                block_index = self._find_block(value)
+                if block_index == len(typed_list._blocks):
+                    return False
+                block = typed_list._blocks[block_index]
+                offset = bisect.bisect_left(block, value)
+            except TypeError:
+                # Trying to remove a value whose type is impossible to have.
+                return False
+            if block[offset] != value:
+                return False
+            typed_list._remove_at(block_index, offset)
+            return True
+
+    # Typecodes of the values that can be held: 64-bit integers, doubles.
+    INT_TYPECODE = 'q'
+    FLOAT_TYPECODE = 'd'
+    TYPECODES = (INT_TYPECODE, FLOAT_TYPECODE)
+
+    # Target number of values per block: blocks split past twice this, and
+    # merge with a neighbour under half of it (so it must be at least two).
+    BLOCK_LOAD = 512
+    MIN_LOAD = 2
+
+    # Errors for values that cannot be held.
+    ERROR_TYPECODE = "Typed skip lists hold 'q' (int) or 'd' (float) values."
+    ERROR_LOAD = "The block load of a typed skip list must be at least 2."
+    ERROR_TYPE_VALUE = ("When inserting, the value must fit the list's "
+                        + "typecode.")
+
+    # Index line of the string representation.
+    INDEX_STR = 'index'
+
+    # Kept for the SkipList methods that read these off their operand.
+    _key_func = None
+    _probability = SkipList.DEFAULT_PROBABILITY
+
+    def __init__(self, typecode=INT_TYPECODE, load=BLOCK_LOAD):
+        '''(TypedSkipList [, str, int]) -> NoneType
+        Initializes an empty list of values of the given typecode ('q' for
+        ints, 'd' for floats), in blocks of about load values.
+
+        RAISES ValueError if the typecode is not one of TYPECODES, or if load
+        is less than MIN_LOAD.
+        '''
+        if typecode not in TypedSkipList.TYPECODES:
+            raise ValueError(TypedSkipList.ERROR_TYPECODE)
+        if load < TypedSkipList.MIN_LOAD:
+            raise ValueError(TypedSkipList.ERROR_LOAD)
+        self._typecode = typecode
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        self._index = [0]
+        self._length = 0
+        # The fingerprint, once asked for, until the next change.
+        self._fingerprint = None
+        # While snapshots are open, the ids of the blocks no snapshot shares,
+        # which alone may change in place (None: every block, none open).
+        self._owned = None
+        self._open_snapshots = 0
+
+    @classmethod
+    def from_iterable(cls, iterable, typecode=INT_TYPECODE, load=BLOCK_LOAD):
+        '''(type, iterable [, str, int]) -> TypedSkipList
+        Returns a new list holding every value of the given iterable, sorted
+        once and packed into blocks.
+
+        RAISES TypeError if a value does not fit the typecode.
+        '''
+        typed_list = cls(typecode, load)
+        typed_list._build_sorted(sorted(typed_list._packed(iterable)))
+        return typed_list
+
+    def get_typecode(self):
+        '''(TypedSkipList) -> str
+        Returns the typecode of the values this list holds.
+        '''
+        return self._typecode
+
+    def is_counted(self):
+        '''(TypedSkipList) -> bool
+        Returns False: duplicates are stored as they come.
+        '''
+        return False
+
+    def get_key_function(self):
+        '''(TypedSkipList) -> NoneType
+        Returns None: values are always ordered by themselves.
+        '''
+        return None
+
+    def new_empty_skip_list(self):
+        '''(TypedSkipList) -> TypedSkipList
+        Creates an empty list with the same typecode and block load.
+        '''
+        return TypedSkipList(self._typecode, self._load)
+
+    def _packed(self, iterable):
+        '''(TypedSkipList, iterable) -> array.array
+        Returns the given values packed into an array of this list's
+        typecode.
+
+        RAISES TypeError if a value does not fit the typecode.
+        '''
+        try:
+            return array.array(self._typecode, iterable)
+        except (TypeError, OverflowError):
+            raise TypeError(TypedSkipList.ERROR_TYPE_VALUE)
+
+    def _build_sorted(self, values):
+        '''(TypedSkipList, sequence) -> NoneType
+        Replaces the contents of this list with the given sorted values, cut
+        into full blocks.
+        '''
+        values = self._packed(values)
+        load = self._load
+        self._blocks = [values[start:start + load]
+                        for start in range(0, len(values), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._length = len(values)
+        self._fingerprint = None
+        if self._owned is not None:
+            self._owned = set(map(id, self._blocks))
+        self._build_index()
+
+    def clear(self):
+        '''(TypedSkipList) -> NoneType
+        Removes every value from this list.
+        '''
+        self._build_sorted(())
+
+    def snapshot(self):
+        '''(TypedSkipList) -> _TypedSnapshot
+        Returns a read-only view of this list as it is now, in time linear in
+        the number of blocks only: it shares every block, and while it is
+        open this list copies a block before first changing it in place.
+        Closing it (or letting it be garbage collected) ends the copying,
+        once no other snapshot is open.
+        '''
+        snapshot = _TypedSnapshot(self)
+        # Every block is shared from now on.
+        self._owned = set()
+        self._open_snapshots += 1
+        return snapshot
+
+    def _close_snapshot(self):
+        '''(TypedSkipList) -> NoneType
+        Forgets a snapshot; once none is open, blocks change in place again.
+        '''
+        self._open_snapshots -= 1
+        if not self._open_snapshots:
+            self._owned = None
+
+    def _own(self, block_index):
+        '''(TypedSkipList, int) -> array.array
+        Returns the block at the given index, about to change in place: first
+        replaced with a copy of its own, if a snapshot may share it.
+
+        REQ: this list tracks the blocks it owns (self._owned is a set).
+        '''
+        block = self._blocks[block_index]
+        if id(block) not in self._owned:
+            block = self._blocks[block_index] = block[:]
+            self._owned.add(id(block))
+        return block
+
+    def _adopt(self, *blocks):
+        '''(TypedSkipList, array.array, ...) -> NoneType
+        Records that the given new blocks are this list's alone, so they may
+        change in place even while snapshots are open.
+        '''
+        if self._owned is not None:
+            self._owned.update(map(id, blocks))
+
+    def finger(self):
+        '''(TypedSkipList) -> _Finger
+        Returns a new finger on this list: a cursor with search, count,
+        insert and remove methods that start from the block its last
+        operation ended in, so that runs of nearby values are cheap.
+        '''
+        return TypedSkipList._Finger(self)
+
+    def _build_index(self):
+        '''(TypedSkipList) -> NoneType
+        Rebuilds the Fenwick tree of block lengths, in linear time, after
+        blocks were split, merged or replaced.
+        '''
+        index = [0] + [len(block) for block in self._blocks]
+        for position in range(1, len(index)):
+            parent = position + (position & -position)
+            if parent < len(index):
+                index[parent] += index[position]
+        self._index = index
+
+    def _index_add(self, block_index, delta):
+        '''(TypedSkipList, int, int) -> NoneType
+        Records that the block at the given index gained delta values.
+        '''
+        index = self._index
+        position = block_index + 1
+        while position < len(index):
+            index[position] += delta
+            position += position & -position
+
+    def _position(self, block_index, offset):
+        '''(TypedSkipList, int, int) -> int
+        Returns the position in the list of the given offset into the block
+        at the given index.
+        '''
+        index = self._index
+        position = block_index
+        while position > 0:
+            offset += index[position]
+            position -= position & -position
+        return offset
+
+    def _locate(self, position):
+        '''(TypedSkipList, int) -> (int, int)
+        Returns the index of the block holding the given position, and the
+        offset of that position into it, by descending the Fenwick tree.
+
+        REQ: 0 <= position < len(self).
+        '''
+        index = self._index
+        block_index = 0
+        step = 1 << (len(index) - 1).bit_length()
+        while step:
+            following = block_index + step
+            if following < len(index) and index[following] <= position:
+                block_index = following
+                position -= index[following]
+            step >>= 1
+        return block_index, position
+
+    def _bisect(self, value, right=False):
+        '''(TypedSkipList, obj [, bool]) -> int
+        Returns the position before the first value not less than the given
+        one (or greater than it, if right).
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        search = bisect.bisect_right if right else bisect.bisect_left
+        try:
+            block_index = search(self._maxes, value)
+            if block_index == len(self._blocks):
+                return self._length
+            return self._position(block_index,
+                                  search(self._blocks[block_index], value))
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+
+    def search(self, value):
+        '''(TypedSkipList, obj) -> obj
+        Returns the stored value equal to the given one if there is one,
+        otherwise returns None.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        try:
+            block_index = bisect.bisect_left(self._maxes, value)
+            if block_index == len(self._blocks):
+                return None
+            block = self._blocks[block_index]
+            offset = bisect.bisect_left(block, value)
+        except TypeError:
+            # Thrown during a comparison error.
+            raise TypeError(SkipList.ERROR_TYPE_SEARCH)
+        if block[offset] == value:
+            return block[offset]
+        return None
+
+    def __contains__(self, value):
+        '''(TypedSkipList, obj) -> bool
+        Returns whether the value is in this list.
+        '''
+        try:
+            return self.search(value) is not None
+        except TypeError:
+            return False
+
+    def insert(self, value):
+        '''(TypedSkipList, obj) -> NoneType
+        Inserts a value into the list, after any equal ones, splitting its
+        block in two if it grows past twice the load.
+
+        RAISES: TypeError if the value does not fit the typecode.
+        '''
+        packed = self._packed((value,))
+        if not self._blocks:
+            self._blocks.append(packed)
+            self._adopt(packed)
+            self._maxes.append(packed[0])
+            self._length = 1
+            self._fingerprint = None
+            self._build_index()
+            return
+
+        value = packed[0]
+        self._insert_into(bisect.bisect_right(self._maxes, value), value)
+
+    def _insert_into(self, block_index, value):
+        '''(TypedSkipList, int, obj) -> NoneType
+        Inserts a packed value into the block at the given index (the last
+        one, if the index is past it), after any equal ones.
+
+        REQ: the list is not empty, and block_index is where bisecting the
+        index to the right of the value leads.
+        '''
+        if block_index == len(self._blocks):
+            # Past every block; it goes at the end of the last one.
+            block_index -= 1
+            self._maxes[block_index] = value
+        block = self._blocks[block_index]
+        if self._owned is not None:
+            block = self._own(block_index)
+        block.insert(bisect.bisect_right(block, value), value)
+        self._length += 1
+        self._fingerprint = None
+
+        if len(block) > 2 * self._load:
+            # Split it in halves, each one a block of its own.
+            half = len(block) // 2
+            halves = [block[:half], block[half:]]
+            self._blocks[block_index:block_index + 1] = halves
+            self._adopt(*halves)
+            self._maxes.insert(block_index, block[half - 1])
+            self._build_index()
+        else:
+            self._index_add(block_index, 1)
+
+    def remove(self, value):
+        '''(TypedSkipList, obj) -> bool
+        Returns True iff the remove operation sucessfully found the value and
+        removed it. A block left under half the load is merged with the next
+        (or previous) one.
+        '''
+        try:
+            block_index = bisect.bisect_left(self._maxes, value)
+            if block_index == len(self._blocks):
+                return False
+            block = self._blocks[block_index]
+            offset = bisect.bisect_left(block, value)
+        except TypeError:
+            # Trying to remove a value whose type is impossible to have.
+            return False
+        if block[offset] != value:
+            return False
+        self._remove_at(block_index, offset)
+        return True
+
+    def _remove_at(self, block_index, offset):
+        '''(TypedSkipList, int, int) -> NoneType
+        Removes the value at the given offset into the block at the given
+        index. A block left under half the load is merged with the next (or
+        previous) one.
+        '''
+        block = self._blocks[block_index]
+        if self._owned is not None:
+            block = self._own(block_index)
+        self._fingerprint = None
+        del block[offset]
+        self._length -= 1
+        if not block:
+            # Drop the emptied block, with its entries in the index.
+            del self._blocks[block_index]
+            del self._maxes[block_index]
+            self._build_index()
+            return
+        if len(block) >= self._load // 2 or len(self._blocks) == 1:
+            self._maxes[block_index] = block[-1]
+            self._index_add(block_index, -1)
+            return
+
+        # Merge it into its neighbour; split again if too big.
+        if block_index == len(self._blocks) - 1:
+            block_index -= 1
+        merged = self._blocks[block_index] + self._blocks[block_index + 1]
+        if len(merged) > 2 * self._load:
+            half = len(merged) // 2
+            halves = [merged[:half], merged[half:]]
+            self._blocks[block_index:block_index + 2] = halves
+            self._adopt(*halves)
+            self._maxes[block_index:block_index + 2] = [merged[half - 1],
+                                                        merged[-1]]
+        else:
+            self._blocks[block_index:block_index + 2] = [merged]
+            self._adopt(merged)
+            self._maxes[block_index:block_index + 2] = [merged[-1]]
+        self._build_index()
+
+    def insert_all(self, iterable):
+        '''(TypedSkipList, iterable) -> NoneType
+        Inserts all of a given iterable's values into this list: one at a
+        time if there are few of them, else by merging them in and packing
+        the blocks again.
+
+        RAISES: TypeError if a value does not fit the typecode.
+        '''
+        values = self._packed(iterable)
+        if len(values) <= len(self._blocks):
+            for value in values:
+                self.insert(value)
+        else:
+            self._build_sorted(list(heapq.merge(self, sorted(values))))
+
+    def count(self, value):
+        '''(TypedSkipList, obj) -> int
+        Returns the number of occurences of a given value.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self._bisect(value, right=True) - self._bisect(value)
+
+    def rank(self, value):
+        '''(TypedSkipList, obj) -> int
+        Returns the number of values in this list less than the given one.
+
+        RAISES TypeError if trying to rank with incompatible types.
+        '''
+        return self._bisect(value)
+
+    def bisect_left(self, value):
+        '''(TypedSkipList, obj) -> int
+        Returns the number of values less than the given one.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self._bisect(value)
+
+    def bisect_right(self, value):
+        '''(TypedSkipList, obj) -> int
+        Returns the number of values not greater than the given one.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        return self._bisect(value, right=True)
+
+    def _range(self, lo, hi, inclusive):
+        '''(TypedSkipList, obj, obj, (bool, bool)) -> (int, int)
+        Returns the positions a range starts at and stops before, as
+        SkipList.irange bounds it.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start = 0
+        if lo is not None:
+            start = self._bisect(lo, right=not inclusive[0])
+        stop = self._length
+        if hi is not None:
+            stop = self._bisect(hi, right=inclusive[1])
+        return start, max(start, stop)
+
+    def count_range(self, lo=None, hi=None, inclusive=(True, False)):
+        '''(TypedSkipList [, obj, obj, (bool, bool)]) -> int
+        Returns the number of values between lo and hi, as
+        SkipList.count_range does.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start, stop = self._range(lo, hi, inclusive)
+        return stop - start
+
+    def _values_between(self, start, stop):
+        '''(TypedSkipList, int, int) -> generator
+        Yields the values from position start up to (not including) stop.
+        '''
+        if start >= stop:
+            return
+        block_index, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = self._blocks[block_index]
+            chunk = block[offset:offset + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            block_index += 1
+            offset = 0
+
+    def irange(self, lo=None, hi=None, inclusive=(True, False),
+               reverse=False):
+        '''(TypedSkipList [, obj, obj, (bool, bool), bool]) -> generator
+        Lazily yields the values between lo and hi in order (or in reverse
+        order, if reverse), as SkipList.irange does.
+
+        RAISES TypeError if trying to search with incompatible types.
+        '''
+        start, stop = self._range(lo, hi, inclusive)
+        if reverse:
+            return self._values_between_reversed(start, stop)
+        return self._values_between(start, stop)
+
+    def _values_between_reversed(self, start, stop):
+        '''(TypedSkipList, int, int) -> generator
+        Yields the values from just before position stop down to position
+        start, in reverse order, a block at a time.
+        '''
+        if start >= stop:
+            return
+        block_index, offset = self._locate(stop - 1)
+        remaining = stop - start
+        while remaining > 0:
+            block = self._blocks[block_index]
+            chunk = block[max(offset + 1 - remaining, 0):offset + 1]
+            yield from reversed(chunk)
+            remaining -= len(chunk)
+            block_index -= 1
+            offset = len(self._blocks[block_index]) - 1
+
+    def select(self, index):
+        '''(TypedSkipList, int) -> obj
+        Returns the value at the given index (negative ones counting from
+        the end).
+
+        RAISES IndexError if the index is out of range.
+        '''
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(SkipList.ERROR_INDEX)
+        block_index, offset = self._locate(index)
+        return self._blocks[block_index][offset]
+
+    def min(self):
+        '''(TypedSkipList) -> obj
+        Returns the first (least) value in this list, in O(1).
+
+        RAISES IndexError if this list is empty.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        return self._blocks[0][0]
+
+    def max(self):
+        '''(TypedSkipList) -> obj
+        Returns the last (greatest) value in this list, in O(1).
+
+        RAISES IndexError if this list is empty.
+        '''
+        if not self._length:
+            raise IndexError(SkipList.ERROR_EMPTY)
+        return self._maxes[-1]
+
+    def __getitem__(self, index):
+        '''(TypedSkipList, int or slice) -> obj or generator
+        Returns the value at the given index, or a generator of the values in
+        the given slice of this list.
+
+        RAISES IndexError if the index is out of range.
+        '''
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self._values_between(start, stop)
+            return (self.select(position)
+                    for position in range(start, stop, step))
+        return self.select(index)
+
+    def __len__(self):
+        '''(TypedSkipList) -> int
+        Returns the number of values in this list.
+        '''
+        return self._length
+
+    def __iter__(self):
+        '''(TypedSkipList) -> generator
+        Yields every value, in order.
+        '''
+        for block in self._blocks:
+            yield from block
+
+    def unique_iter(self):
+        '''(TypedSkipList) -> generator
+        Yields every distinct value, in order.
+        '''
+        no_elem = previous = SkipList._SkipIterator._NO_ELEM
+        for value in self:
+            if previous is no_elem or previous != value:
+                yield value
+            previous = value
+
+    def _runs(self):
+        '''(TypedSkipList) -> generator of (obj, obj, int)
+        Yields the distinct values as (key, value, occurences) triples, in
+        order, so SkipList can merge this list in.
+        '''
+        previous = None
+        count = 0
+        for value in self:
+            if count and value == previous:
+                count += 1
+            else:
+                if count:
+                    yield previous, previous, count
+                previous = value
+                count = 1
+        if count:
+            yield previous, previous, count
+
+    def get_fingerprint(self):
+        '''(TypedSkipList) -> int
+        Returns the fingerprint of this list's contents, as SkipList does:
+        the sum of the hashes of all its values, modulo 2 ** 64. Equal values
+        hash alike whatever their type, so it matches that of a SkipList
+        holding the same values. Hashing on every change would slow inserts
+        and removes down, so it is worked out in one pass when asked for,
+        and kept until the next change.
+        '''
+        if self._fingerprint is None:
+            self._fingerprint = (sum(hash(value) for value in self)
+                                 & SkipList.FINGERPRINT_MASK)
+        return self._fingerprint
+
+    def __eq__(self, skiplist2):
+        '''(TypedSkipList, SkipList) -> bool
+        Returns whether both hold the same values, as many times each.
+        '''
+        if SkipList._fingerprints_differ(self, skiplist2):
+            return False
+        return (len(self) == len(skiplist2) and
+                all(value == value2 for value, value2 in zip(self, skiplist2)))
+
+    def __add__(self, skiplist2):
+        '''(TypedSkipList, SkipList) -> TypedSkipList
+        Returns a new list holding the values of both, merged in one pass.
+
+        RAISES: TypeError if a value does not fit the typecode.
+        '''
+        sum_list = self.new_empty_skip_list()
+        sum_list._build_sorted(list(heapq.merge(self, skiplist2)))
+        return sum_list
+
+    def __iadd__(self, skiplist2):
+        '''(TypedSkipList, SkipList) -> TypedSkipList
+        Merges every value of the given list into this one, in one pass.
+
+        RAISES: TypeError if a value does not fit the typecode.
+        '''
+        self._build_sorted(list(heapq.merge(self, list(skiplist2))))
+        return self
+
+    def __reduce__(self):
+        '''(TypedSkipList) -> tuple
+        Pickles this list as its typecode, load, and its values packed into
+        one run of bytes.
+        '''
+        values = array.array(self._typecode)
+        for block in self._blocks:
+            values.extend(block)
+        return (self.__class__, (self._typecode, self._load),
+                values.tobytes())
+
+    def __setstate__(self, state):
+        '''(TypedSkipList, bytes) -> NoneType
+        Unpacks the pickled values into this (new, empty) list.
+        '''
+        values = array.array(self._typecode)
+        values.frombytes(state)
+        self._build_sorted(values)
+
+    def __str__(self):
+        '''(TypedSkipList) -> str
+        Returns a string representation of this list: the index (the last
+        value of every block) above the values, in the format
+        'head -> 1 -> 2'.
+        '''
+        return '\n'.join(
+            [' -> '.join([TypedSkipList.INDEX_STR] +
+                         [str(value) for value in self._maxes]),
+             ' -> '.join([HeadNode.HEAD_NODE_STR] +
+                         [str(value) for value in self])])
+
+
+class _TypedSnapshot(TypedSkipList):
+
+    '''A consistent, read-only view of a typed skip list as it was when the
+    snapshot was taken. It copies the list's index, but shares its blocks,
+    which the list copies before changing while the snapshot is open. It
+    answers every query a TypedSkipList does (changes made to it copy what
+    they touch too, so they never reach the list). Closing it (or letting it
+    be garbage collected) lets the list change its blocks in place again;
+    it can be used as a context manager to do so.'''
+
+    def __init__(self, typed_list):
+        '''(_TypedSnapshot, TypedSkipList) -> NoneType
+        Creates a view of the given typed list as it is now.
+        '''
+        self._typecode = typed_list._typecode
+        self._load = typed_list._load
+        self._blocks = list(typed_list._blocks)
+        self._maxes = list(typed_list._maxes)
+        self._index = list(typed_list._index)
+        self._length = typed_list._length
+        self._fingerprint = typed_list._fingerprint
+        # Shares every block with the list, so owns none of them.
+        self._owned = set()
+        self._open_snapshots = 0
+        self._closer = weakref.finalize(self, typed_list._close_snapshot)
+
+    def __reduce__(self):
+        '''(_TypedSnapshot) -> tuple
+        Pickles this snapshot as a TypedSkipList holding its values.
+        '''
+        return (TypedSkipList,) + super().__reduce__()[1:]
+
+    def close(self):
+        '''(_TypedSnapshot) -> NoneType
+        Closes this snapshot; the list no longer copies blocks for it.
+        Closing it again does nothing.
+        '''
+        self._closer()
+
+    def __enter__(self):
+        '''(_TypedSnapshot) -> _TypedSnapshot
+        Returns this snapshot, for use in a with statement.
+        '''
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''(_TypedSnapshot, type, Exception, traceback) -> NoneType
+        Closes this snapshot at the end of a with statement.
+        '''
+        self.close()